@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Callable, Generic, List, Optional, TypeVar
+
+from __shared.domain.repositories import SearchResult
+
+Item = TypeVar('Item')
+
+
+@dataclass(slots=True, frozen=True)
+class PaginationOutput(Generic[Item]):
+    items: List[Item]
+    total: Optional[int]
+    current_page: int
+    last_page: Optional[int]
+    per_page: int
+    next_cursor: Optional[str] = None
+
+
+@dataclass(slots=True, frozen=True)
+class SearchOutputMapper(Generic[Item]):
+    # Maps the whole page with one call of `to_output_many` and takes the
+    # pagination straight from the result, without going through `to_dict`.
+    to_output_many: Callable[[List], List[Item]]
+
+    def to_output(self, result: SearchResult) -> PaginationOutput[Item]:
+        return PaginationOutput(items=self.to_output_many(result.data),
+                                total=result.count,
+                                current_page=result.current_page,
+                                last_page=result.last_page,
+                                per_page=result.items_per_page,
+                                next_cursor=result.next_cursor)
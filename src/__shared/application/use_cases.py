@@ -9,3 +9,9 @@ class UseCase(Generic[UseCaseInput, UseCaseOutput], ABC):
     @abstractmethod
     def execute(self, input_params: UseCaseInput) -> UseCaseOutput:
         raise NotImplementedError()
+
+
+class AsyncUseCase(Generic[UseCaseInput, UseCaseOutput], ABC):
+    @abstractmethod
+    async def execute(self, input_params: UseCaseInput) -> UseCaseOutput:
+        raise NotImplementedError()
@@ -1,25 +1,124 @@
 from abc import ABC
-from dataclasses import asdict, dataclass, field, _MISSING_TYPE
-from typing import Any, Dict
+from dataclasses import dataclass, field, fields, MISSING, _MISSING_TYPE
+from typing import Any, Callable, Dict, Tuple
 
 from __shared.domain.value_objects import UniqueEntityId
 
 
+Serializers = Tuple[Callable[['Entity'], Dict], Callable[['Entity'], Tuple]]
+_SERIALIZERS: Dict[type, Serializers] = {}
+Hydrator = Callable[..., 'Entity']
+_HYDRATORS: Dict[type, Hydrator] = {}
+Copier = Callable[['Entity'], 'Entity']
+_COPIERS: Dict[type, Copier] = {}
+# kept by the repositories, not part of the serialized state
+_METADATA_FIELDS = ['unique_entity_id', 'version']
+
+
+def _create_serializers(cls: type) -> Serializers:
+    # Generated once per class, like the dataclass methods themselves: values are
+    # read straight from the attributes, without the deep copy `asdict` makes.
+    names = [class_field.name for class_field in fields(cls)
+             if class_field.name not in _METADATA_FIELDS]
+    dict_items = ''.join(f'{name!r}: entity.{name}, ' for name in names)
+    row_items = ''.join(f'entity.{name}, ' for name in names)
+    source = f"def to_dict(entity):\n    return {{{dict_items}'id': entity.id}}\n" + \
+        f'def to_row(entity):\n    return (entity.id, {row_items})\n'
+
+    namespace = {}
+    exec(source, {}, namespace)  # pylint: disable=exec-used
+    return namespace['to_dict'], namespace['to_row']
+
+
+def _create_hydrator(cls: type) -> Hydrator:
+    # The fields are set straight on a new instance, so neither `__init__` nor
+    # `__post_init__` runs. Missing fields take their defaults.
+    global_namespace = {'cls': cls, 'new': object.__new__, 'set': object.__setattr__,
+                        'MISSING': MISSING, 'UniqueEntityId': UniqueEntityId}
+    parameters = []
+    body = ''
+    for class_field in fields(cls):
+        name = class_field.name
+        if name == 'unique_entity_id':
+            continue
+        if class_field.default is not MISSING:
+            global_namespace[f'default_{name}'] = class_field.default
+            parameters.append(f'{name}=default_{name}')
+        elif class_field.default_factory is not MISSING:
+            global_namespace[f'factory_{name}'] = class_field.default_factory
+            parameters.append(f'{name}=MISSING')
+            body += f'    if {name} is MISSING:\n        {name} = factory_{name}()\n'
+        else:
+            parameters.append(name)
+        body += f'    set(entity, {name!r}, {name})\n'
+
+    source = f"def hydrate(unique_entity_id, *, {', '.join(parameters)}):\n" + \
+        '    entity = new(cls)\n' + \
+        '    if not isinstance(unique_entity_id, UniqueEntityId):\n' + \
+        '        unique_entity_id = UniqueEntityId(unique_entity_id)\n' + \
+        "    set(entity, 'unique_entity_id', unique_entity_id)\n" + \
+        body + '    return entity\n'
+
+    namespace = {}
+    exec(source, global_namespace, namespace)  # pylint: disable=exec-used
+    return namespace['hydrate']
+
+
+def _create_copier(cls: type) -> Copier:
+    body = ''.join(f'    set(copy, {class_field.name!r}, entity.{class_field.name})\n'
+                   for class_field in fields(cls))
+    source = 'def copy(entity):\n    copy = new(cls)\n' + body + '    return copy\n'
+
+    namespace = {}
+    exec(source, {'cls': cls, 'new': object.__new__, 'set': object.__setattr__},  # pylint: disable=exec-used
+         namespace)
+    return namespace['copy']
+
+
 @dataclass(frozen=True, slots=True)
 class Entity(ABC):
     # pylint: disable=unnecessary-lambda
     unique_entity_id: UniqueEntityId = field(
         default_factory=lambda: UniqueEntityId())
+    # bumped by the repository on every update, see `RepositoryInterface.update`
+    version: int = field(default=0, compare=False, kw_only=True)
 
     @property
     def id(self) -> str:  # pylint: disable=invalid-name
         return str(self.unique_entity_id)
 
     def to_dict(self) -> Dict:
-        entity_dict = asdict(self)
-        entity_dict.pop('unique_entity_id')
-        entity_dict['id'] = self.id
-        return entity_dict
+        return self._get_serializers()[0](self)
+
+    def to_row(self) -> Tuple:
+        # (id, *fields), in the dataclass field order, without the version
+        return self._get_serializers()[1](self)
+
+    def copy(self) -> 'Entity':
+        # A shallow copy, without `__post_init__` as the values are already valid.
+        # Repositories keep copies, so changes to an entity only reach them through
+        # their writes.
+        copier = _COPIERS.get(type(self))
+        if copier is None:
+            copier = _COPIERS[type(self)] = _create_copier(type(self))
+        return copier(self)
+
+    @classmethod
+    def hydrate(cls, unique_entity_id: str | UniqueEntityId, **values: Any) -> 'Entity':
+        # Rebuilds an entity from data our own store wrote, which was validated
+        # before it was stored: `__post_init__`, and so the validation, is skipped.
+        # Never for input from outside.
+        hydrator = _HYDRATORS.get(cls)
+        if hydrator is None:
+            hydrator = _HYDRATORS[cls] = _create_hydrator(cls)
+        return hydrator(unique_entity_id, **values)
+
+    @classmethod
+    def _get_serializers(cls) -> Serializers:
+        serializers = _SERIALIZERS.get(cls)
+        if serializers is None:
+            serializers = _SERIALIZERS[cls] = _create_serializers(cls)
+        return serializers
 
     @classmethod
     def get_default(cls, field_name: str) -> Any:
@@ -19,3 +19,11 @@ class EntityValidationException(Exception):
 
 class NotFoundException(Exception):
     pass
+
+
+class InvalidSearchCursorException(Exception):
+    pass
+
+
+class VersionConflictException(Exception):
+    pass
@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+import base64
+import binascii
+from dataclasses import dataclass, field, replace
+import json
 import math
-from typing import Any, Dict, Generic, List, Optional, TypeVar
+from typing import Any, AsyncIterator, Dict, Generic, Iterator, List, Optional, TypeVar
 
 from __shared.domain.entities import Entity
+from __shared.domain.exceptions import InvalidSearchCursorException, VersionConflictException
 from __shared.domain.value_objects import UniqueEntityId
 
 
@@ -26,14 +30,47 @@ class RepositoryInterface(Generic[GenericEntity], ABC):
     def find_all(self) -> List[GenericEntity]:
         raise NotImplementedError()
 
+    # Stores the entity and bumps its version. With `expected_version` it is a
+    # compare-and-set: it raises VersionConflictException, and stores nothing,
+    # unless the stored entity still has that version.
     @abstractmethod
-    def update(self, entity: GenericEntity) -> None:
+    def update(self, entity: GenericEntity, expected_version: Optional[int] = None) -> None:
         raise NotImplementedError()
 
     @abstractmethod
     def delete(self, entity_id: str | UniqueEntityId) -> None:
         raise NotImplementedError()
 
+    # The bulk operations below fall back to the single-entity ones. Implementations
+    # should override them to write the whole batch at once, all or nothing.
+    def insert_many(self, entities: List[GenericEntity]) -> None:
+        for entity in entities:
+            self.insert(entity)
+
+    def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[GenericEntity]:
+        return [self.find_by_id(entity_id) for entity_id in entity_ids]
+
+    def update_many(self, entities: List[GenericEntity]) -> None:
+        self.find_by_ids([entity.id for entity in entities])
+        for entity in entities:
+            self.update(entity)
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        self.find_by_ids(entity_ids)
+        for entity_id in entity_ids:
+            self.delete(entity_id)
+
+    def iter_all(self) -> Iterator[GenericEntity]:
+        yield from self.find_all()
+
+    @staticmethod
+    def _raise_if_version_conflict(entity_id: str, expected_version: Optional[int],
+                                   version: int) -> None:
+        if expected_version is not None and expected_version != version:
+            raise VersionConflictException(
+                f'Entity version conflict. data=[id: `{entity_id}`, ' +
+                f'expected_version: `{expected_version}`, version: `{version}`]')
+
 
 class SearchableRepositoryInterface(Generic[GenericEntity,
                                             GenericSearchableInput,
@@ -47,6 +84,85 @@ class SearchableRepositoryInterface(Generic[GenericEntity,
     def sortable_fields(self) -> List[str]:
         raise NotImplementedError()
 
+    def iter_search(self, search_params: GenericSearchableInput) -> Iterator[GenericEntity]:
+        # Streams every result from the page (or cursor) asked for onwards, following
+        # the next cursor one page at a time. Implementations can stream it directly.
+        search_params = replace(search_params, include_count=False)
+        while True:
+            result = self.search(search_params)
+            yield from result.data
+            if result.next_cursor is None:
+                return
+            search_params = replace(search_params, after=result.next_cursor)
+
+
+class AsyncRepositoryInterface(Generic[GenericEntity], ABC):
+    @abstractmethod
+    async def insert(self, entity: GenericEntity) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def find_by_id(self, entity_id: str | UniqueEntityId) -> GenericEntity:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def find_all(self) -> List[GenericEntity]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def update(self, entity: GenericEntity,
+                     expected_version: Optional[int] = None) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def delete(self, entity_id: str | UniqueEntityId) -> None:
+        raise NotImplementedError()
+
+    async def insert_many(self, entities: List[GenericEntity]) -> None:
+        for entity in entities:
+            await self.insert(entity)
+
+    async def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[GenericEntity]:
+        return [await self.find_by_id(entity_id) for entity_id in entity_ids]
+
+    async def update_many(self, entities: List[GenericEntity]) -> None:
+        await self.find_by_ids([entity.id for entity in entities])
+        for entity in entities:
+            await self.update(entity)
+
+    async def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        await self.find_by_ids(entity_ids)
+        for entity_id in entity_ids:
+            await self.delete(entity_id)
+
+    async def iter_all(self) -> AsyncIterator[GenericEntity]:
+        for entity in await self.find_all():
+            yield entity
+
+
+class AsyncSearchableRepositoryInterface(Generic[GenericEntity,
+                                                 GenericSearchableInput,
+                                                 GenericSearchableOutput],
+                                         AsyncRepositoryInterface[GenericEntity], ABC):
+    @abstractmethod
+    async def search(self, search_params: GenericSearchableInput) -> GenericSearchableOutput:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def sortable_fields(self) -> List[str]:
+        raise NotImplementedError()
+
+    async def iter_search(self,
+                          search_params: GenericSearchableInput) -> AsyncIterator[GenericEntity]:
+        search_params = replace(search_params, include_count=False)
+        while True:
+            result = await self.search(search_params)
+            for entity in result.data:
+                yield entity
+            if result.next_cursor is None:
+                return
+            search_params = replace(search_params, after=result.next_cursor)
+
 
 @dataclass(slots=True, kw_only=True, frozen=True)
 class SearchParams(Generic[SearchFilter]):
@@ -55,6 +171,8 @@ class SearchParams(Generic[SearchFilter]):
     DEFAULT_ORDER_BY_FIELD = None
     DEFAULT_ORDER_BY_DIRECTION = None
     DEFAULT_FILTER = None
+    DEFAULT_AFTER = None
+    DEFAULT_INCLUDE_COUNT = True
 
     page: Optional[int] = field(
         default_factory=lambda: SearchParams.DEFAULT_PAGE)
@@ -66,6 +184,10 @@ class SearchParams(Generic[SearchFilter]):
         default_factory=lambda: SearchParams.DEFAULT_ORDER_BY_DIRECTION)
     filter: Optional[SearchFilter] = field(
         default_factory=lambda: SearchParams.DEFAULT_FILTER)
+    after: Optional[str] = field(
+        default_factory=lambda: SearchParams.DEFAULT_AFTER)
+    include_count: Optional[bool] = field(
+        default_factory=lambda: SearchParams.DEFAULT_INCLUDE_COUNT)
 
     def __post_init__(self):
         self._normalize_page()
@@ -73,6 +195,8 @@ class SearchParams(Generic[SearchFilter]):
         self._normalize_order_by_field()
         self._normalize_order_by_direction()
         self._normalize_filter()
+        self._normalize_after()
+        self._normalize_include_count()
 
     def _normalize_page(self):
         page = SearchParams._convert_to_int(self.page)
@@ -113,6 +237,20 @@ class SearchParams(Generic[SearchFilter]):
 
             object.__setattr__(self, 'filter', filter_param)
 
+    def _normalize_after(self):
+        if self.after is not None:
+            after = None if self.after == '' else str(self.after)
+            object.__setattr__(self, 'after', after)
+
+    def _normalize_include_count(self):
+        include_count = self.include_count
+        if isinstance(include_count, str):
+            include_count = include_count.lower() not in ['false', '0', 'no', 'off']
+        elif include_count is None:
+            include_count = SearchParams.DEFAULT_INCLUDE_COUNT
+
+        object.__setattr__(self, 'include_count', bool(include_count))
+
     @staticmethod
     def _convert_to_int(value: Any, default=0) -> int:  # pylint: disable=no-self-use
         try:
@@ -121,14 +259,87 @@ class SearchParams(Generic[SearchFilter]):
             return default
 
 
+def _is_int64(value: int) -> bool:
+    # the sequences and epoch keys of the repositories, and what SQLite binds
+    return -2 ** 63 <= value < 2 ** 63
+
+
+def _is_encodable(value: str) -> bool:
+    # JSON can carry lone surrogates, which no stored text has
+    try:
+        value.encode('utf-8')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCursor:
+    # position of the last item of a page: its sort key and the insertion
+    # sequence that breaks ties between equal keys
+    key: Any
+    sequence: int
+    order_by_field: Optional[str] = None
+    order_by_direction: Optional[str] = None
+    filter: Optional[str] = None
+
+    def encode(self) -> str:
+        payload = json.dumps([self.key, self.sequence, self.order_by_field,
+                              self.order_by_direction, self.filter],
+                             separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @classmethod
+    def decode(cls, value: str) -> 'SearchCursor':
+        try:
+            key, sequence, order_by_field, order_by_direction, filter_param = json.loads(
+                base64.urlsafe_b64decode(value.encode()))
+        except (binascii.Error, UnicodeError, ValueError, TypeError) as error:
+            raise InvalidSearchCursorException(
+                f'Invalid search cursor. data=[after: `{value}`]') from error
+
+        if not isinstance(sequence, int) or not _is_int64(sequence):
+            raise InvalidSearchCursorException(
+                f'Invalid search cursor. data=[after: `{value}`]')
+
+        return cls(key, sequence, order_by_field, order_by_direction, filter_param)
+
+    def raise_if_key_is_not(self, key_type: type) -> None:
+        # The key comes from the client and is compared with the sort keys of
+        # the order, so it must have their type: a text key, an epoch key, or
+        # None for the insertion order.
+        is_valid = type(self.key) is key_type  # pylint: disable=unidiomatic-typecheck
+        if is_valid and key_type is int:
+            is_valid = _is_int64(self.key)
+        elif is_valid and key_type is str:
+            is_valid = _is_encodable(self.key)
+
+        if not is_valid:
+            raise InvalidSearchCursorException(
+                'Invalid search cursor key. ' +
+                f'data=[key: `{self.key}`, order_by_field: `{self.order_by_field}`]')
+
+    def raise_if_not_matching(self,
+                              order_by_field: Optional[str],
+                              order_by_direction: Optional[str],
+                              filter_param: Optional[str]) -> None:
+        if (self.order_by_field, self.order_by_direction, self.filter) != \
+                (order_by_field, order_by_direction, filter_param):
+            raise InvalidSearchCursorException(
+                'Search cursor does not match the search params. ' +
+                f'data=[order_by_field: `{order_by_field}`, ' +
+                f'order_by_direction: `{order_by_direction}`, filter: `{filter_param}`]')
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class SearchResult(Generic[GenericEntity]):
-    count: int
+    count: Optional[int]
     items_per_page: int
     current_page: int
     current_page_count: int = field(init=False)
-    last_page: int = field(init=False)
+    last_page: Optional[int] = field(init=False)
     data: List[GenericEntity]
+    next_cursor: Optional[str] = None
 
     def __post_init__(self):
         self._normalize_data()
@@ -141,13 +352,15 @@ class SearchResult(Generic[GenericEntity]):
                 'current_page': self.current_page,
                 'current_page_count': self.current_page_count,
                 'last_page': self.last_page,
+                'next_cursor': self.next_cursor,
                 'data': self.data}
 
     def _init_current_page_count(self):
         object.__setattr__(self, 'current_page_count', len(self.data))
 
     def _init_last_page(self):
-        last_page = math.ceil(self.count / self.items_per_page)
+        last_page = None if self.count is None \
+            else math.ceil(self.count / self.items_per_page)
         object.__setattr__(self, 'last_page', last_page)
 
     def _normalize_data(self):
@@ -1,12 +1,36 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, Generic, List, TypeVar
-from rest_framework.serializers import Serializer
-from django.conf import settings
+from datetime import datetime
+from functools import cache
+from types import ModuleType
+from typing import Any, Callable, ClassVar, Dict, Generic, List, Optional, Tuple, TypeVar, \
+    TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from rest_framework.serializers import ListSerializer, Serializer
 
-if not settings.configured:
-    settings.configure(USE_I18N=False)
+
+@cache
+def load_drf_serializers() -> ModuleType:
+    # Django is only imported and configured the first time DRF validates something
+    # pylint: disable=import-outside-toplevel
+    from django.conf import settings
+
+    if not settings.configured:
+        settings.configure(USE_I18N=False)
+
+    from rest_framework import serializers
+    return serializers
+
+
+@cache
+def bind_serializer(serializer_class: type) -> 'Serializer':
+    # A serializer without data, shared by every validation with its rules. DRF
+    # deep copies the declared fields for every new serializer, here they are
+    # copied and bound once, and `run_validation` keeps no state on the serializer.
+    serializer = serializer_class()
+    serializer.fields  # pylint: disable=pointless-statement
+    return serializer
 
 
 ErrorsField = Dict[str, List[str]]
@@ -22,14 +46,267 @@ class FieldValidatorInterface(ABC, Generic[ValidatedDataField]):
     def validate(self, data: Any) -> bool:
         raise NotImplementedError()
 
+    def validate_many(self, data: List[Any]) -> bool:
+        # `errors` and `validated_data` become lists in the order of `data`, with
+        # None where a payload is invalid or valid respectively
+        errors = []
+        validated_data = []
+        for item in data:
+            self.errors = self.validated_data = None
+            is_valid = self.validate(item)
+            errors.append(None if is_valid else self.errors)
+            validated_data.append(self.validated_data if is_valid else None)
+
+        self.errors = errors
+        self.validated_data = validated_data
+        return not any(errors)
+
 
 class DRFValidator(FieldValidatorInterface[ValidatedDataField], ABC):
-    def validate(self, data: Serializer) -> bool:
+    def validate(self, data: 'Serializer') -> bool:
+        load_drf_serializers()
         if data.is_valid():
             self.validated_data = dict(data.validated_data)
             return True
 
-        self.errors = {field: [str(error) for error in errors]
-                       for field, errors in data.errors.items()}
+        self.errors = self._to_errors(data.errors)
+
+        return False
+
+    def validate_many(self, data: 'ListSerializer') -> bool:
+        # One serializer for the whole batch: its fields are bound once and every
+        # payload runs through them, as `ListSerializer` does, but the valid
+        # payloads keep their data when others fail.
+        errors = []
+        validated_data = []
+        for item in data.initial_data:
+            self.errors = self.validated_data = None
+            is_valid = self.validate_bound(data.child, item)
+            errors.append(None if is_valid else self.errors)
+            validated_data.append(self.validated_data if is_valid else None)
+
+        self.errors = errors
+        self.validated_data = validated_data
+        return not any(errors)
+
+    def validate_bound(self, serializer: 'Serializer', data: Any) -> bool:
+        # Validates `data` with a serializer that is not bound to it, like the
+        # ones `bind_serializer` shares. Same output as `validate`.
+        serializers = load_drf_serializers()
+        try:
+            self.validated_data = dict(serializer.run_validation(data))
+            return True
+        except serializers.ValidationError as error:
+            self.errors = self._to_errors(serializers.as_serializer_error(error))
+            return False
+
+    @staticmethod
+    def _to_errors(errors: Dict) -> ErrorsField:
+        return {field: [str(error) for error in field_errors]
+                for field, field_errors in errors.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class FieldRule:
+    field_type: type
+    required: bool = True
+    allow_null: bool = False
+    allow_blank: bool = False
+    max_length: Optional[int] = None
+    min_length: Optional[int] = None
+
 
+class FallbackRequired(Exception):
+    pass
+
+
+CompiledCheck = Callable[[Any], Tuple[Optional[ErrorsField], Optional[Dict]]]
+
+# Same messages DRF renders for the equivalent serializer fields.
+RULE_ERROR_MESSAGES = {
+    'required': 'This field is required.',
+    'null': 'This field may not be null.',
+    'blank': 'This field may not be blank.',
+    'max_length': 'Ensure this field has no more than {max_length} characters.',
+    'min_length': 'Ensure this field has at least {min_length} characters.',
+}
+
+_MISSING = object()
+_SKIP = object()
+
+
+@dataclass(frozen=True, slots=True)
+class _FieldError:
+    messages: List[str]
+
+
+def _has_unsafe_chars(value: str) -> bool:
+    if '\x00' in value:
+        return True
+
+    if value.isascii():
         return False
+
+    try:
+        value.encode('utf-8')
+    except UnicodeEncodeError:
+        return True
+
+    return False
+
+
+def _compile_empty_check(rule: FieldRule) -> Callable[[Any], Any]:
+    required_error = _FieldError([RULE_ERROR_MESSAGES['required']])
+    null_error = _FieldError([RULE_ERROR_MESSAGES['null']])
+
+    def check_empty(value: Any) -> Any:
+        if value is _MISSING:
+            return required_error if rule.required else _SKIP
+        return None if rule.allow_null else null_error
+
+    return check_empty
+
+
+def _compile_str_check(rule: FieldRule) -> Callable[[Any], Any]:
+    blank_error = _FieldError([RULE_ERROR_MESSAGES['blank']])
+    max_length_message = RULE_ERROR_MESSAGES['max_length'].format(
+        max_length=rule.max_length)
+    min_length_message = RULE_ERROR_MESSAGES['min_length'].format(
+        min_length=rule.min_length)
+    max_length = rule.max_length
+    min_length = rule.min_length
+    allow_blank = rule.allow_blank
+
+    def check_str(value: Any) -> Any:
+        if type(value) is not str or _has_unsafe_chars(value):  # pylint: disable=unidiomatic-typecheck
+            raise FallbackRequired()
+
+        value = value.strip()
+        if not value:
+            return '' if allow_blank else blank_error
+
+        messages = []
+        if max_length is not None and len(value) > max_length:
+            messages.append(max_length_message)
+        if min_length is not None and len(value) < min_length:
+            messages.append(min_length_message)
+
+        return _FieldError(messages) if messages else value
+
+    return check_str
+
+
+def _compile_bool_check(_: FieldRule) -> Callable[[Any], Any]:
+    def check_bool(value: Any) -> Any:
+        if value is True or value is False:
+            return value
+        raise FallbackRequired()
+
+    return check_bool
+
+
+def _compile_datetime_check(_: FieldRule) -> Callable[[Any], Any]:
+    def check_datetime(value: Any) -> Any:
+        # aware datetimes are converted by DRF according to the timezone settings
+        if isinstance(value, datetime) and value.tzinfo is None:
+            return value
+        raise FallbackRequired()
+
+    return check_datetime
+
+
+_TYPE_CHECK_COMPILERS = {
+    str: _compile_str_check,
+    bool: _compile_bool_check,
+    datetime: _compile_datetime_check,
+}
+
+
+def _compile_field(rule: FieldRule) -> Callable[[Any], Any]:
+    compiler = _TYPE_CHECK_COMPILERS.get(rule.field_type)
+    if compiler is None:
+        raise ValueError(f'Unsupported field type. data=[type: `{rule.field_type}`]')
+
+    check_empty = _compile_empty_check(rule)
+    check_value = compiler(rule)
+
+    def check_field(value: Any) -> Any:
+        if value is _MISSING or value is None:
+            return check_empty(value)
+        return check_value(value)
+
+    return check_field
+
+
+def compile_rules(rules: Dict[str, FieldRule]) -> CompiledCheck:
+    field_checks = tuple((field_name, _compile_field(rule))
+                         for field_name, rule in rules.items())
+
+    def check(data: Any) -> Tuple[Optional[ErrorsField], Optional[Dict]]:
+        if type(data) is not dict:  # pylint: disable=unidiomatic-typecheck
+            raise FallbackRequired()
+
+        errors = None
+        validated_data = {}
+        for field_name, check_field in field_checks:
+            result = check_field(data.get(field_name, _MISSING))
+            if result is _SKIP:
+                continue
+            if isinstance(result, _FieldError):
+                if errors is None:
+                    errors = {}
+                errors[field_name] = list(result.messages)
+                continue
+            validated_data[field_name] = result
+
+        return (errors, None) if errors else (None, validated_data)
+
+    return check
+
+
+class CompiledValidator(FieldValidatorInterface[ValidatedDataField], ABC):
+    # Payloads the compiled check can not decide on are delegated to the next
+    # validator in the MRO, so subclasses should also inherit a reference validator.
+    rules: ClassVar[Dict[str, FieldRule]] = {}
+    compiled_check: ClassVar[CompiledCheck]
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if 'rules' in cls.__dict__:
+            cls.compiled_check = staticmethod(compile_rules(cls.rules))
+
+    def validate(self, data: Any) -> bool:
+        try:
+            errors, validated_data = self.compiled_check(data)
+        except FallbackRequired:
+            return super().validate(data)
+
+        if errors:
+            self.errors = errors
+            return False
+
+        self.validated_data = validated_data
+        return True
+
+    def validate_many(self, data: List[Any]) -> bool:
+        errors = [None] * len(data)
+        validated_data = [None] * len(data)
+        fallback_indexes = []
+        for index, item in enumerate(data):
+            try:
+                errors[index], validated_data[index] = self.compiled_check(item)
+            except FallbackRequired:
+                fallback_indexes.append(index)
+
+        # the payloads the compiled check can not decide on go to the next
+        # validator as a single batch
+        if fallback_indexes:
+            super().validate_many([data[index] for index in fallback_indexes])
+            for index, item_errors, item_data in zip(fallback_indexes, self.errors,
+                                                     self.validated_data):
+                errors[index] = item_errors
+                validated_data[index] = item_data
+
+        self.errors = errors
+        self.validated_data = validated_data
+        return not any(errors)
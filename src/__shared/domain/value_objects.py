@@ -1,6 +1,7 @@
 from abc import ABC
 from dataclasses import dataclass, field, fields
 import json
+import re
 import uuid
 
 from __shared.domain.exceptions import InvalidUniqueEntityIdValueException
@@ -15,18 +16,81 @@ class ValueObject(ABC):
             else json.dumps({field_name: getattr(self, field_name) for field_name in fields_names})
 
 
+# the form `str(uuid.UUID(...))` produces, which needs no parsing to be validated
+_CANONICAL_UUID = re.compile(
+    r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+
 @dataclass(frozen=True, slots=True)
 class UniqueEntityId(ValueObject):
-    _id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    _id: str = None
 
     def __post_init__(self):
+        if self._id is None:
+            # a generated uuid4 is valid by construction
+            object.__setattr__(self, '_id', str(uuid.uuid4()))
+            return
+
         id_value = str(self._id) if isinstance(
             self._id, uuid.UUID) else self._id
         object.__setattr__(self, '_id', id_value)
         self.__validate()
 
+    def __str__(self) -> str:
+        return self._id
+
     def __validate(self):
+        if isinstance(self._id, str) and _CANONICAL_UUID.fullmatch(self._id):
+            return
+
         try:
             uuid.UUID(self._id)
         except ValueError as error:
             raise InvalidUniqueEntityIdValueException() from error
+
+
+@dataclass(frozen=True, slots=True)
+class CompactUniqueEntityId(UniqueEntityId):
+    # The id as a 128-bit int, which hashes and compares as an int and packs into
+    # 16 bytes for binary storage. The string form is built on every `str` and never
+    # kept, so an id takes about 84 bytes instead of the 125 of a UniqueEntityId,
+    # at the price of a new string whenever Entity.id is read.
+    _id: int = None
+
+    def __post_init__(self):
+        value = self._id
+        if value is None:
+            value = uuid.uuid4().int
+        elif isinstance(value, uuid.UUID):
+            value = value.int
+        elif isinstance(value, bytes):
+            value = self.__from_bytes(value)
+        elif isinstance(value, str):
+            value = self.__from_str(value)
+        elif not isinstance(value, int) or not 0 <= value < 1 << 128:
+            raise InvalidUniqueEntityIdValueException()
+
+        object.__setattr__(self, '_id', value)
+
+    def __str__(self) -> str:
+        hex_value = f'{self._id:032x}'
+        return f'{hex_value[:8]}-{hex_value[8:12]}-{hex_value[12:16]}-' \
+            f'{hex_value[16:20]}-{hex_value[20:]}'
+
+    @property
+    def bytes(self) -> bytes:
+        return self._id.to_bytes(16, 'big')
+
+    def __from_bytes(self, value: bytes) -> int:
+        if len(value) != 16:
+            raise InvalidUniqueEntityIdValueException()
+        return int.from_bytes(value, 'big')
+
+    def __from_str(self, value: str) -> int:
+        if _CANONICAL_UUID.fullmatch(value):
+            return int(value.replace('-', ''), 16)
+
+        try:
+            return uuid.UUID(value).int
+        except ValueError as error:
+            raise InvalidUniqueEntityIdValueException() from error
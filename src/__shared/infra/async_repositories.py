@@ -0,0 +1,102 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional
+
+from __shared.domain.repositories import AsyncRepositoryInterface, \
+    AsyncSearchableRepositoryInterface, GenericEntity, GenericSearchableInput, \
+    GenericSearchableOutput, RepositoryInterface, SearchableRepositoryInterface
+from __shared.domain.value_objects import UniqueEntityId
+
+
+@dataclass(slots=True)
+class AsyncRepositoryAdapter(AsyncRepositoryInterface[GenericEntity]):
+    # Runs a sync repository in a bounded thread pool. At most `max_workers`
+    # calls reach the repository at once, so repositories that are not thread
+    # safe should be wrapped in ThreadSafeRepositoryAdapter. No sync iterator
+    # is kept open between calls: iter_all is collected in a single call and
+    # iter_search follows the search cursors one page per call, so writes made
+    # while they are consumed cannot break them.
+    repository: RepositoryInterface[GenericEntity]
+    max_workers: int = 4
+    # entities per page when iter_search follows the next cursors
+    chunk_size: int = 256
+    executor: Optional[ThreadPoolExecutor] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                               thread_name_prefix='repository')
+
+    async def insert(self, entity: GenericEntity) -> None:
+        await self._run(self.repository.insert, entity)
+
+    async def find_by_id(self, entity_id: str | UniqueEntityId) -> GenericEntity:
+        return await self._run(self.repository.find_by_id, entity_id)
+
+    async def find_all(self) -> List[GenericEntity]:
+        return await self._run(self.repository.find_all)
+
+    async def update(self, entity: GenericEntity,
+                     expected_version: Optional[int] = None) -> None:
+        await self._run(self.repository.update, entity, expected_version)
+
+    async def delete(self, entity_id: str | UniqueEntityId) -> None:
+        await self._run(self.repository.delete, entity_id)
+
+    async def insert_many(self, entities: List[GenericEntity]) -> None:
+        await self._run(self.repository.insert_many, entities)
+
+    async def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[GenericEntity]:
+        return await self._run(self.repository.find_by_ids, entity_ids)
+
+    async def update_many(self, entities: List[GenericEntity]) -> None:
+        await self._run(self.repository.update_many, entities)
+
+    async def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        await self._run(self.repository.delete_many, entity_ids)
+
+    async def iter_all(self) -> AsyncIterator[GenericEntity]:
+        for entity in await self._run(self._collect, self.repository.iter_all):
+            yield entity
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+    async def _run(self, method: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(method, *args))
+
+    @staticmethod
+    def _collect(create_iterator: Callable[[], Iterator[GenericEntity]]) -> List[GenericEntity]:
+        return list(create_iterator())
+
+
+@dataclass(slots=True)
+class AsyncSearchableRepositoryAdapter(AsyncRepositoryAdapter[GenericEntity],
+                                       AsyncSearchableRepositoryInterface[
+                                           GenericEntity,
+                                           GenericSearchableInput,
+                                           GenericSearchableOutput]):
+    repository: SearchableRepositoryInterface[GenericEntity,
+                                              GenericSearchableInput,
+                                              GenericSearchableOutput]
+
+    async def search(self, search_params: GenericSearchableInput) -> GenericSearchableOutput:
+        return await self._run(self.repository.search, search_params)
+
+    def sortable_fields(self) -> List[str]:
+        return self.repository.sortable_fields()
+
+    async def iter_search(self,
+                          search_params: GenericSearchableInput) -> AsyncIterator[GenericEntity]:
+        search_params = replace(search_params, include_count=False)
+        while True:
+            result = await self.search(search_params)
+            for entity in result.data:
+                yield entity
+            if result.next_cursor is None:
+                return
+            search_params = replace(search_params, after=result.next_cursor,
+                                    items_per_page=self.chunk_size)
@@ -0,0 +1,82 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import time
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class SearchCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+
+
+@dataclass(slots=True)
+class SearchCache:
+    max_size: int = 128
+    # seconds an entry is served for, None keeps it until it is evicted or invalidated
+    ttl: Optional[float] = None
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+    expirations: int = field(default=0, init=False)
+    invalidations: int = field(default=0, init=False)
+    source: Any = field(default=None, init=False, repr=False)
+    source_size: int = field(default=0, init=False, repr=False)
+    _entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = field(
+        default_factory=OrderedDict, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < self.clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+
+        expires_at = float('inf') if self.ttl is None else self.clock() + self.ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def sync_with(self, data: Any) -> None:
+        # data can be replaced or resized without going through the repository writes
+        if self.source is not data or self.source_size != len(data):
+            self.invalidate()
+            self.source = data
+            self.source_size = len(data)
+
+    def stats(self) -> SearchCacheStats:
+        return SearchCacheStats(hits=self.hits,
+                                misses=self.misses,
+                                evictions=self.evictions,
+                                expirations=self.expirations,
+                                invalidations=self.invalidations,
+                                size=len(self._entries))
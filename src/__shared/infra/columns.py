@@ -0,0 +1,198 @@
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Iterable, Optional
+
+
+@dataclass(slots=True)
+class Bitmap:
+    bits: bytearray = field(default_factory=bytearray)
+    size: int = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, value: bool) -> None:
+        if self.size % 8 == 0:
+            self.bits.append(0)
+        self.size += 1
+        self.set(self.size - 1, value)
+
+    def set(self, row: int, value: bool) -> None:
+        if value:
+            self.bits[row >> 3] |= 1 << (row & 7)
+        else:
+            self.bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    def get(self, row: int) -> bool:
+        return bool(self.bits[row >> 3] & (1 << (row & 7)))
+
+
+@dataclass(slots=True)
+class StringColumn:
+    # Every value is UTF-8 encoded into a single buffer and addressed by
+    # (start, length), so a row costs 12 bytes plus its text instead of a str
+    # object. Updated values are appended and the old bytes are left behind
+    # until the column is compacted.
+    data: bytearray = field(default_factory=bytearray)
+    starts: array = field(default_factory=lambda: array('Q'))
+    lengths: array = field(default_factory=lambda: array('I'))
+    nulls: Bitmap = field(default_factory=Bitmap)
+    garbage: int = 0
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def append(self, value: Optional[str]) -> None:
+        start, length = self._write(value)
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.nulls.append(value is None)
+
+    def set(self, row: int, value: Optional[str]) -> None:
+        self.garbage += self.lengths[row]
+        self.starts[row], self.lengths[row] = self._write(value)
+        self.nulls.set(row, value is None)
+
+    def get(self, row: int) -> Optional[str]:
+        if self.nulls.get(row):
+            return None
+        start = self.starts[row]
+        return self.data[start:start + self.lengths[row]].decode()
+
+    def take(self, rows: Iterable[int]) -> 'StringColumn':
+        column = StringColumn()
+        for row in rows:
+            column.append(self.get(row))
+        return column
+
+    def _write(self, value: Optional[str]) -> tuple:
+        if value is None:
+            return len(self.data), 0
+        encoded = value.encode()
+        start = len(self.data)
+        self.data += encoded
+        return start, len(encoded)
+
+
+_EPOCH = datetime(1970, 1, 1)
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(slots=True)
+class DatetimeColumn:
+    # Naive datetimes as microseconds since 1970-01-01. Aware ones are stored as
+    # their UTC instant and keep their tzinfo aside, as they are the rare case.
+    micros: array = field(default_factory=lambda: array('q'))
+    timezones: Dict[int, tzinfo] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.micros)
+
+    def append(self, value: datetime) -> None:
+        self.micros.append(0)
+        self.set(len(self.micros) - 1, value)
+
+    def set(self, row: int, value: datetime) -> None:
+        if value.tzinfo is None:
+            self.micros[row] = (value - _EPOCH) // _MICROSECOND
+            self.timezones.pop(row, None)
+        else:
+            self.micros[row] = (value - _UTC_EPOCH) // _MICROSECOND
+            self.timezones[row] = value.tzinfo
+
+    def get(self, row: int) -> datetime:
+        time_zone = self.timezones.get(row)
+        if time_zone is None:
+            return _EPOCH + timedelta(microseconds=self.micros[row])
+        return (_UTC_EPOCH + timedelta(microseconds=self.micros[row])).astimezone(time_zone)
+
+    def take(self, rows: Iterable[int]) -> 'DatetimeColumn':
+        column = DatetimeColumn()
+        for row in rows:
+            column.micros.append(self.micros[row])
+            if row in self.timezones:
+                column.timezones[len(column.micros) - 1] = self.timezones[row]
+        return column
+
+
+_EMPTY_SLOT = -1
+_DELETED_SLOT = -2
+
+
+@dataclass(slots=True)
+class KeyColumn:
+    # Fixed width keys (e.g. the 16 bytes of a UUID) packed in one buffer, with an
+    # open addressing hash table of row numbers to find them. Costs the key width
+    # plus 16 to 32 bytes a row, where a dict needs two int objects and an entry.
+    width: int = 16
+    data: bytearray = field(default_factory=bytearray)
+    slots: array = field(default_factory=lambda: array('i', [_EMPTY_SLOT] * 8))
+    # filled slots, deleted ones included, as they lengthen the probes too
+    used: int = 0
+    size: int = 0
+
+    def __len__(self) -> int:
+        return len(self.data) // self.width
+
+    def get(self, row: int) -> bytes:
+        return bytes(self.data[row * self.width:(row + 1) * self.width])
+
+    def find(self, key: bytes) -> Optional[int]:
+        row = self.slots[self._find_slot(key)]
+        return None if row < 0 else row
+
+    def append(self, key: bytes) -> int:
+        row = len(self)
+        self.data += key
+        slot = self._find_slot(key)
+        if self.slots[slot] == _EMPTY_SLOT:
+            self.used += 1
+        self.slots[slot] = row
+        self.size += 1
+        if self.used * 2 > len(self.slots):
+            self._resize()
+        return row
+
+    def remove(self, key: bytes) -> None:
+        slot = self._find_slot(key)
+        if self.slots[slot] >= 0:
+            self.slots[slot] = _DELETED_SLOT
+            self.size -= 1
+
+    def take(self, rows: Iterable[int]) -> 'KeyColumn':
+        column = KeyColumn(self.width)
+        for row in rows:
+            column.append(self.get(row))
+        return column
+
+    def _find_slot(self, key: bytes) -> int:
+        # the matching slot, else the first deleted or empty slot on the probe path
+        slots, data, width = self.slots, self.data, self.width
+        mask = len(slots) - 1
+        index = hash(key) & mask
+        free = None
+        while True:
+            row = slots[index]
+            if row == _EMPTY_SLOT:
+                return index if free is None else free
+            if row == _DELETED_SLOT:
+                if free is None:
+                    free = index
+            elif data[row * width:(row + 1) * width] == key:
+                return index
+            index = (index + 1) & mask
+
+    def _resize(self) -> None:
+        rows = [row for row in self.slots if row >= 0]
+        capacity = 8
+        while capacity < len(rows) * 4:
+            capacity *= 2
+        self.slots = array('i', [_EMPTY_SLOT]) * capacity
+        self.used = 0
+        self.size = 0
+        for row in rows:
+            self.slots[self._find_slot(self.get(row))] = row
+            self.used += 1
+            self.size += 1
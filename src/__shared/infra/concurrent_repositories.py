@@ -0,0 +1,112 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Condition
+from typing import Any, Callable, Iterator, List, Optional
+
+from __shared.domain.repositories import GenericEntity, GenericSearchableInput, \
+    GenericSearchableOutput, RepositoryInterface, SearchableRepositoryInterface
+from __shared.domain.value_objects import UniqueEntityId
+
+
+@dataclass(slots=True)
+class ReadWriteLock:
+    # Many readers or a single writer. Waiting writers keep new readers out, so
+    # a steady stream of reads can not starve the writes. Not reentrant.
+    _condition: Condition = field(default_factory=Condition, repr=False)
+    _readers: int = field(default=0, repr=False)
+    _writing: bool = field(default=False, repr=False)
+    _waiting_writers: int = field(default=0, repr=False)
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._condition:
+            self._condition.wait_for(lambda: not self._writing and not self._waiting_writers)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+@dataclass(slots=True)
+class ThreadSafeRepositoryAdapter(RepositoryInterface[GenericEntity]):
+    # Shares a sync repository between threads: reads run at once and every write
+    # runs alone, so the not found check of a write and its change can not
+    # interleave with other writes. `iter_all` reads everything under one read
+    # lock, as the iterators of the wrapped repository can not outlive a write.
+    repository: RepositoryInterface[GenericEntity]
+    lock: ReadWriteLock = field(default_factory=ReadWriteLock, repr=False, compare=False)
+
+    def insert(self, entity: GenericEntity) -> None:
+        self._write(self.repository.insert, entity)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> GenericEntity:
+        return self._read(self.repository.find_by_id, entity_id)
+
+    def find_all(self) -> List[GenericEntity]:
+        return self._read(self.repository.find_all)
+
+    def update(self, entity: GenericEntity, expected_version: Optional[int] = None) -> None:
+        # the version check and the write run under the same write lock
+        self._write(self.repository.update, entity, expected_version)
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        self._write(self.repository.delete, entity_id)
+
+    def insert_many(self, entities: List[GenericEntity]) -> None:
+        self._write(self.repository.insert_many, entities)
+
+    def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[GenericEntity]:
+        return self._read(self.repository.find_by_ids, entity_ids)
+
+    def update_many(self, entities: List[GenericEntity]) -> None:
+        self._write(self.repository.update_many, entities)
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        self._write(self.repository.delete_many, entity_ids)
+
+    def _read(self, method: Callable[..., Any], *args: Any) -> Any:
+        with self.lock.read():
+            return method(*args)
+
+    def _write(self, method: Callable[..., Any], *args: Any) -> Any:
+        with self.lock.write():
+            return method(*args)
+
+
+@dataclass(slots=True)
+class ThreadSafeSearchableRepositoryAdapter(ThreadSafeRepositoryAdapter[GenericEntity],
+                                            SearchableRepositoryInterface[
+                                                GenericEntity,
+                                                GenericSearchableInput,
+                                                GenericSearchableOutput]):
+    # `iter_search` follows the next cursor a page per read lock, so writes can
+    # go on while the results are consumed
+    repository: SearchableRepositoryInterface[GenericEntity,
+                                              GenericSearchableInput,
+                                              GenericSearchableOutput]
+
+    def search(self, search_params: GenericSearchableInput) -> GenericSearchableOutput:
+        return self._read(self.repository.search, search_params)
+
+    def sortable_fields(self) -> List[str]:
+        return self.repository.sortable_fields()
@@ -0,0 +1,332 @@
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from __shared.domain.entities import Entity
+
+
+SortKey = Callable[[Entity], Any]
+# (sort key, insertion sequence, entity id). The sequence keeps ties in insertion
+# order, the same order `sorted` keeps for the repository data.
+SortedIndexEntry = Tuple[Any, int, str]
+# above this many changed entities an index is merged in one pass instead of
+# bisecting every entry in
+BULK_UPDATE_THRESHOLD = 64
+
+
+@dataclass(slots=True)
+class SortedIndex:
+    key: SortKey
+    entries: List[SortedIndexEntry] = field(default_factory=list)
+    # entities can be mutated in place before `update`, so the key an entry
+    # was indexed with is kept to find it again
+    indexed_keys: Dict[str, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, entity_id: str, entity: Entity, sequence: int) -> None:
+        key = self.indexed_keys[entity_id] = self.key(entity)
+        insort(self.entries, (key, sequence, entity_id))
+
+    def remove(self, entity_id: str, sequence: int) -> None:
+        if entity_id not in self.indexed_keys:
+            return
+
+        entry = (self.indexed_keys.pop(entity_id), sequence, entity_id)
+        position = bisect_left(self.entries, entry)
+        if position < len(self.entries) and self.entries[position] == entry:
+            del self.entries[position]
+
+    def replace_many(self, removed_ids: Set[str],
+                     added: Iterable[Tuple[str, Entity, int]]) -> None:
+        entries = self.entries
+        if removed_ids:
+            entries = [entry for entry in entries if entry[2] not in removed_ids]
+            for entity_id in removed_ids:
+                self.indexed_keys.pop(entity_id, None)
+
+        for entity_id, entity, sequence in added:
+            key = self.indexed_keys[entity_id] = self.key(entity)
+            entries.append((key, sequence, entity_id))
+
+        # timsort merges the already sorted run with the appended batch
+        entries.sort()
+        self.entries = entries
+
+    def rebuild(self, entities: Iterable[Tuple[str, Entity, int]]) -> None:
+        self.indexed_keys = {}
+        entries = []
+        for entity_id, entity, sequence in entities:
+            key = self.indexed_keys[entity_id] = self.key(entity)
+            entries.append((key, sequence, entity_id))
+        entries.sort()
+        self.entries = entries
+
+    def position_after(self, key: Any, sequence: int, reverse: bool = False) -> int:
+        # position (in the `slice` order) of the first entry after `(key, sequence)`,
+        # whether that entry is still indexed or not
+        position = bisect_left(self.entries, (key, sequence + 1))
+        if not reverse:
+            return position
+
+        run_start = bisect_left(self.entries, (key,))
+        run_end = bisect_left(self.entries, (key, math.inf), position)
+        return len(self.entries) - run_end + position - run_start
+
+    def iter_ids(self, start: int = 0, reverse: bool = False,
+                 chunk_size: int = 256) -> Iterator[str]:
+        # Every chunk resumes after the last entry of the one before, like a
+        # cursor, so entries added or removed while the ids are consumed do not
+        # shift the chunks: nothing is skipped and nothing repeats.
+        while chunk := self._slice_entries(start, start + chunk_size, reverse):
+            yield from (entry[2] for entry in chunk)
+            key, sequence, _ = chunk[-1]
+            start = self.position_after(key, sequence, reverse)
+
+    def slice(self, start: int, end: int, reverse: bool = False) -> List[str]:
+        return [entry[2] for entry in self._slice_entries(start, end, reverse)]
+
+    def _slice_entries(self, start: int, end: int,
+                       reverse: bool = False) -> List[SortedIndexEntry]:
+        if not reverse:
+            return self.entries[start:end]
+
+        return self._reverse_slice(start, end)
+
+    def _reverse_slice(self, start: int, end: int) -> List[SortedIndexEntry]:
+        # Descending order keeps ties in insertion order (like `sorted(reverse=True)`),
+        # so each run of equal keys is read forward while runs are read backwards.
+        entries = self.entries
+        size = len(entries)
+        end = min(end, size)
+        sliced = []
+        position = start
+        while position < end:
+            key = entries[size - 1 - position][0]
+            run_start = bisect_left(entries, (key,), 0, size - position)
+            run_end = bisect_left(entries, (key, math.inf), size - 1 - position)
+            offset = position - (size - run_end)
+            count = min(end - position, run_end - run_start - offset)
+            sliced.extend(entries[run_start + offset:run_start + offset + count])
+            position += count
+
+        return sliced
+
+
+def _insertion_order_key(_: Entity) -> None:
+    return None
+
+
+@dataclass(slots=True)
+class SortedIndexes:
+    keys: Dict[str, SortKey]
+    indexes: Dict[str, SortedIndex] = field(init=False)
+    sequences: Dict[str, int] = field(default_factory=dict)
+    next_sequence: int = 0
+    source: Optional[Dict[str, Entity]] = None
+
+    def __post_init__(self):
+        self.indexes = {field_name: SortedIndex(key)
+                        for field_name, key in self.keys.items()}
+
+    def get(self, field_name: Optional[str]) -> Optional[SortedIndex]:
+        return None if field_name is None else self.indexes.get(field_name)
+
+    def get_insertion_order(self) -> SortedIndex:
+        # only needed to resume unordered searches from a cursor, so built on demand
+        index = self.indexes.get(None)
+        if index is None:
+            index = self.indexes[None] = SortedIndex(_insertion_order_key)
+            index.rebuild((entity_id, entity, self.sequences[entity_id])
+                          for entity_id, entity in self.source.items())
+        return index
+
+    def key_type(self, field_name: Optional[str]) -> Optional[type]:
+        # type of the keys of an order, None while it has no keys to compare with
+        index = self.get(field_name)
+        if index is None:
+            return type(None)
+        return type(index.entries[0][0]) if index.entries else None
+
+    def cursor_key(self, field_name: Optional[str], entity_id: str) -> Any:
+        index = self.get(field_name)
+        return None if index is None else index.indexed_keys[entity_id]
+
+    def is_synced_with(self, data: Any) -> bool:
+        return self.source is data and len(self.sequences) == len(data)
+
+    def build(self, data: Dict[str, Entity]) -> None:
+        self.source = data
+        self.sequences = {entity_id: sequence
+                          for sequence, entity_id in enumerate(data)}
+        self.next_sequence = len(self.sequences)
+        for index in self.indexes.values():
+            index.rebuild((entity_id, entity, sequence)
+                          for sequence, (entity_id, entity) in enumerate(data.items()))
+
+    def order(self, entity_ids: Iterable[str],
+              field_name: Optional[str] = None, reverse: bool = False) -> List[str]:
+        ordered_ids = sorted(entity_ids, key=self.sequences.__getitem__)
+        index = self.get(field_name)
+        if index is not None:
+            # stable sort, ties stay in insertion order in both directions
+            ordered_ids.sort(key=index.indexed_keys.__getitem__, reverse=reverse)
+
+        return ordered_ids
+
+    def apply(self, removed: List[Entity], added: List[Entity]) -> None:
+        if len(removed) + len(added) > BULK_UPDATE_THRESHOLD:
+            self._apply_many(removed, added)
+            return
+
+        for entity in removed:
+            entity_id = entity.id
+            sequence = self.sequences.get(entity_id)
+            for index in self.indexes.values():
+                index.remove(entity_id, sequence)
+            if entity_id not in self.source:
+                self.sequences.pop(entity_id, None)
+
+        for entity in added:
+            entity_id = entity.id
+            sequence = self.sequences.get(entity_id)
+            if sequence is None:
+                sequence = self.sequences[entity_id] = self.next_sequence
+                self.next_sequence += 1
+            for index in self.indexes.values():
+                index.add(entity_id, entity, sequence)
+
+    def _apply_many(self, removed: List[Entity], added: List[Entity]) -> None:
+        removed_ids = {entity.id for entity in removed}
+        for entity_id in removed_ids:
+            if entity_id not in self.source:
+                self.sequences.pop(entity_id, None)
+
+        added_entries = []
+        for entity in added:
+            entity_id = entity.id
+            sequence = self.sequences.get(entity_id)
+            if sequence is None:
+                sequence = self.sequences[entity_id] = self.next_sequence
+                self.next_sequence += 1
+            added_entries.append((entity_id, entity, sequence))
+
+        for index in self.indexes.values():
+            index.replace_many(removed_ids, added_entries)
+
+
+_TOKEN_PATTERN = re.compile(r'\w+')
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def tokenize(text: Any) -> List[str]:
+    if text is None:
+        return []
+    return _TOKEN_PATTERN.findall(str(text).casefold())
+
+
+def match_tokens(query_tokens: List[str], tokens: Iterable[str]) -> bool:
+    tokens = set(tokens)
+    return bool(query_tokens) and all(
+        any(token.startswith(query_token) for token in tokens)
+        for query_token in query_tokens)
+
+
+@dataclass(slots=True)
+class InvertedIndex:
+    fields: List[str]
+    postings: Dict[str, Set[str]] = field(default_factory=dict)
+    # distinct tokens, sorted so a prefix maps to a contiguous range
+    tokens: List[str] = field(default_factory=list)
+    indexed_tokens: Dict[str, Set[str]] = field(default_factory=dict)
+    source: Optional[Dict[str, Entity]] = None
+
+    def entity_tokens(self, entity: Entity) -> Set[str]:
+        return {token for field_name in self.fields
+                for token in tokenize(getattr(entity, field_name))}
+
+    def is_synced_with(self, data: Any) -> bool:
+        return self.source is data and len(self.indexed_tokens) == len(data)
+
+    def build(self, data: Dict[str, Entity]) -> None:
+        self.source = data
+        self.postings = {}
+        self.indexed_tokens = {}
+        for entity_id, entity in data.items():
+            tokens = self.indexed_tokens[entity_id] = self.entity_tokens(entity)
+            for token in tokens:
+                self.postings.setdefault(token, set()).add(entity_id)
+        self.tokens = sorted(self.postings)
+
+    def apply(self, removed: List[Entity], added: List[Entity]) -> None:
+        if len(removed) + len(added) > BULK_UPDATE_THRESHOLD:
+            self._apply_many(removed, added)
+            return
+
+        for entity in removed:
+            self.remove(entity.id)
+        for entity in added:
+            self.add(entity.id, entity)
+
+    def add(self, entity_id: str, entity: Entity) -> None:
+        self.remove(entity_id)
+        tokens = self.indexed_tokens[entity_id] = self.entity_tokens(entity)
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = set()
+                insort(self.tokens, token)
+            posting.add(entity_id)
+
+    def remove(self, entity_id: str) -> None:
+        for token in self.indexed_tokens.pop(entity_id, ()):
+            posting = self.postings[token]
+            posting.discard(entity_id)
+            if not posting:
+                del self.postings[token]
+                del self.tokens[bisect_left(self.tokens, token)]
+
+    def _apply_many(self, removed: List[Entity], added: List[Entity]) -> None:
+        # the postings are updated first and the sorted tokens rebuilt once,
+        # instead of bisecting every new or emptied token in and out
+        postings = self.postings
+        for entity_id in [entity.id for entity in removed] + [entity.id for entity in added]:
+            for token in self.indexed_tokens.pop(entity_id, ()):
+                posting = postings[token]
+                posting.discard(entity_id)
+                if not posting:
+                    del postings[token]
+
+        for entity in added:
+            entity_id = entity.id
+            tokens = self.indexed_tokens[entity_id] = self.entity_tokens(entity)
+            for token in tokens:
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = set()
+                posting.add(entity_id)
+
+        self.tokens = sorted(postings)
+
+    def search(self, query: Any) -> Set[str]:
+        postings = sorted((self._prefix_postings(query_token)
+                           for query_token in set(tokenize(query))), key=len)
+        if not postings:
+            return set()
+
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result.intersection_update(posting)
+        return result
+
+    def _prefix_postings(self, prefix: str) -> Set[str]:
+        start = bisect_left(self.tokens, prefix)
+        end = bisect_left(self.tokens, prefix + _MAX_CHAR, start)
+
+        if end - start == 1:
+            return self.postings[self.tokens[start]]
+
+        return set().union(*(self.postings[token] for token in self.tokens[start:end]))
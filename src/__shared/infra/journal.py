@@ -0,0 +1,283 @@
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+import json
+import os
+import re
+from threading import Condition, Thread
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Type
+
+from __shared.domain.entities import Entity
+
+
+DURABILITY_MODES = ['sync', 'group', 'async']
+SNAPSHOT_FILE = 'snapshot.jsonl'
+_LOG_FILE_PATTERN = re.compile(r'^journal-(\d+)\.log$')
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    raise TypeError(f'Value is not serializable. data=[type: `{type(value).__name__}`]')
+
+
+def _decode_value(value: Dict) -> Any:
+    if '$datetime' in value:
+        return datetime.fromisoformat(value['$datetime'])
+    return value
+
+
+@dataclass(slots=True)
+class EntityCodec:
+    # Entities as JSON rows: the id, the fields in dataclass order, then the version
+    entity_class: Type[Entity]
+    field_names: List[str] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.field_names = [class_field.name for class_field in fields(self.entity_class)
+                            if class_field.name not in ['unique_entity_id', 'version']]
+
+    def encode(self, entity: Entity) -> List:
+        return [*entity.to_row(), entity.version]
+
+    def decode(self, row: List) -> Entity:
+        # rows logged before entities had versions end with the last field
+        version = row[len(self.field_names) + 1] if len(row) > len(self.field_names) + 1 else 0
+        # the rows were validated before they were logged
+        return self.entity_class.hydrate(row[0], version=version,
+                                         **dict(zip(self.field_names, row[1:])))
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value, default=_encode_value, separators=(',', ':'))
+
+    @staticmethod
+    def loads(value: str) -> Any:
+        return json.loads(value, object_hook=_decode_value)
+
+
+@dataclass(slots=True)
+class Journal:
+    # Append only log of the writes of an in-memory repository plus a snapshot of
+    # its data. Every write is one JSON line of [upserted rows, deleted ids] in
+    # journal-<generation>.log. A snapshot of generation g holds everything logged
+    # up to journal-g.log, so recovery loads it and replays the later logs.
+    #
+    # `mode` trades write latency for what a crash can lose:
+    #   'sync'  fsyncs every write before it returns
+    #   'group' hands every write to the OS and fsyncs every `group_size` writes,
+    #           a background thread fsyncs the rest within `flush_interval` seconds,
+    #           so only an OS crash loses the last group
+    #   'async' queues writes for a background thread that writes and fsyncs them
+    #           every `flush_interval` seconds
+    directory: str
+    codec: EntityCodec
+    mode: str = 'group'
+    group_size: int = 64
+    flush_interval: float = 0.05
+    # logged writes after which the next write first takes a snapshot, None never does
+    snapshot_every: Optional[int] = 10_000
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    generation: int = field(default=0, init=False)
+    records: int = field(default=0, init=False)
+    _file: Optional[TextIO] = field(default=None, init=False, repr=False)
+    _unsynced: int = field(default=0, init=False, repr=False)
+    _synced_at: float = field(default=0.0, init=False, repr=False)
+    _queue: List[str] = field(default_factory=list, init=False, repr=False)
+    _condition: Condition = field(default_factory=Condition, init=False, repr=False)
+    _writer: Optional[Thread] = field(default=None, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+    _error: Optional[BaseException] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.mode not in DURABILITY_MODES:
+            raise ValueError(f'Unknown durability mode. data=[mode: `{self.mode}`]')
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def snapshot_due(self) -> bool:
+        return self.snapshot_every is not None and self.records >= self.snapshot_every
+
+    def recover(self) -> Dict[str, Entity]:
+        data = {}
+        snapshot_generation = -1
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, encoding='utf-8') as snapshot_file:
+                snapshot_generation = self.codec.loads(snapshot_file.readline())['generation']
+                for line in snapshot_file:
+                    entity = self.codec.decode(self.codec.loads(line))
+                    data[entity.id] = entity
+
+        generations = self._log_generations()
+        self.records = 0
+        for generation in generations:
+            if generation > snapshot_generation:
+                self.records += self._replay(generation, data)
+
+        # appends go to a new log, never after a line a crash may have torn
+        self.generation = max([snapshot_generation, *generations]) + 1
+        return data
+
+    def append(self, upserted: List[Entity], deleted_ids: List[str]) -> None:
+        line = self.codec.dumps([[self.codec.encode(entity) for entity in upserted],
+                                 deleted_ids]) + '\n'
+        self.records += 1
+        if self.mode == 'async':
+            self._enqueue(line)
+            return
+
+        self._raise_writer_error()
+        with self._condition:
+            log_file = self._get_file()
+            log_file.write(line)
+            log_file.flush()
+            self._unsynced += 1
+            if self.mode == 'sync' or self._unsynced >= self.group_size or \
+                    self.clock() - self._synced_at >= self.flush_interval:
+                self._sync()
+            else:
+                # the tail of a burst is left to the writer
+                self._start_writer()
+
+    def snapshot(self, entities: Iterable[Entity]) -> None:
+        # Later writes go to the next log, so the snapshot covers this generation.
+        # The logs it covers are only removed once it replaced the previous one.
+        generation = self.generation
+        self._rotate()
+
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        temporary_path = snapshot_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as snapshot_file:
+            snapshot_file.write(self.codec.dumps({'generation': generation}) + '\n')
+            for entity in entities:
+                snapshot_file.write(self.codec.dumps(self.codec.encode(entity)) + '\n')
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, snapshot_path)
+        self._sync_directory()
+
+        for log_generation in self._log_generations():
+            if log_generation <= generation:
+                os.remove(self._log_path(log_generation))
+        self.records = 0
+
+    def flush(self) -> None:
+        if self.mode == 'async':
+            with self._condition:
+                self._condition.notify()
+                self._condition.wait_for(lambda: not self._queue or self._error is not None)
+            self._raise_writer_error()
+        else:
+            with self._condition:
+                if self._file is not None:
+                    self._sync()
+            self._raise_writer_error()
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            with self._condition:
+                self._closed = True
+                self._condition.notify()
+            self._writer.join()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _replay(self, generation: int, data: Dict[str, Entity]) -> int:
+        records = 0
+        with open(self._log_path(generation), encoding='utf-8') as log_file:
+            for line in log_file:
+                try:
+                    upserted, deleted_ids = self.codec.loads(line)
+                except ValueError:
+                    # a write torn by a crash, nothing after it was acknowledged
+                    break
+                for row in upserted:
+                    entity = self.codec.decode(row)
+                    data[entity.id] = entity
+                for entity_id in deleted_ids:
+                    data.pop(entity_id, None)
+                records += 1
+        return records
+
+    def _get_file(self) -> TextIO:
+        if self._file is None:
+            self._file = open(self._log_path(self.generation), 'a', encoding='utf-8')
+            self._sync_directory()
+            self._synced_at = self.clock()
+        return self._file
+
+    def _sync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = self.clock()
+
+    def _rotate(self) -> None:
+        if self.mode == 'async':
+            self.flush()
+        with self._condition:
+            self._rotate_file()
+
+    def _rotate_file(self) -> None:
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+        self.generation += 1
+
+    def _enqueue(self, line: str) -> None:
+        self._raise_writer_error()
+        with self._condition:
+            self._queue.append(line)
+            self._start_writer()
+
+    def _start_writer(self) -> None:
+        if self._writer is None:
+            self._writer = Thread(target=self._write_queue, name='journal', daemon=True)
+            self._writer.start()
+
+    def _write_queue(self) -> None:
+        # writes and fsyncs the queued lines in 'async' mode, fsyncs the lines
+        # written since the last fsync in 'group' mode
+        while True:
+            with self._condition:
+                if not self._closed:
+                    # woken early by `flush` and `close`
+                    self._condition.wait(timeout=self.flush_interval)
+                if self._closed and not self._queue:
+                    return
+                try:
+                    if self._queue:
+                        lines, self._queue = self._queue, []
+                        log_file = self._get_file()
+                        log_file.write(''.join(lines))
+                        log_file.flush()
+                        self._sync()
+                    elif self._unsynced and self._file is not None:
+                        self._sync()
+                except OSError as error:
+                    self._error = error
+                    self._queue = []
+                self._condition.notify_all()
+
+    def _raise_writer_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _sync_directory(self) -> None:
+        if os.name == 'nt':
+            return
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def _log_generations(self) -> List[int]:
+        matches = (_LOG_FILE_PATTERN.match(name) for name in os.listdir(self.directory))
+        return sorted(int(match.group(1)) for match in matches if match)
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f'journal-{generation:08d}.log')
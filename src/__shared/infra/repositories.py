@@ -1,52 +1,234 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Dict, Generic, List, Optional
+from bisect import bisect_left
+from dataclasses import dataclass, field, replace
+import heapq
+from itertools import islice
+from threading import Lock
+from typing import Any, Callable, ClassVar, Collection, Dict, Generic, Iterable, Iterator, List, \
+    Optional, Sequence, Tuple, TypeVar
 
 from __shared.domain.exceptions import NotFoundException
 from __shared.domain.repositories import GenericEntity, RepositoryInterface, \
-    SearchFilter, SearchParams, SearchResult, SearchableRepositoryInterface
+    SearchCursor, SearchFilter, SearchParams, SearchResult, SearchableRepositoryInterface
 from __shared.domain.value_objects import UniqueEntityId
+from __shared.infra.cache import SearchCache
+from __shared.infra.indexes import InvertedIndex, SortKey, SortedIndex, SortedIndexes
+from __shared.infra.journal import Journal
+from __shared.infra.sort_keys import text_sort_key
+from __shared.infra.vectorized import VectorizedSearchEngine, is_vectorized_search_available
+
+
+Item = TypeVar('Item')
+
+
+def entity_not_found(entity_id: Any) -> NotFoundException:
+    return NotFoundException(f'Entity not found. data=[id: `{entity_id}`]')
+
+
+def raise_if_any_not_found(missing_ids: Iterable[Any]) -> None:
+    # names every missing id once, in the order they were asked for
+    not_found = list(dict.fromkeys(str(entity_id) for entity_id in missing_ids))
+    if not_found:
+        ids = ', '.join(f'`{entity_id}`' for entity_id in not_found)
+        raise NotFoundException(f'Entities not found. data=[ids: {ids}]')
+
+
+def decode_cursor(after: Optional[str],
+                  order_by_field: Optional[str],
+                  order_by_direction: Optional[str],
+                  filter_param: Optional[Any],
+                  key_type: Optional[type]) -> Optional[SearchCursor]:
+    # `key_type` is the type of the keys of the order, None while it has none
+    if after is None:
+        return None
+
+    cursor = SearchCursor.decode(after)
+    cursor.raise_if_not_matching(order_by_field, order_by_direction, filter_param)
+    if key_type is not None:
+        cursor.raise_if_key_is_not(key_type)
+    return cursor
+
+
+def is_after_cursor(key: Any, sequence: int, cursor: SearchCursor, reverse: bool) -> bool:
+    if key == cursor.key:
+        return sequence > cursor.sequence
+    return key < cursor.key if reverse else key > cursor.key
+
+
+def position_after_cursor(items: Sequence[Item],
+                          cursor: SearchCursor,
+                          reverse: bool,
+                          sort_entry: Callable[[Item], Tuple[Any, int]]) -> int:
+    # `items` are in search order and `sort_entry` gives the (sort key, sequence)
+    # of one, so the items after the cursor are a suffix found by bisection
+    return bisect_left(items, True,
+                       key=lambda item: is_after_cursor(*sort_entry(item), cursor, reverse))
 
 
 @dataclass(slots=True)
 class InMemoryRepository(RepositoryInterface[GenericEntity], ABC):
+    # Holds copies of the written entities and returns copies, like a store that
+    # serializes them would, so a caller changing an entity it read changes
+    # nothing until it writes it back, and a rejected write leaves no trace.
     data: Dict[str, GenericEntity] = field(default_factory=lambda: {})
+    # makes the data survive restarts, it is recovered from the journal on init
+    journal: Optional[Journal] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.journal is not None:
+            self.data = self.journal.recover()
 
     def insert(self, entity: GenericEntity) -> None:
+        entity = entity.copy()
+        self._before_write([entity], [])
+        previous = self.data.get(entity.id)
         self.data.update({entity.id: entity})
+        self._after_write([previous] if previous is not None else [], [entity])
 
     def find_by_id(self, entity_id: str | UniqueEntityId) -> GenericEntity:
         self._raise_if_not_found(str(entity_id))
-        return self.data.get(str(entity_id))
+        return self.data.get(str(entity_id)).copy()
 
     def find_all(self) -> List[GenericEntity]:
-        return list(self.data.values())
+        return [entity.copy() for entity in self.data.values()]
 
-    def update(self, entity: GenericEntity) -> None:
+    def iter_all(self) -> Iterator[GenericEntity]:
+        # the ids are read up front, so writes while the entities are consumed do
+        # not break the iteration, deleted entities are skipped
+        for entity in map(self.data.get, list(self.data)):
+            if entity is not None:
+                yield entity.copy()
+
+    def update(self, entity: GenericEntity, expected_version: Optional[int] = None) -> None:
         self._raise_if_not_found(entity.id)
-        self.data.update({entity.id: entity})
+        previous = self.data.get(entity.id)
+        self._raise_if_version_conflict(entity.id, expected_version, previous.version)
+        stored = entity.copy()
+        stored._set('version', previous.version + 1)  # pylint: disable=protected-access
+        self._before_write([stored], [])
+        self.data.update({entity.id: stored})
+        # the caller only sees the new version once the write went through
+        entity._set('version', stored.version)  # pylint: disable=protected-access
+        self._after_write([previous], [stored])
 
     def delete(self, entity_id: str | UniqueEntityId) -> None:
         self._raise_if_not_found(str(entity_id))
-        self.data.pop(str(entity_id))
+        self._before_write([], [str(entity_id)])
+        previous = self.data.pop(str(entity_id))
+        self._after_write([previous], [])
+
+    def close(self) -> None:
+        if self.journal is not None:
+            self.journal.close()
+
+    def _before_write(self, upserted: List[GenericEntity], deleted_ids: List[str]) -> None:
+        # logged before the data changes, a write that is not logged fails as a whole
+        if self.journal is None:
+            return
+        if self.journal.snapshot_due:
+            self.journal.snapshot(self.data.values())
+        self.journal.append(upserted, deleted_ids)
+
+    def _after_write(self, removed: List[GenericEntity], added: List[GenericEntity]) -> None:
+        pass
+
+    def insert_many(self, entities: List[GenericEntity]) -> None:
+        batch = {entity.id: entity.copy() for entity in entities}
+        self._before_write(list(batch.values()), [])
+        removed = [self.data[entity_id] for entity_id in batch if entity_id in self.data]
+        self.data.update(batch)
+        self._after_write(removed, list(batch.values()))
+
+    def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[GenericEntity]:
+        entity_ids = [str(entity_id) for entity_id in entity_ids]
+        self._raise_if_any_not_found(entity_ids)
+        return [self.data[entity_id].copy() for entity_id in entity_ids]
+
+    def update_many(self, entities: List[GenericEntity]) -> None:
+        batch = {entity.id: entity for entity in entities}
+        self._raise_if_any_not_found(batch)
+        removed = [self.data[entity_id] for entity_id in batch]
+        stored = {entity_id: entity.copy() for entity_id, entity in batch.items()}
+        for entity, previous in zip(stored.values(), removed):
+            entity._set('version', previous.version + 1)  # pylint: disable=protected-access
+        self._before_write(list(stored.values()), [])
+        self.data.update(stored)
+        for entity in entities:
+            entity._set('version', stored[entity.id].version)  # pylint: disable=protected-access
+        self._after_write(removed, list(stored.values()))
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        entity_ids = list(dict.fromkeys(str(entity_id) for entity_id in entity_ids))
+        self._raise_if_any_not_found(entity_ids)
+        self._before_write([], entity_ids)
+        removed = [self.data.pop(entity_id) for entity_id in entity_ids]
+        self._after_write(removed, [])
 
     def _raise_if_not_found(self, entity_id: str) -> None:
         if entity_id not in self.data:
-            raise NotFoundException(
-                f'Entity not found. data=[id: `{entity_id}`]')
+            raise entity_not_found(entity_id)
+
+    def _raise_if_any_not_found(self, entity_ids: Iterable[str]) -> None:
+        raise_if_any_not_found(entity_id for entity_id in entity_ids
+                               if entity_id not in self.data)
 
 
+@dataclass(slots=True)
 class InMemorySearchableRepository(Generic[GenericEntity, SearchFilter],
                                    InMemoryRepository[GenericEntity],
                                    SearchableRepositoryInterface[GenericEntity,
                                                                  SearchParams[SearchFilter],
                                                                  SearchResult[GenericEntity]],
                                    ABC):
+    # a bounded heap beats a full sort while the items to return are at most this
+    # fraction of the items to order
+    TOP_K_MAX_RATIO: ClassVar[float] = 0.1
+
+    search_cache: Optional[SearchCache] = field(default=None, repr=False, compare=False)
+    # sorts the matches of filtered offset searches with NumPy, when it is installed
+    # and the sorted indexes can not page them directly; the engine is built with
+    # the sorted indexes and kept in step with them by every write
+    vectorized: bool = field(default=False, repr=False, compare=False)
+    _vectorized_engine: Optional[VectorizedSearchEngine] = field(
+        default=None, init=False, repr=False, compare=False)
+    # how the last search ordered its items: 'index', 'index_scan', 'unordered',
+    # 'top_k', 'full_sort', 'vectorized' or 'cache'
+    last_search_strategy: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False)
+    _sorted_indexes: Optional[SortedIndexes] = field(
+        default=None, init=False, repr=False, compare=False)
+    _text_index: Optional[InvertedIndex] = field(
+        default=None, init=False, repr=False, compare=False)
+    # searches only read the data, but build the indexes on demand and fill the
+    # cache, so concurrent searches (see ThreadSafeSearchableRepositoryAdapter)
+    # do that one at a time
+    _state_lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
+
     def search(self, search_params: SearchParams[SearchFilter]) -> SearchResult[GenericEntity]:
+        if isinstance(self.data, dict):
+            # the searches and the cache work with the stored entities, only the
+            # returned page is copied
+            result = self._indexed_search(search_params) if self.search_cache is None \
+                else self._cached_search(search_params)
+            return replace(result, data=[entity.copy() for entity in result.data])
+
+        # list backed data has no insertion sequence, so it only pages by offset
+
         filtered_data = self._filter(self.data, search_params.filter)
-        ordered_data = self._order_by(filtered_data,
-                                      search_params.order_by_field,
-                                      search_params.order_by_direction)
+        # only the items up to the requested page need to be ordered
+        end = search_params.page * search_params.items_per_page
+        strategy = self._sort_strategy(end, len(filtered_data)) \
+            if search_params.order_by_field in self.sortable_fields() else 'unordered'
+        if strategy == 'top_k':
+            ordered_data = self._order_by_top(filtered_data,
+                                              search_params.order_by_field,
+                                              search_params.order_by_direction,
+                                              end)
+        else:
+            ordered_data = self._order_by(filtered_data,
+                                          search_params.order_by_field,
+                                          search_params.order_by_direction)
+        self.last_search_strategy = strategy
         paginated_data = self._paginate(ordered_data,
                                         search_params.page,
                                         search_params.items_per_page)
@@ -71,11 +253,289 @@ class InMemorySearchableRepository(Generic[GenericEntity, SearchFilter],
 
         reverse = order_by_direction == 'desc'
         return sorted(data,
-                      key=lambda item: str(
-                          getattr(item, order_by_field)).lower(),
+                      key=self._sort_key(order_by_field),
                       reverse=reverse)
 
+    def _order_by_top(self,
+                      data: List[GenericEntity],
+                      order_by_field: Optional[str],
+                      order_by_direction: Optional[str],
+                      limit: int) -> List[GenericEntity]:
+        if order_by_field not in self.sortable_fields():
+            return data[:limit]
+
+        # same (stable) order as `sorted(...)[:limit]` in O(n log limit)
+        select = heapq.nlargest if order_by_direction == 'desc' else heapq.nsmallest
+        return select(limit, data, key=self._sort_key(order_by_field))
+
+    def _sort_strategy(self, limit: int, size: int) -> str:
+        # heapq does more work per item than `sorted`, so it only pays off for a
+        # small top
+        return 'top_k' if limit <= size * self.TOP_K_MAX_RATIO else 'full_sort'
+
+    def _scan_index(self,
+                    indexes: SortedIndexes,
+                    matched_ids: Collection[str],
+                    order_by_field: Optional[str],
+                    reverse: bool,
+                    limit: int) -> Optional[List[str]]:
+        # Evenly spread matches are found in about `limit * len(data) / matches`
+        # index entries, far less than sorting all the matches reads. The walk
+        # gives up after a few times that, as matches can bunch up at the end of
+        # the index, so a failed walk only adds a fraction to the sort.
+        expected = limit * len(self.data) // max(len(matched_ids), 1)
+        if expected * 8 > len(matched_ids):
+            return None
+
+        budget = expected * 4
+        ordered_ids = iter(self.data) if order_by_field is None \
+            else indexes.get(order_by_field).iter_ids(0, reverse)
+        scanned_ids = [entity_id for entity_id in islice(ordered_ids, budget)
+                       if entity_id in matched_ids]
+        if len(scanned_ids) < limit and budget < len(self.data):
+            return None
+        return scanned_ids
+
     def _paginate(self, data: List[GenericEntity], page: int, per_page: int) -> List[GenericEntity]:
         start = (page - 1) * per_page
         end = start + per_page
         return data[slice(start, end)]
+
+    def _sort_keys(self) -> Dict[str, SortKey]:
+        # typed keys computed once per entity by the indexes, any field without
+        # one is ordered by its casefolded text
+        return {}
+
+    def _sort_key(self, order_by_field: str) -> SortKey:
+        sort_key = self._sort_keys().get(order_by_field)
+        return text_sort_key(order_by_field) if sort_key is None else sort_key
+
+    def iter_search(self, search_params: SearchParams[SearchFilter]) -> Iterator[GenericEntity]:
+        if not isinstance(self.data, dict):
+            filtered_data = self._filter(self.data, search_params.filter)
+            ordered_data = self._order_by(filtered_data,
+                                          search_params.order_by_field,
+                                          search_params.order_by_direction)
+            start = (search_params.page - 1) * search_params.items_per_page
+            yield from islice(ordered_data, start, None)
+            return
+
+        indexes = self._get_sorted_indexes()
+        order_by_field = search_params.order_by_field \
+            if search_params.order_by_field in self.sortable_fields() else None
+        order_by_direction = search_params.order_by_direction if order_by_field else None
+        reverse = order_by_direction == 'desc'
+        start = (search_params.page - 1) * search_params.items_per_page
+        if search_params.after is not None:
+            cursor = decode_cursor(search_params.after, order_by_field, order_by_direction,
+                                   search_params.filter, indexes.key_type(order_by_field))
+            index = self._get_cursor_index(indexes, order_by_field)
+            entity_ids = index.iter_ids(
+                index.position_after(cursor.key, cursor.sequence, reverse), reverse)
+            start = 0
+        elif order_by_field is not None:
+            entity_ids = indexes.get(order_by_field).iter_ids(0, reverse)
+        else:
+            # a copy of the ids, the data can change while they are consumed
+            entity_ids = iter(list(self.data))
+
+        text_index = self._get_text_index() if search_params.filter is not None else None
+        if text_index is not None:
+            matched_ids = text_index.search(search_params.filter)
+            entity_ids = (entity_id for entity_id in entity_ids if entity_id in matched_ids)
+
+        # entities removed while the results are consumed are skipped
+        entities = (entity for entity in map(self.data.get, entity_ids) if entity is not None)
+        if search_params.filter is not None and text_index is None:
+            entities = self._iter_filter(entities, search_params.filter)
+
+        yield from (entity.copy() for entity in islice(entities, start, None))
+
+    def _iter_filter(self,
+                     entities: Iterator[GenericEntity],
+                     filter_param: SearchFilter,
+                     chunk_size: int = 256) -> Iterator[GenericEntity]:
+        while chunk := list(islice(entities, chunk_size)):
+            yield from self._filter(chunk, filter_param)
+
+    def _text_search_fields(self) -> List[str]:
+        return []
+
+    def _after_write(self, removed: List[GenericEntity], added: List[GenericEntity]) -> None:
+        if self.search_cache is not None:
+            self.search_cache.invalidate()
+        if self._sorted_indexes is not None and self._sorted_indexes.source is self.data:
+            self._sorted_indexes.apply(removed, added)
+        text_index = self._text_index
+        if text_index is not None and text_index.source is self.data:
+            text_index.apply(removed, added)
+        else:
+            text_index = None
+        if self._vectorized_engine is not None and \
+                self._vectorized_engine.source is self.data and \
+                self._sorted_indexes.source is self.data:
+            self._vectorized_engine.apply(removed, added, self._sorted_indexes, text_index)
+
+    def _get_sorted_indexes(self) -> SortedIndexes:
+        with self._state_lock:
+            if self._sorted_indexes is None:
+                self._sorted_indexes = SortedIndexes(
+                    {field_name: self._sort_key(field_name)
+                     for field_name in self.sortable_fields()})
+
+            if not self._sorted_indexes.is_synced_with(self.data):
+                self._sorted_indexes.build(self.data)
+
+            if self.vectorized and is_vectorized_search_available():
+                if self._vectorized_engine is None:
+                    self._vectorized_engine = VectorizedSearchEngine(
+                        self.sortable_fields(), self._vectorized_flags())
+                if not self._vectorized_engine.is_synced_with(self.data):
+                    self._vectorized_engine.build(self.data, self._sorted_indexes)
+
+            return self._sorted_indexes
+
+    def _get_cursor_index(self, indexes: SortedIndexes,
+                          order_by_field: Optional[str]) -> SortedIndex:
+        if order_by_field is not None:
+            return indexes.get(order_by_field)
+        with self._state_lock:
+            return indexes.get_insertion_order()
+
+    def _get_vectorized_engine(self) -> Optional[VectorizedSearchEngine]:
+        # only an engine in step with the data is used, it is never rebuilt here
+        engine = self._vectorized_engine
+        return engine if engine is not None and engine.is_synced_with(self.data) else None
+
+    def _vectorized_flags(self) -> Dict[str, Callable[[GenericEntity], bool]]:
+        # boolean fields the vectorized engine keeps as columns to mask on
+        return {}
+
+    def _get_text_index(self) -> Optional[InvertedIndex]:
+        with self._state_lock:
+            if self._text_index is None:
+                text_search_fields = self._text_search_fields()
+                if not text_search_fields:
+                    return None
+                self._text_index = InvertedIndex(text_search_fields)
+
+            if not self._text_index.is_synced_with(self.data):
+                self._text_index.build(self.data)
+
+            return self._text_index
+
+    def _cached_search(self,
+                       search_params: SearchParams[SearchFilter]) -> SearchResult[GenericEntity]:
+        key = self._search_cache_key(search_params)
+        with self._state_lock:
+            self.search_cache.sync_with(self.data)
+            result = self.search_cache.get(key)
+        if result is None:
+            result = self._indexed_search(search_params)
+            with self._state_lock:
+                self.search_cache.put(key, result)
+        else:
+            self.last_search_strategy = 'cache'
+        return result
+
+    def _search_cache_key(self, search_params: SearchParams[SearchFilter]) -> tuple:
+        # params that only differ on a field the repository can not sort by
+        # return the same page
+        order_by_field = search_params.order_by_field \
+            if search_params.order_by_field in self.sortable_fields() else None
+        order_by_direction = search_params.order_by_direction if order_by_field else None
+        return (search_params.page, search_params.items_per_page, order_by_field,
+                order_by_direction, search_params.filter, search_params.after,
+                search_params.include_count)
+
+    def _indexed_search(self,
+                        search_params: SearchParams[SearchFilter]) -> SearchResult[GenericEntity]:
+        indexes = self._get_sorted_indexes()
+        order_by_field = search_params.order_by_field \
+            if search_params.order_by_field in self.sortable_fields() else None
+        order_by_direction = search_params.order_by_direction if order_by_field else None
+        reverse = order_by_direction == 'desc'
+        cursor = decode_cursor(search_params.after, order_by_field, order_by_direction,
+                               search_params.filter, indexes.key_type(order_by_field))
+
+        per_page = search_params.items_per_page
+        # one extra item tells whether there is a next page
+        limit = per_page + 1
+        start = (search_params.page - 1) * per_page
+        cursor_index = None
+        cursor_position = None
+        if cursor is not None:
+            cursor_index = self._get_cursor_index(indexes, order_by_field)
+            cursor_position = cursor_index.position_after(cursor.key, cursor.sequence, reverse)
+
+        text_index = self._get_text_index() if search_params.filter is not None else None
+        strategy = 'index'
+        # unfiltered pages, cursors and index scans are read straight off the sorted
+        # indexes, the vectorized engine only replaces sorting every match
+        if search_params.filter is None:
+            count = len(self.data)
+            if cursor_index is not None:
+                entity_ids = cursor_index.slice(cursor_position, cursor_position + limit, reverse)
+            elif order_by_field is not None:
+                entity_ids = indexes.get(order_by_field).slice(start, start + limit, reverse)
+            else:
+                entity_ids = list(islice(self.data, start, start + limit))
+            data = [self.data[entity_id] for entity_id in entity_ids]
+        elif text_index is not None:
+            matched_ids = text_index.search(search_params.filter)
+            count = len(matched_ids)
+            if cursor_index is not None:
+                entity_ids = list(islice((entity_id for entity_id
+                                          in cursor_index.iter_ids(cursor_position, reverse)
+                                          if entity_id in matched_ids), limit))
+            elif (scanned_ids := self._scan_index(indexes, matched_ids, order_by_field,
+                                                   reverse, start + limit)) is not None:
+                strategy = 'index_scan'
+                entity_ids = scanned_ids[start:start + limit]
+            elif (engine := self._get_vectorized_engine()) is not None:
+                strategy = 'vectorized'
+                _, entity_ids = engine.select(order_by_field, reverse,
+                                              engine.filter_mask(search_params.filter,
+                                                                 matched_ids),
+                                              start, start + limit)
+            else:
+                strategy = 'full_sort'
+                entity_ids = indexes.order(matched_ids, order_by_field,
+                                           reverse)[start:start + limit]
+            data = [self.data[entity_id] for entity_id in entity_ids]
+        elif cursor is None and (engine := self._get_vectorized_engine()) is not None:
+            matched_ids = (item.id for item in self._filter(list(self.data.values()),
+                                                            search_params.filter))
+            count, entity_ids = engine.select(order_by_field, reverse,
+                                              engine.mask_of(matched_ids), start, start + limit)
+            data = [self.data[entity_id] for entity_id in entity_ids]
+            strategy = 'vectorized'
+        else:
+            index = indexes.get(order_by_field)
+            ordered_data = list(self.data.values()) if index is None \
+                else [self.data[entity_id] for entity_id in index.slice(0, len(index), reverse)]
+            filtered_data = self._filter(ordered_data, search_params.filter)
+            count = len(filtered_data)
+            if cursor is not None:
+                start = position_after_cursor(
+                    filtered_data, cursor, reverse,
+                    lambda item: (indexes.cursor_key(order_by_field, item.id),
+                                  indexes.sequences[item.id]))
+            data = filtered_data[start:start + limit]
+
+        self.last_search_strategy = strategy
+        next_cursor = None
+        if len(data) > per_page:
+            data = data[:per_page]
+            last_id = data[-1].id
+            next_cursor = SearchCursor(indexes.cursor_key(order_by_field, last_id),
+                                       indexes.sequences[last_id],
+                                       order_by_field,
+                                       order_by_direction,
+                                       search_params.filter).encode()
+
+        return SearchResult(count=count if search_params.include_count else None,
+                            items_per_page=per_page,
+                            current_page=search_params.page,
+                            data=data,
+                            next_cursor=next_cursor)
@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
+from typing import Any
+
+from __shared.infra.indexes import SortKey
+
+
+_EPOCH = datetime(1970, 1, 1)
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def casefold_text(value: Any) -> str:
+    return '' if value is None else str(value).casefold()
+
+
+def epoch_micros(value: datetime) -> int:
+    # naive datetimes are taken as UTC, so both kinds order on the same scale
+    if value.tzinfo is None:
+        return (value - _EPOCH) // _MICROSECOND
+    return (value - _UTC_EPOCH) // _MICROSECOND
+
+
+def text_sort_key(field_name: str) -> SortKey:
+    get_value = attrgetter(field_name)
+    return lambda entity: casefold_text(get_value(entity))
+
+
+def datetime_sort_key(field_name: str) -> SortKey:
+    get_value = attrgetter(field_name)
+    return lambda entity: epoch_micros(get_value(entity))
@@ -0,0 +1,76 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from queue import Empty, Queue
+import sqlite3
+from threading import Lock
+from typing import Iterator
+
+
+class ConnectionPoolExhaustedException(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class SqliteConnectionPool:
+    database: str = ':memory:'
+    size: int = 5
+    timeout: float = 5.0
+    cached_statements: int = 256
+    _connections: Queue = field(init=False, repr=False)
+    _created: int = field(default=0, init=False, repr=False)
+    _lock: Lock = field(default_factory=Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        # every connection to `:memory:` opens a different database
+        if self.database == ':memory:':
+            self.size = 1
+        self._connections = Queue(maxsize=self.size)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._acquire()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except Empty:
+                break
+
+            with self._lock:
+                self._created -= 1
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._connections.get_nowait()
+        except Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            return self._connect()
+
+        try:
+            return self._connections.get(timeout=self.timeout)
+        except Empty as error:
+            raise ConnectionPoolExhaustedException(
+                f'No connection available. data=[database: `{self.database}`, ' +
+                f'size: `{self.size}`]') from error
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database,
+                                     timeout=self.timeout,
+                                     check_same_thread=False,
+                                     cached_statements=self.cached_statements)
+        if self.database != ':memory:':
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
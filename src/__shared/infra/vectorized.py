@@ -0,0 +1,268 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from __shared.domain.entities import Entity
+from __shared.infra.indexes import BULK_UPDATE_THRESHOLD, InvertedIndex, SortedIndex, \
+    SortedIndexes, match_tokens, tokenize
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_vectorized_search_available() -> bool:
+    return numpy is not None
+
+
+# below this many rows the columns are not compacted
+COMPACT_MIN_DEAD_ROWS = 1024
+# text filters whose masks are kept, the least recently used ones are dropped
+MAX_FILTER_MASKS = 32
+
+
+@dataclass(slots=True)
+class VectorizedSearchEngine:
+    # The repository data as NumPy columns, one row per entity in insertion order.
+    # Every sort field is an int64 column: the sort key itself when it is an int
+    # (the epoch micros of a datetime), else the position where the run of its key
+    # starts in the repository's SortedIndex. Flags (like `is_active`) are bool
+    # columns. Filters are boolean masks and ordering and paging run in NumPy, only
+    # the requested page is mapped back to entity ids. The masks of the latest text
+    # filters are kept, so paging through one filter maps its matches to rows once.
+    #
+    # Writes patch the columns in place: values are set on their row, ranks are
+    # shifted by one around the written key, the kept masks are matched against the
+    # written rows and a deleted row is only marked dead.
+    fields: List[str]
+    flags: Dict[str, Callable[[Entity], bool]] = field(default_factory=dict)
+    ids: List[Optional[str]] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    alive: Any = None
+    columns: Dict[str, Any] = field(default_factory=dict)
+    # fields whose column holds ranks rather than the sort keys
+    ranked: Set[str] = field(default_factory=set)
+    flag_columns: Dict[str, Any] = field(default_factory=dict)
+    # text filter -> (query tokens, mask), in least recently used order
+    filter_masks: Dict[str, Tuple[List[str], Any]] = field(default_factory=dict)
+    size: int = 0
+    source: Optional[Dict[str, Entity]] = None
+
+    def is_synced_with(self, data: Any) -> bool:
+        return self.source is data and len(self.rows) == len(data)
+
+    def build(self, data: Dict[str, Entity], indexes: SortedIndexes) -> None:
+        self.source = data
+        self.ids = list(data)
+        self.rows = {entity_id: row for row, entity_id in enumerate(self.ids)}
+        self.size = len(self.ids)
+        capacity = max(self.size, 16)
+        self.alive = numpy.zeros(capacity, dtype=bool)
+        self.alive[:self.size] = True
+        self.columns, self.ranked, self.filter_masks = {}, set(), {}
+        for field_name in self.fields:
+            self.columns[field_name] = numpy.full(capacity, -1, dtype=numpy.int64)
+            index = indexes.get(field_name)
+            keys = [index.indexed_keys[entity_id] for entity_id in self.ids]
+            if all(type(key) is int for key in keys):  # pylint: disable=unidiomatic-typecheck
+                try:
+                    self.columns[field_name][:self.size] = keys
+                    continue
+                except OverflowError:
+                    pass
+            self._rank_all(field_name, index)
+        self.flag_columns = {}
+        for flag_name, get_flag in self.flags.items():
+            self.flag_columns[flag_name] = numpy.zeros(capacity, dtype=bool)
+            self.flag_columns[flag_name][:self.size] = [bool(get_flag(entity))
+                                                         for entity in data.values()]
+
+    def apply(self, removed: List[Entity], added: List[Entity], indexes: SortedIndexes,
+              text_index: Optional[InvertedIndex] = None) -> None:
+        # called once `indexes` and `text_index` hold the write
+        bulk = len(removed) + len(added) > BULK_UPDATE_THRESHOLD
+        removed_rows = [self.rows[entity.id] for entity in removed if entity.id in self.rows]
+        added_ids = [entity.id for entity in added]
+        if not bulk:
+            for field_name in self.ranked:
+                self._unrank(field_name, removed_rows)
+
+        for row in removed_rows:
+            if self.ids[row] not in self.source:
+                self.alive[row] = False
+                self.rows.pop(self.ids[row])
+                self.ids[row] = None
+
+        for entity in added:
+            row = self.rows.get(entity.id)
+            if row is None:
+                row = self._append(entity.id)
+            for flag_name, get_flag in self.flags.items():
+                self.flag_columns[flag_name][row] = bool(get_flag(entity))
+
+        # a key that no longer fits an int64 column turns it into ranks
+        ranked_now = set()
+        for field_name in set(self.fields) - self.ranked:
+            index = indexes.get(field_name)
+            if not all(self._set_key(field_name, self.rows[entity_id], index)
+                       for entity_id in added_ids):
+                self._rank_all(field_name, index)
+                ranked_now.add(field_name)
+
+        for field_name in self.ranked - ranked_now:
+            if bulk:
+                self._rank_all(field_name, indexes.get(field_name))
+            else:
+                self._rank(field_name, indexes, added_ids)
+
+        self._match_filters(added_ids, text_index)
+        dead_rows = self.size - len(self.rows)
+        if dead_rows > max(COMPACT_MIN_DEAD_ROWS, len(self.rows)):
+            self._compact()
+
+    def mask_of(self, entity_ids: Iterable[str]) -> Any:
+        mask = numpy.zeros(self.size, dtype=bool)
+        # faster than numpy.fromiter over the map
+        mask[numpy.array(list(map(self.rows.__getitem__, entity_ids)), dtype=numpy.int64)] = True
+        return mask
+
+    def filter_mask(self, filter_param: str, matched_ids: Iterable[str]) -> Any:
+        # `matched_ids` are what the text index found for `filter_param`
+        cached = self.filter_masks.pop(filter_param, None)
+        if cached is None:
+            cached = (tokenize(filter_param), self.mask_of(matched_ids))
+            if len(self.filter_masks) >= MAX_FILTER_MASKS:
+                del self.filter_masks[next(iter(self.filter_masks))]
+        self.filter_masks[filter_param] = cached
+        return cached[1]
+
+    def mask(self, flag_name: str, value: bool = True) -> Any:
+        return self.flag_columns[flag_name][:self.size] == value
+
+    def select(self,
+               order_by_field: Optional[str],
+               reverse: bool,
+               mask: Any,
+               start: int,
+               stop: int) -> Tuple[int, List[str]]:
+        rows = numpy.flatnonzero(mask & self.alive[:self.size])
+        count = len(rows)
+
+        if order_by_field is None or start >= count:
+            page = rows[start:stop]
+        else:
+            keys = self.columns[order_by_field][rows]
+            if reverse:
+                keys = -keys
+            # rows are in insertion order and the sorts are stable, so ties keep
+            # insertion order both ways; a partial sort keeps every row tied with
+            # the last one of the page
+            if stop < count:
+                last_key = numpy.partition(keys, stop - 1)[stop - 1]
+                candidates = numpy.flatnonzero(keys <= last_key)
+                ordered = candidates[numpy.argsort(keys[candidates], kind='stable')]
+            else:
+                ordered = numpy.argsort(keys, kind='stable')
+            page = rows[ordered[start:stop]]
+
+        return count, [self.ids[row] for row in page.tolist()]
+
+    def _append(self, entity_id: str) -> int:
+        row = self.size
+        if row == len(self.alive):
+            # doubled, so appends take amortized constant time
+            self._resize(row, 2 * row)
+        self.ids.append(entity_id)
+        self.rows[entity_id] = row
+        self.alive[row] = True
+        self.size += 1
+        return row
+
+    def _set_key(self, field_name: str, row: int, index: SortedIndex) -> bool:
+        key = index.indexed_keys[self.ids[row]]
+        if type(key) is not int:  # pylint: disable=unidiomatic-typecheck
+            return False
+        try:
+            self.columns[field_name][row] = key
+        except OverflowError:
+            return False
+        return True
+
+    def _rank_all(self, field_name: str, index: SortedIndex) -> None:
+        self.ranked.add(field_name)
+        ranks = self.columns[field_name]
+        ranks[:] = -1
+        rows, run_starts = [], []
+        run_key, run_start = None, 0
+        for position, (key, _, entity_id) in enumerate(index.entries):
+            if position == 0 or key != run_key:
+                run_key, run_start = key, position
+            rows.append(self.rows[entity_id])
+            run_starts.append(run_start)
+        ranks[rows] = run_starts
+
+    def _unrank(self, field_name: str, rows: List[int]) -> None:
+        # the runs after the one a row leaves start one position earlier
+        ranks = self.columns[field_name][:self.size]
+        for row in rows:
+            rank = ranks[row]
+            ranks[row] = -1
+            ranks[ranks > rank] -= 1
+
+    def _rank(self, field_name: str, indexes: SortedIndexes, entity_ids: List[str]) -> None:
+        # Ranks the added entries in index order, as if they were inserted one by
+        # one: the entries before each of them are then all ranked already.
+        index = indexes.get(field_name)
+        entries = index.entries
+        ranks = self.columns[field_name][:self.size]
+        positions = sorted(
+            bisect_left(entries, (index.indexed_keys[entity_id],
+                                  indexes.sequences[entity_id], entity_id))
+            for entity_id in set(entity_ids))
+        pending = {entries[position][2] for position in positions}
+        for position in positions:
+            key, _, entity_id = entries[position]
+            pending.discard(entity_id)
+            run_start = bisect_left(entries, (key,), 0, position + 1)
+            run_end = bisect_left(entries, (key, math.inf), position)
+            is_new_run = all(entries[other][2] in pending or other == position
+                             for other in range(run_start, run_end))
+            ranks[ranks >= (run_start if is_new_run else run_start + 1)] += 1
+            ranks[self.rows[entity_id]] = run_start
+
+    def _match_filters(self, entity_ids: List[str], text_index: Optional[InvertedIndex]) -> None:
+        if text_index is None:
+            self.filter_masks.clear()
+            return
+
+        written = [(self.rows[entity_id], text_index.indexed_tokens[entity_id])
+                   for entity_id in entity_ids]
+        for filter_param, (query_tokens, mask) in self.filter_masks.items():
+            if len(mask) < self.size:
+                mask = numpy.concatenate([mask, numpy.zeros(self.size - len(mask), dtype=bool)])
+                self.filter_masks[filter_param] = (query_tokens, mask)
+            for row, tokens in written:
+                mask[row] = match_tokens(query_tokens, tokens)
+
+    def _compact(self) -> None:
+        rows = numpy.flatnonzero(self.alive[:self.size])
+        self.filter_masks = {filter_param: (query_tokens, mask[rows])
+                             for filter_param, (query_tokens, mask) in self.filter_masks.items()}
+        self.ids = [self.ids[row] for row in rows.tolist()]
+        self.rows = {entity_id: row for row, entity_id in enumerate(self.ids)}
+        self._resize(rows, max(2 * len(rows), 16))
+        self.size = len(rows)
+
+    def _resize(self, rows: Any, capacity: int) -> None:
+        # keeps `rows` (a count or the row numbers to keep) at the top of columns
+        # of `capacity` rows
+        rows = numpy.arange(rows) if isinstance(rows, int) else rows
+        alive = {'alive': self.alive}
+        for columns, empty in [(self.columns, -1), (self.flag_columns, False), (alive, False)]:
+            for name, column in columns.items():
+                resized = numpy.full(capacity, empty, dtype=column.dtype)
+                resized[:len(rows)] = column[rows]
+                columns[name] = resized
+        self.alive = alive['alive']
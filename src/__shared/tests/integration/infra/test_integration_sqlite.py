@@ -0,0 +1,67 @@
+import os
+import tempfile
+from threading import Thread
+from unittest import TestCase
+
+from __shared.infra.sqlite import ConnectionPoolExhaustedException, SqliteConnectionPool
+
+
+class SqliteConnectionPoolIntegrationTest(TestCase):
+    def test_memory_database_should_use_a_single_connection(self):
+        pool = SqliteConnectionPool(':memory:', size=5)
+        self.assertEqual(1, pool.size)
+
+        with pool.connection() as connection:
+            connection.execute('CREATE TABLE stub (value INTEGER)')
+
+        with pool.connection() as connection:
+            self.assertEqual([], connection.execute('SELECT * FROM stub').fetchall())
+
+        pool.close()
+
+    def test_should_reuse_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = SqliteConnectionPool(os.path.join(directory, 'stub.sqlite3'), size=2)
+
+            with pool.connection() as first:
+                with pool.connection() as second:
+                    self.assertIsNot(first, second)
+
+            with pool.connection() as connection:
+                self.assertIn(connection, [first, second])
+
+            pool.close()
+
+    def test_should_raise_an_exception_when_exhausted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = SqliteConnectionPool(os.path.join(directory, 'stub.sqlite3'),
+                                        size=1, timeout=0.01)
+
+            with pool.connection():
+                with self.assertRaises(ConnectionPoolExhaustedException):
+                    with pool.connection():
+                        pass
+
+            pool.close()
+
+    def test_should_be_shared_between_threads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pool = SqliteConnectionPool(os.path.join(directory, 'stub.sqlite3'), size=2)
+            with pool.connection() as connection, connection:
+                connection.execute('CREATE TABLE stub (value INTEGER)')
+
+            def insert_values():
+                for value in range(50):
+                    with pool.connection() as connection, connection:
+                        connection.execute('INSERT INTO stub VALUES (?)', (value,))
+
+            threads = [Thread(target=insert_values) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            with pool.connection() as connection:
+                self.assertEqual(200, connection.execute('SELECT COUNT(*) FROM stub').fetchone()[0])
+
+            pool.close()
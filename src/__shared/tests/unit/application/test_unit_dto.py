@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+from __shared.application.dto import PaginationOutput, SearchOutputMapper
+from __shared.domain.repositories import SearchResult
+
+
+class SearchOutputMapperUnitTest(TestCase):
+    def test_to_output(self):
+        calls = []
+
+        def to_output_many(items):
+            calls.append(items)
+            return [item.upper() for item in items]
+
+        mapper = SearchOutputMapper(to_output_many)
+        result = SearchResult(count=5, items_per_page=2, current_page=2, data=['a', 'b'],
+                              next_cursor='cursor')
+
+        self.assertEqual(PaginationOutput(items=['A', 'B'], total=5, current_page=2,
+                                          last_page=3, per_page=2, next_cursor='cursor'),
+                         mapper.to_output(result))
+        self.assertListEqual([['a', 'b']], calls)
+
+    def test_to_output_without_count(self):
+        result = SearchResult(count=None, items_per_page=2, current_page=1, data=[])
+
+        output = SearchOutputMapper(list).to_output(result)
+
+        self.assertEqual(PaginationOutput(items=[], total=None, current_page=1,
+                                          last_page=None, per_page=2), output)
@@ -1,6 +1,6 @@
-from unittest import TestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
 
-from __shared.application.use_cases import UseCase
+from __shared.application.use_cases import AsyncUseCase, UseCase
 
 
 class UseCaseUnitTest(TestCase):
@@ -10,3 +10,19 @@ class UseCaseUnitTest(TestCase):
 
         message = "Can't instantiate abstract class UseCase with abstract method execute"
         self.assertEqual(message, error.exception.args[0])
+
+
+class AsyncUseCaseUnitTest(IsolatedAsyncioTestCase):
+    def test_should_implements_execute_method(self):
+        with self.assertRaises(TypeError) as error:
+            AsyncUseCase()  # pylint: disable=abstract-class-instantiated
+
+        message = "Can't instantiate abstract class AsyncUseCase with abstract method execute"
+        self.assertEqual(message, error.exception.args[0])
+
+    async def test_execute_should_be_awaitable(self):
+        class AsyncUseCaseStub(AsyncUseCase[int, int]):
+            async def execute(self, input_params: int) -> int:
+                return input_params * 2
+
+        self.assertEqual(4, await AsyncUseCaseStub().execute(2))
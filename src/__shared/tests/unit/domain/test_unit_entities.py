@@ -1,6 +1,6 @@
 from abc import ABC
-from dataclasses import dataclass, is_dataclass
-from typing import Optional
+from dataclasses import dataclass, field, is_dataclass
+from typing import List, Optional
 from unittest import TestCase
 
 from __shared.domain.entities import Entity
@@ -52,6 +52,91 @@ class EntityUnitTest(TestCase):
 
         self.assertDictEqual(expected_dict, entity.to_dict())
 
+    def test_to_dict_should_not_copy_values(self):
+        value = ['mutable']
+        entity = Stub(prop1='prop1', prop2=value)
+
+        entity_dict = entity.to_dict()
+
+        self.assertIs(value, entity_dict['prop2'])
+        self.assertListEqual(['prop1', 'prop2', 'prop3', 'id'], list(entity_dict))
+
+    def test_should_return_a_row(self):
+        entity = Stub(
+            unique_entity_id='2d01459a-f739-48d0-a36b-e1cb2a8c72f0', prop1='prop1', prop2='prop2')
+
+        self.assertTupleEqual(
+            ('2d01459a-f739-48d0-a36b-e1cb2a8c72f0', 'prop1', 'prop2', 'default value'),
+            entity.to_row())
+
+    def test_serializers_should_be_created_per_class(self):
+        @dataclass(frozen=True, kw_only=True)
+        class OtherStub(Stub):
+            prop4: int = 4
+
+        entity = OtherStub(prop1='prop1', prop2='prop2')
+
+        self.assertEqual(4, entity.to_dict()['prop4'])
+        self.assertEqual(5, len(entity.to_row()))
+        self.assertEqual(4, len(Stub(prop1='prop1', prop2='prop2').to_row()))
+
+    def test_version_should_not_be_serialized_nor_compared(self):
+        entity = Stub(unique_entity_id='2d01459a-f739-48d0-a36b-e1cb2a8c72f0',
+                      prop1='prop1', prop2='prop2')
+        self.assertEqual(0, entity.version)
+
+        stored = Stub(unique_entity_id='2d01459a-f739-48d0-a36b-e1cb2a8c72f0',
+                      prop1='prop1', prop2='prop2', version=3)
+
+        self.assertEqual(3, stored.version)
+        self.assertEqual(entity, stored)
+        self.assertEqual(entity.to_dict(), stored.to_dict())
+        self.assertTupleEqual(entity.to_row(), stored.to_row())
+
+    def test_hydrate_should_skip_post_init(self):
+        @dataclass(frozen=True, kw_only=True)
+        class ValidatedStub(Stub):
+            tags: List[str] = field(default_factory=list)
+
+            def __post_init__(self):
+                raise AssertionError('should not be called')
+
+        entity = ValidatedStub.hydrate('2d01459a-f739-48d0-a36b-e1cb2a8c72f0',
+                                       prop1='prop1', prop2='prop2', version=2)
+
+        self.assertIsInstance(entity, ValidatedStub)
+        self.assertIsInstance(entity.unique_entity_id, UniqueEntityId)
+        self.assertEqual('2d01459a-f739-48d0-a36b-e1cb2a8c72f0', entity.id)
+        self.assertEqual(('prop1', 'prop2', 'default value', [], 2),
+                         (entity.prop1, entity.prop2, entity.prop3, entity.tags, entity.version))
+        self.assertIsNot(entity.tags, ValidatedStub.hydrate(entity.unique_entity_id,
+                                                            prop1='prop1', prop2='prop2').tags)
+
+    def test_hydrate_should_equal_the_constructor(self):
+        unique_entity_id = UniqueEntityId()
+        entity = Stub(unique_entity_id=unique_entity_id, prop1='prop1', prop2='prop2',
+                      prop3=None, version=1)
+
+        hydrated = Stub.hydrate(unique_entity_id, prop1='prop1', prop2='prop2', prop3=None,
+                                version=1)
+
+        self.assertIs(unique_entity_id, hydrated.unique_entity_id)
+        self.assertEqual(entity, hydrated)
+        self.assertEqual(entity.to_dict(), hydrated.to_dict())
+        with self.assertRaises(TypeError):
+            Stub.hydrate(unique_entity_id, prop1='prop1')
+
+    def test_copy(self):
+        entity = Stub(prop1='prop1', prop2='prop2', version=2)
+
+        copy = entity.copy()
+
+        self.assertIsNot(entity, copy)
+        self.assertIs(entity.unique_entity_id, copy.unique_entity_id)
+        self.assertEqual((entity, 2), (copy, copy.version))
+        copy._set('prop1', 'new value')  # pylint: disable=protected-access
+        self.assertEqual('prop1', entity.prop1)
+
     def test_set_method(self):
         entity = Stub(prop1='prop1', prop2='prop2')
         entity._set('prop1', 'new value')  # pylint: disable=protected-access
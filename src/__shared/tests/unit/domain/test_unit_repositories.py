@@ -1,9 +1,11 @@
 from dataclasses import dataclass
 from typing import List, Optional
-from unittest import TestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
 from __shared.domain.entities import Entity
-from __shared.domain.repositories import GenericEntity, RepositoryInterface, \
-    SearchFilter, SearchParams, SearchResult, SearchableRepositoryInterface
+from __shared.domain.exceptions import InvalidSearchCursorException, NotFoundException
+from __shared.domain.repositories import AsyncRepositoryInterface, \
+    AsyncSearchableRepositoryInterface, GenericEntity, RepositoryInterface, \
+    SearchCursor, SearchFilter, SearchParams, SearchResult, SearchableRepositoryInterface
 
 
 @dataclass(frozen=True, kw_only=True, slots=True)
@@ -23,7 +25,104 @@ class RepositoryInterfaceUnitTest(TestCase):
         self.assertEqual(expected_message, error.exception.args[0])
 
 
+class RepositoryInterfaceStub(RepositoryInterface[EntityStub]):
+    def __init__(self) -> None:
+        self.data = {}
+
+    def insert(self, entity: EntityStub) -> None:
+        self.data[entity.id] = entity
+
+    def find_by_id(self, entity_id) -> EntityStub:
+        if str(entity_id) not in self.data:
+            raise NotFoundException()
+        return self.data[str(entity_id)]
+
+    def find_all(self) -> List[EntityStub]:
+        return list(self.data.values())
+
+    def update(self, entity: EntityStub) -> None:
+        self.find_by_id(entity.id)
+        self.data[entity.id] = entity
+
+    def delete(self, entity_id) -> None:
+        self.find_by_id(entity_id)
+        del self.data[str(entity_id)]
+
+
+class RepositoryInterfaceBulkOperationsUnitTest(TestCase):
+    def test_should_fall_back_to_single_entity_operations(self):
+        repository = RepositoryInterfaceStub()
+        items = [EntityStub(name='a', age=1), EntityStub(name='b', age=2)]
+
+        repository.insert_many(items)
+        self.assertListEqual(items, repository.find_by_ids([items[0].id, items[1].id]))
+
+        items_updated = [EntityStub(unique_entity_id=item.id, name='c', age=3) for item in items]
+        repository.update_many(items_updated)
+        self.assertListEqual(items_updated, repository.find_all())
+
+        repository.delete_many([items[0].id])
+        self.assertListEqual([items_updated[1]], repository.find_all())
+
+    def test_update_many_and_delete_many_should_check_every_item_first(self):
+        repository = RepositoryInterfaceStub()
+        item = EntityStub(name='a', age=1)
+        repository.insert(item)
+        missing_item = EntityStub(name='b', age=2)
+
+        with self.assertRaises(NotFoundException):
+            repository.update_many([EntityStub(unique_entity_id=item.id, name='c', age=3),
+                                    missing_item])
+        with self.assertRaises(NotFoundException):
+            repository.delete_many([item.id, missing_item.id])
+
+        self.assertListEqual([item], repository.find_all())
+
+    def test_iter_all_should_fall_back_to_find_all(self):
+        repository = RepositoryInterfaceStub()
+        items = [EntityStub(name='a', age=1), EntityStub(name='b', age=2)]
+        repository.insert_many(items)
+
+        self.assertListEqual(items, list(repository.iter_all()))
+
+
+class SearchableRepositoryInterfaceStub(RepositoryInterfaceStub,
+                                        SearchableRepositoryInterface[EntityStub,
+                                                                      SearchParams,
+                                                                      SearchResult]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.searches = []
+
+    def search(self, search_params: SearchParams) -> SearchResult:
+        self.searches.append(search_params)
+        per_page = search_params.items_per_page
+        start = int(search_params.after) if search_params.after is not None \
+            else (search_params.page - 1) * per_page
+        data = self.find_all()[start:start + per_page]
+        next_cursor = str(start + per_page) if start + per_page < len(self.data) else None
+        return SearchResult(count=None, items_per_page=per_page,
+                            current_page=search_params.page, data=data,
+                            next_cursor=next_cursor)
+
+    def sortable_fields(self) -> List[str]:
+        return []
+
+
 class SearchableRepositoryInterfaceUnitTest(TestCase):
+    def test_iter_search_should_follow_the_next_cursor(self):
+        repository = SearchableRepositoryInterfaceStub()
+        items = [EntityStub(name=str(index), age=index) for index in range(7)]
+        repository.insert_many(items)
+
+        result = list(repository.iter_search(SearchParams(page=2, items_per_page=2)))
+
+        self.assertListEqual(items[2:], result)
+        self.assertListEqual([None, '4', '6'],
+                             [search_params.after for search_params in repository.searches])
+        self.assertTrue(all(not search_params.include_count
+                            for search_params in repository.searches))
+
     def test_should_implement_methods(self):
         with self.assertRaises(TypeError) as error:
             # pylint: disable=abstract-class-instantiated
@@ -42,7 +141,9 @@ class SearchParamsUnitTest(TestCase):
             'items_per_page': Optional[int],
             'order_by_field': Optional[str],
             'order_by_direction': Optional[str],
-            'filter': Optional[SearchFilter]
+            'filter': Optional[SearchFilter],
+            'after': Optional[str],
+            'include_count': Optional[bool]
         }
 
         result = SearchParams.__annotations__
@@ -62,6 +163,10 @@ class SearchParamsUnitTest(TestCase):
                           'SearchParams.order_by_direction default value should be `None`')
         self.assertIsNone(search_params.filter,
                           'SearchParams.filter default value should be `None`')
+        self.assertIsNone(search_params.after,
+                          'SearchParams.after default value should be `None`')
+        self.assertTrue(search_params.include_count,
+                        'SearchParams.include_count default value should be `True`')
 
     def test_page_prop_behavior(self):
         cases = [
@@ -222,15 +327,95 @@ class SearchParamsUnitTest(TestCase):
                 expected, search_params.filter, expected_message)
 
 
+    def test_after_behavior(self):
+        cases = [
+            {'after': None, 'expected': None},
+            {'after': '', 'expected': None},
+            {'after': 'cursor', 'expected': 'cursor'},
+            {'after': 10, 'expected': '10'},
+        ]
+
+        for case in cases:
+            after = case.get('after')
+            expected = case.get('expected')
+            expected_message = f'`SearchParams(after={after})` ' + \
+                f'should set the `SearchParams.after` value to `{expected}`.'
+
+            search_params = SearchParams(after=after)
+
+            self.assertEqual(expected, search_params.after, expected_message)
+
+    def test_include_count_behavior(self):
+        cases = [
+            {'include_count': None, 'expected': True},
+            {'include_count': True, 'expected': True},
+            {'include_count': False, 'expected': False},
+            {'include_count': 'true', 'expected': True},
+            {'include_count': 'False', 'expected': False},
+            {'include_count': '0', 'expected': False},
+            {'include_count': 0, 'expected': False},
+            {'include_count': 1, 'expected': True},
+        ]
+
+        for case in cases:
+            include_count = case.get('include_count')
+            expected = case.get('expected')
+            expected_message = f'`SearchParams(include_count={include_count})` ' + \
+                f'should set the `SearchParams.include_count` value to `{expected}`.'
+
+            search_params = SearchParams(include_count=include_count)
+
+            self.assertEqual(expected, search_params.include_count, expected_message)
+
+
+class SearchCursorUnitTest(TestCase):
+    def test_encode_and_decode(self):
+        cursor = SearchCursor('name value', 10, 'name', 'desc', 'filter')
+
+        encoded = cursor.encode()
+
+        self.assertIsInstance(encoded, str)
+        self.assertEqual(cursor, SearchCursor.decode(encoded))
+
+    def test_decode_should_raise_an_exception_when_the_cursor_is_invalid(self):
+        for value in ['invalid', 'W10=', SearchCursor('key', 10).encode()[:-4],
+                      SearchCursor('key', '10').encode(), SearchCursor('key', 2 ** 63).encode()]:
+            with self.assertRaises(InvalidSearchCursorException, msg=value):
+                SearchCursor.decode(value)
+
+    def test_raise_if_not_matching(self):
+        cursor = SearchCursor('name value', 10, 'name', 'asc', None)
+        cursor.raise_if_not_matching('name', 'asc', None)
+
+        with self.assertRaises(InvalidSearchCursorException):
+            cursor.raise_if_not_matching('name', 'desc', None)
+
+        with self.assertRaises(InvalidSearchCursorException):
+            cursor.raise_if_not_matching('name', 'asc', 'filter')
+
+    def test_raise_if_key_is_not(self):
+        SearchCursor('name value', 10).raise_if_key_is_not(str)
+        SearchCursor(-2 ** 63, 10).raise_if_key_is_not(int)
+        SearchCursor(None, 10).raise_if_key_is_not(type(None))
+
+        for key, key_type in [(5, str), ('\ud800', str), ('5', int), (True, int), (1.5, int),
+                              (2 ** 63, int), ([1], type(None))]:
+            with self.assertRaises(InvalidSearchCursorException, msg=key) as error:
+                SearchCursor(key, 10, 'name').raise_if_key_is_not(key_type)
+            self.assertEqual(f'Invalid search cursor key. data=[key: `{key}`, ' +
+                             'order_by_field: `name`]', error.exception.args[0])
+
+
 class SearchResultUnitTest(TestCase):
     def test_should_have_correct_props(self):
         expected = {
-            'count': int,
+            'count': Optional[int],
             'current_page': int,
             'current_page_count': int,
             'items_per_page': int,
-            'last_page': int,
-            'data': List[GenericEntity]
+            'last_page': Optional[int],
+            'data': List[GenericEntity],
+            'next_cursor': Optional[str]
         }
 
         self.assertDictEqual(expected, SearchResult.__annotations__)
@@ -266,6 +451,13 @@ class SearchResultUnitTest(TestCase):
 
         self.assertEqual(3, search_result.last_page)
 
+    def test_last_page_when_count_is_none(self):
+        search_result = SearchResult(
+            data=[], count=None, current_page=1, items_per_page=10, next_cursor='cursor')
+
+        self.assertIsNone(search_result.last_page)
+        self.assertEqual('cursor', search_result.next_cursor)
+
     def test_to_dict(self):
         stub = EntityStub(name='name value', age=20)
         search_result = SearchResult(
@@ -276,6 +468,56 @@ class SearchResultUnitTest(TestCase):
                     'current_page': 1,
                     'current_page_count': 2,
                     'last_page': 1,
+                    'next_cursor': None,
                     'data': [stub, stub]}
 
         self.assertDictEqual(expected, search_result.to_dict())
+
+
+class AsyncRepositoryInterfaceStub(AsyncRepositoryInterface[EntityStub]):
+    def __init__(self) -> None:
+        self.repository = RepositoryInterfaceStub()
+
+    async def insert(self, entity: EntityStub) -> None:
+        self.repository.insert(entity)
+
+    async def find_by_id(self, entity_id) -> EntityStub:
+        return self.repository.find_by_id(entity_id)
+
+    async def find_all(self) -> List[EntityStub]:
+        return self.repository.find_all()
+
+    async def update(self, entity: EntityStub) -> None:
+        self.repository.update(entity)
+
+    async def delete(self, entity_id) -> None:
+        self.repository.delete(entity_id)
+
+
+class AsyncRepositoryInterfaceUnitTest(IsolatedAsyncioTestCase):
+    def test_should_implement_methods(self):
+        with self.assertRaises(TypeError) as error:
+            # pylint: disable=abstract-class-instantiated
+            AsyncSearchableRepositoryInterface()
+
+        expected_message = "Can't instantiate abstract class " + \
+            "AsyncSearchableRepositoryInterface with abstract methods delete, find_all, " + \
+            "find_by_id, insert, search, sortable_fields, update"
+        self.assertEqual(expected_message, error.exception.args[0])
+
+    async def test_should_fall_back_to_single_entity_operations(self):
+        repository = AsyncRepositoryInterfaceStub()
+        items = [EntityStub(name='a', age=1), EntityStub(name='b', age=2)]
+
+        await repository.insert_many(items)
+        self.assertListEqual(items, await repository.find_by_ids([item.id for item in items]))
+        self.assertListEqual(items, [item async for item in repository.iter_all()])
+
+        items_updated = [EntityStub(unique_entity_id=item.id, name='c', age=3) for item in items]
+        await repository.update_many(items_updated)
+        self.assertListEqual(items_updated, await repository.find_all())
+
+        with self.assertRaises(NotFoundException):
+            await repository.delete_many([items[0].id, EntityStub(name='d', age=4).id])
+        await repository.delete_many([items[0].id])
+        self.assertListEqual([items_updated[1]], await repository.find_all())
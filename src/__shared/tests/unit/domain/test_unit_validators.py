@@ -1,9 +1,11 @@
 from dataclasses import fields
+from datetime import datetime, timezone
 from unittest import TestCase
 from unittest.mock import MagicMock, PropertyMock, patch
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import CharField, Serializer, ValidationError
 
-from __shared.domain.validators import DRFValidator, FieldValidatorInterface
+from __shared.domain.validators import CompiledValidator, DRFValidator, FallbackRequired, \
+    FieldRule, FieldValidatorInterface, bind_serializer, compile_rules
 
 
 class FieldValidatorInterfaceUnitTest(TestCase):
@@ -29,6 +31,23 @@ class FieldValidatorInterfaceUnitTest(TestCase):
         self.assertEqual('validated_data', validated_data_field.name)
         self.assertIsNone(validated_data_field.default)
 
+    def test_validate_many_should_validate_every_payload(self):
+        class ValidatorStub(FieldValidatorInterface):
+            def validate(self, data) -> bool:
+                if data:
+                    self.validated_data = data
+                    return True
+                self.errors = {'field': ['error']}
+                return False
+
+        validator = ValidatorStub()
+        self.assertFalse(validator.validate_many(['a', '', 'b']))
+        self.assertListEqual([None, {'field': ['error']}, None], validator.errors)
+        self.assertListEqual(['a', None, 'b'], validator.validated_data)
+
+        self.assertTrue(validator.validate_many(['a']))
+        self.assertListEqual([None], validator.errors)
+
 
 # pylint: disable=unused-argument
 class DRFValidatorUnitTest(TestCase):
@@ -55,3 +74,154 @@ class DRFValidatorUnitTest(TestCase):
         validator.validate(Serializer())
 
         self.assertEqual({'field': ['error']}, validator.errors)
+
+    def test_validate_bound(self):
+        serializer = MagicMock()
+        serializer.run_validation.return_value = {'field': 'value'}
+
+        validator = DRFValidator()
+        self.assertTrue(validator.validate_bound(serializer, {'field': 'value '}))
+        serializer.run_validation.assert_called_once_with({'field': 'value '})
+        self.assertEqual({'field': 'value'}, validator.validated_data)
+
+        serializer.run_validation.side_effect = ValidationError({'field': ['error']})
+        self.assertFalse(validator.validate_bound(serializer, {}))
+        self.assertEqual({'field': ['error']}, validator.errors)
+
+        serializer.run_validation.side_effect = ValidationError(['error'])
+        self.assertFalse(validator.validate_bound(serializer, None))
+        self.assertEqual({'non_field_errors': ['error']}, validator.errors)
+
+    def test_bind_serializer_should_bind_the_fields_once(self):
+        class SerializerStub(Serializer):  # pylint: disable=abstract-method
+            name = CharField()
+
+        with patch.object(SerializerStub, 'get_fields',
+                          wraps=SerializerStub().get_fields) as mock_get_fields:
+            serializer = bind_serializer(SerializerStub)
+            self.assertIs(serializer, bind_serializer(SerializerStub))
+            self.assertIn('name', serializer.fields)
+            mock_get_fields.assert_called_once()
+
+
+class CompileRulesUnitTest(TestCase):
+    rules = {
+        'name': FieldRule(str, max_length=5, min_length=2),
+        'description': FieldRule(str, required=False, allow_null=True, allow_blank=True),
+        'is_active': FieldRule(bool, required=False),
+        'created_at': FieldRule(datetime, required=False),
+    }
+
+    def test_should_raise_an_error_when_the_field_type_is_not_supported(self):
+        with self.assertRaises(ValueError):
+            compile_rules({'field': FieldRule(int)})
+
+    def test_should_return_errors(self):
+        check = compile_rules(self.rules)
+        cases = [
+            {'data': {}, 'expected': {'name': ['This field is required.']}},
+            {'data': {'name': None}, 'expected': {'name': ['This field may not be null.']}},
+            {'data': {'name': '  '}, 'expected': {'name': ['This field may not be blank.']}},
+            {'data': {'name': 'x' * 6}, 'expected': {
+                'name': ['Ensure this field has no more than 5 characters.']}},
+            {'data': {'name': 'x'}, 'expected': {
+                'name': ['Ensure this field has at least 2 characters.']}},
+            {'data': {'name': 'xx', 'is_active': None}, 'expected': {
+                'is_active': ['This field may not be null.']}},
+        ]
+
+        for case in cases:
+            errors, validated_data = check(case.get('data'))
+            self.assertDictEqual(case.get('expected'), errors)
+            self.assertIsNone(validated_data)
+
+    def test_should_return_validated_data(self):
+        check = compile_rules(self.rules)
+        created_at = datetime.now()
+
+        errors, validated_data = check({'name': ' xx ', 'description': None, 'id': 'ignored',
+                                        'is_active': False, 'created_at': created_at})
+
+        self.assertIsNone(errors)
+        self.assertDictEqual({'name': 'xx', 'description': None,
+                              'is_active': False, 'created_at': created_at}, validated_data)
+
+    def test_should_require_fallback_for_values_outside_the_fast_path(self):
+        check = compile_rules(self.rules)
+        cases = [
+            None,
+            [],
+            {'name': 10},
+            {'name': 'x\x00'},
+            {'name': 'xx', 'is_active': 'true'},
+            {'name': 'xx', 'created_at': '2023-01-01T00:00:00'},
+            {'name': 'xx', 'created_at': datetime.now(timezone.utc)},
+        ]
+
+        for case in cases:
+            with self.assertRaises(FallbackRequired, msg=f'data: {case}'):
+                check(case)
+
+
+class CompiledValidatorUnitTest(TestCase):
+    def test_should_compile_rules_once_per_class(self):
+        class StubCompiledValidator(CompiledValidator):
+            rules = {'name': FieldRule(str)}
+
+        self.assertIs(StubCompiledValidator.compiled_check,
+                      StubCompiledValidator().compiled_check)
+
+    def test_validate(self):
+        class StubCompiledValidator(CompiledValidator):
+            rules = {'name': FieldRule(str)}
+
+        validator = StubCompiledValidator()
+        self.assertFalse(validator.validate({}))
+        self.assertDictEqual(
+            {'name': ['This field is required.']}, validator.errors)
+
+        self.assertTrue(validator.validate({'name': 'value'}))
+        self.assertDictEqual({'name': 'value'}, validator.validated_data)
+
+    def test_should_delegate_to_the_next_validator_on_fallback(self):
+        class ReferenceValidatorStub(FieldValidatorInterface):
+            def validate(self, data) -> bool:
+                self.validated_data = 'reference'
+                return True
+
+        class StubCompiledValidator(CompiledValidator, ReferenceValidatorStub):
+            rules = {'name': FieldRule(str)}
+
+        validator = StubCompiledValidator()
+        self.assertTrue(validator.validate({'name': 10}))
+        self.assertEqual('reference', validator.validated_data)
+
+    def test_validate_many_should_delegate_the_fallbacks_in_one_batch(self):
+        batches = []
+
+        class ReferenceValidatorStub(FieldValidatorInterface):
+            def validate(self, data) -> bool:
+                raise AssertionError('should validate the fallbacks as a batch')
+
+            def validate_many(self, data) -> bool:
+                batches.append(data)
+                self.errors = [None, {'name': ['invalid']}]
+                self.validated_data = [{'name': '10'}, None]
+                return False
+
+        class StubCompiledValidator(CompiledValidator, ReferenceValidatorStub):
+            rules = {'name': FieldRule(str)}
+
+        validator = StubCompiledValidator()
+        self.assertFalse(validator.validate_many(
+            [{'name': 'a'}, {'name': 10}, {}, {'name': 20}]))
+        self.assertListEqual([[{'name': 10}, {'name': 20}]], batches)
+        self.assertListEqual(
+            [None, None, {'name': ['This field is required.']}, {'name': ['invalid']}],
+            validator.errors)
+        self.assertListEqual([{'name': 'a'}, {'name': '10'}, None, None],
+                             validator.validated_data)
+
+        self.assertTrue(validator.validate_many([{'name': 'a'}]))
+        self.assertEqual(1, len(batches))
+        self.assertListEqual([None], validator.errors)
@@ -1,9 +1,10 @@
 from abc import ABC
 from unittest import TestCase
 from dataclasses import FrozenInstanceError, dataclass, is_dataclass
+from unittest.mock import MagicMock, patch
 import uuid
 from __shared.domain.exceptions import InvalidUniqueEntityIdValueException
-from __shared.domain.value_objects import UniqueEntityId, ValueObject
+from __shared.domain.value_objects import CompactUniqueEntityId, UniqueEntityId, ValueObject
 
 
 @dataclass(frozen=True)
@@ -75,3 +76,65 @@ class UniqueEntityIdUnitTest(TestCase):
     def test_to_str_should_return_id_as_str(self):
         obj = UniqueEntityId('2d01459a-f739-48d0-a36b-e1cb2a8c72f0')
         self.assertEqual('2d01459a-f739-48d0-a36b-e1cb2a8c72f0', str(obj))
+
+    def test_should_accept_a_uuid_in_any_format(self):
+        obj = UniqueEntityId('2D01459A-F739-48D0-A36B-E1CB2A8C72F0')
+        self.assertEqual('2D01459A-F739-48D0-A36B-E1CB2A8C72F0', str(obj))
+
+        obj = UniqueEntityId(uuid.UUID('2d01459a-f739-48d0-a36b-e1cb2a8c72f0'))
+        self.assertEqual('2d01459a-f739-48d0-a36b-e1cb2a8c72f0', str(obj))
+
+    @patch.object(UniqueEntityId, '_UniqueEntityId__validate')
+    def test_should_not_validate_generated_ids(self, mock_validate: MagicMock):
+        UniqueEntityId()
+        mock_validate.assert_not_called()
+
+        UniqueEntityId('2d01459a-f739-48d0-a36b-e1cb2a8c72f0')
+        mock_validate.assert_called_once()
+
+
+# pylint: disable=protected-access
+class CompactUniqueEntityIdUnitTest(TestCase):
+    uuid_str = '2d01459a-f739-48d0-a36b-e1cb2a8c72f0'
+
+    def test_should_be_a_unique_entity_id(self):
+        self.assertTrue(issubclass(CompactUniqueEntityId, UniqueEntityId))
+
+    def test_should_store_the_id_as_an_int(self):
+        expected = uuid.UUID(self.uuid_str)
+        for value in [self.uuid_str, self.uuid_str.upper(), expected, expected.int,
+                      expected.bytes]:
+            obj = CompactUniqueEntityId(value)
+            self.assertEqual(expected.int, obj._id, value)
+            self.assertEqual(self.uuid_str, str(obj), value)
+            self.assertEqual(expected.bytes, obj.bytes, value)
+
+    def test_should_not_keep_the_str_form(self):
+        obj = CompactUniqueEntityId(self.uuid_str)
+        self.assertEqual(self.uuid_str, str(obj))
+
+        self.assertListEqual(['_id'], [slot for cls in type(obj).__mro__
+                                       for slot in getattr(cls, '__slots__', ())])
+        self.assertIsNot(str(obj), str(obj))
+
+    def test_should_create_an_id_when_nothing_is_passed_in_constructor(self):
+        obj = CompactUniqueEntityId()
+        self.assertEqual(4, uuid.UUID(str(obj)).version)
+
+    def test_should_compare_and_hash_by_value(self):
+        obj = CompactUniqueEntityId(self.uuid_str)
+
+        self.assertEqual(CompactUniqueEntityId(uuid.UUID(self.uuid_str).int), obj)
+        self.assertEqual(hash(CompactUniqueEntityId(self.uuid_str.upper())), hash(obj))
+        self.assertEqual(hash((uuid.UUID(self.uuid_str).int,)), hash(obj))
+        self.assertNotEqual(CompactUniqueEntityId(), obj)
+
+    def test_should_throw_an_exception_when_id_arg_is_invalid(self):
+        for value in ['invalid id', b'short', -1, 1 << 128, 1.5]:
+            with self.assertRaises(InvalidUniqueEntityIdValueException, msg=value):
+                CompactUniqueEntityId(value)
+
+    def test_should_be_immutable(self):
+        with self.assertRaises(FrozenInstanceError):
+            obj = CompactUniqueEntityId()
+            obj._id = 1
@@ -0,0 +1,149 @@
+import asyncio
+from dataclasses import dataclass
+from threading import Lock
+import time
+from typing import List, Optional
+from unittest import IsolatedAsyncioTestCase
+
+from __shared.domain.entities import Entity
+from __shared.domain.exceptions import NotFoundException
+from __shared.domain.repositories import SearchParams
+from __shared.infra.async_repositories import AsyncRepositoryAdapter, \
+    AsyncSearchableRepositoryAdapter
+from __shared.infra.repositories import InMemoryRepository, InMemorySearchableRepository
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EntityStub(Entity):
+    name: str
+
+
+class StubInMemoryRepository(InMemoryRepository[EntityStub]):
+    pass
+
+
+class StubInMemorySearchableRepository(InMemorySearchableRepository[EntityStub, str]):
+    def sortable_fields(self) -> List[str]:
+        return ['name']
+
+    def _filter(self, data: List[EntityStub], filter_param: Optional[str]) -> List[EntityStub]:
+        if not filter_param:
+            return data
+        return [item for item in data if filter_param in item.name]
+
+
+class AsyncRepositoryAdapterUnitTest(IsolatedAsyncioTestCase):
+    adapter: AsyncRepositoryAdapter[EntityStub]
+
+    def setUp(self) -> None:
+        self.adapter = AsyncRepositoryAdapter(StubInMemoryRepository(), max_workers=1,
+                                              chunk_size=2)
+
+    def tearDown(self) -> None:
+        self.adapter.close()
+
+    async def test_should_delegate_to_the_sync_repository(self):
+        items = [EntityStub(name='a'), EntityStub(name='b'), EntityStub(name='c')]
+
+        await self.adapter.insert(items[0])
+        await self.adapter.insert_many(items[1:])
+        self.assertEqual(items[0], await self.adapter.find_by_id(items[0].id))
+        self.assertListEqual(items, await self.adapter.find_all())
+        self.assertListEqual(items[1:], await self.adapter.find_by_ids(
+            [item.id for item in items[1:]]))
+        self.assertListEqual(items, [item async for item in self.adapter.iter_all()])
+
+        item_updated = EntityStub(unique_entity_id=items[0].unique_entity_id, name='d')
+        await self.adapter.update(item_updated)
+        await self.adapter.update_many([item_updated])
+        self.assertEqual(item_updated, await self.adapter.find_by_id(items[0].id))
+
+        await self.adapter.delete(items[0].id)
+        await self.adapter.delete_many([items[1].id])
+        self.assertListEqual([items[2]], await self.adapter.find_all())
+
+        with self.assertRaises(NotFoundException):
+            await self.adapter.find_by_id(items[0].id)
+
+    async def test_should_bound_the_concurrent_calls(self):
+        running = 0
+        max_running = 0
+        lock = Lock()
+
+        class SlowRepository(StubInMemoryRepository):
+            def find_all(self) -> List[EntityStub]:
+                nonlocal running, max_running
+                with lock:
+                    running += 1
+                    max_running = max(max_running, running)
+                time.sleep(0.01)
+                with lock:
+                    running -= 1
+                return []
+
+        adapter = AsyncRepositoryAdapter(SlowRepository(), max_workers=2)
+        await asyncio.gather(*(adapter.find_all() for _ in range(8)))
+        adapter.close()
+
+        self.assertEqual(2, max_running)
+
+    async def test_iter_all_should_follow_writes_while_consumed(self):
+        class StreamingRepository(StubInMemoryRepository):
+            def iter_all(self):
+                yield from self.data.values()
+
+        adapter = AsyncRepositoryAdapter(StreamingRepository(), max_workers=1, chunk_size=2)
+        items = [EntityStub(name=str(index)) for index in range(5)]
+        await adapter.insert_many(items)
+
+        consumed = []
+        async for item in adapter.iter_all():
+            if not consumed:
+                await adapter.insert(EntityStub(name='new'))
+            consumed.append(item)
+        adapter.close()
+
+        self.assertListEqual(items, consumed)
+
+
+class AsyncSearchableRepositoryAdapterUnitTest(IsolatedAsyncioTestCase):
+    async def test_search_and_iter_search(self):
+        repository = StubInMemorySearchableRepository()
+        items = [EntityStub(name=name) for name in ['test c', 'b', 'test a', 'test b']]
+        repository.insert_many(items)
+        adapter = AsyncSearchableRepositoryAdapter(repository, chunk_size=1)
+        search_params = SearchParams(filter='test', order_by_field='name', items_per_page=2)
+
+        result = await adapter.search(search_params)
+        self.assertEqual(repository.search(search_params).to_dict(), result.to_dict())
+        self.assertListEqual(['name'], adapter.sortable_fields())
+        self.assertListEqual([items[2], items[3], items[0]],
+                             [item async for item in adapter.iter_search(search_params)])
+
+        adapter.close()
+
+    async def test_iter_search_should_follow_the_cursors_one_page_per_call(self):
+        searches = []
+
+        class RecordingRepository(StubInMemorySearchableRepository):
+            def search(self, search_params):
+                searches.append(search_params)
+                return StubInMemorySearchableRepository.search(self, search_params)
+
+        repository = RecordingRepository()
+        items = [EntityStub(name=f'test {index}') for index in range(7)]
+        repository.insert_many(items)
+        adapter = AsyncSearchableRepositoryAdapter(repository, max_workers=1, chunk_size=3)
+
+        consumed = []
+        async for item in adapter.iter_search(SearchParams(order_by_field='name',
+                                                           items_per_page=2)):
+            if not consumed:
+                await adapter.insert(EntityStub(name='test 9'))
+            consumed.append(item)
+        adapter.close()
+
+        self.assertListEqual(items + [consumed[-1]], consumed)
+        self.assertEqual('test 9', consumed[-1].name)
+        self.assertListEqual([2, 3, 3], [params.items_per_page for params in searches])
+        self.assertTrue(all(params.after for params in searches[1:]))
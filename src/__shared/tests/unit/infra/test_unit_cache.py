@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+from __shared.infra.cache import SearchCache, SearchCacheStats
+
+
+class SearchCacheUnitTest(TestCase):
+    now: float
+
+    def setUp(self) -> None:
+        self.now = 0.0
+
+    def clock(self) -> float:
+        return self.now
+
+    def test_get_and_put(self):
+        cache = SearchCache()
+        self.assertIsNone(cache.get('key'))
+
+        cache.put('key', 'value')
+        self.assertEqual('value', cache.get('key'))
+        self.assertEqual(SearchCacheStats(hits=1, misses=1, evictions=0, expirations=0,
+                                          invalidations=0, size=1), cache.stats())
+
+    def test_should_evict_the_least_recently_used_entry(self):
+        cache = SearchCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(1, cache.get('a'))
+        self.assertEqual(3, cache.get('c'))
+        self.assertEqual(1, cache.evictions)
+
+    def test_should_not_store_when_max_size_is_zero(self):
+        cache = SearchCache(max_size=0)
+        cache.put('a', 1)
+        self.assertEqual(0, len(cache))
+
+    def test_should_expire_entries(self):
+        cache = SearchCache(ttl=10, clock=self.clock)
+        cache.put('a', 1)
+
+        self.now = 10
+        self.assertEqual(1, cache.get('a'))
+
+        self.now = 10.5
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.expirations)
+        self.assertEqual(0, len(cache))
+
+    def test_invalidate(self):
+        cache = SearchCache()
+        cache.invalidate()
+        self.assertEqual(0, cache.invalidations)
+
+        cache.put('a', 1)
+        cache.invalidate()
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(1, cache.invalidations)
+
+    def test_sync_with(self):
+        cache = SearchCache()
+        data = {'a': 1}
+        cache.sync_with(data)
+        cache.put('key', 'value')
+
+        cache.sync_with(data)
+        self.assertEqual(1, len(cache))
+
+        data['b'] = 2
+        cache.sync_with(data)
+        self.assertEqual(0, len(cache))
+
+        cache.put('key', 'value')
+        cache.sync_with({'a': 1, 'b': 2})
+        self.assertEqual(0, len(cache))
@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+import uuid
+
+from __shared.infra.columns import Bitmap, DatetimeColumn, KeyColumn, StringColumn
+
+
+class BitmapUnitTest(TestCase):
+    def test_append_set_and_get(self):
+        bitmap = Bitmap()
+        values = [index % 3 == 0 for index in range(20)]
+        for value in values:
+            bitmap.append(value)
+
+        bitmap.set(1, True)
+        bitmap.set(9, False)
+        values[1], values[9] = True, False
+
+        self.assertEqual(20, len(bitmap))
+        self.assertEqual(3, len(bitmap.bits))
+        self.assertListEqual(values, [bitmap.get(row) for row in range(20)])
+
+
+class StringColumnUnitTest(TestCase):
+    def test_append_set_and_get(self):
+        column = StringColumn()
+        for value in ['movie', None, '', 'ação']:
+            column.append(value)
+
+        column.set(0, 'series')
+
+        self.assertListEqual(['series', None, '', 'ação'], [column.get(row) for row in range(4)])
+        self.assertEqual(5, column.garbage)
+
+    def test_take(self):
+        column = StringColumn()
+        for value in ['a', None, 'c']:
+            column.append(value)
+        column.set(0, 'b')
+
+        taken = column.take([2, 1, 0])
+
+        self.assertListEqual(['c', None, 'b'], [taken.get(row) for row in range(3)])
+        self.assertEqual(b'cb', bytes(taken.data))
+        self.assertEqual(0, taken.garbage)
+
+
+class DatetimeColumnUnitTest(TestCase):
+    def test_append_set_and_get(self):
+        values = [datetime(2023, 1, 2, 3, 4, 5, 6),
+                  datetime(1960, 1, 1),
+                  datetime(2023, 1, 2, tzinfo=timezone(timedelta(hours=-3)))]
+        column = DatetimeColumn()
+        for value in values:
+            column.append(value)
+
+        self.assertListEqual(values, [column.get(row) for row in range(3)])
+        self.assertEqual(timezone(timedelta(hours=-3)), column.get(2).tzinfo)
+
+        column.set(2, values[0])
+        self.assertEqual(values[0], column.get(2))
+        self.assertDictEqual({}, column.timezones)
+
+    def test_take(self):
+        values = [datetime(2023, 1, 1), datetime(2023, 1, 2, tzinfo=timezone.utc)]
+        column = DatetimeColumn()
+        for value in values:
+            column.append(value)
+
+        taken = column.take([1, 0])
+
+        self.assertListEqual(list(reversed(values)), [taken.get(row) for row in range(2)])
+
+
+class KeyColumnUnitTest(TestCase):
+    def test_append_find_and_remove(self):
+        column = KeyColumn()
+        keys = [uuid.uuid4().bytes for _ in range(100)]
+        for row, key in enumerate(keys):
+            self.assertEqual(row, column.append(key))
+
+        for key in keys[::2]:
+            column.remove(key)
+
+        self.assertEqual(100, len(column))
+        self.assertEqual(50, column.size)
+        for row, key in enumerate(keys):
+            self.assertEqual(None if row % 2 == 0 else row, column.find(key))
+            self.assertEqual(key, column.get(row))
+        self.assertIsNone(column.find(uuid.uuid4().bytes))
+
+        column.append(keys[0])
+        self.assertEqual(100, column.find(keys[0]))
+
+    def test_take(self):
+        column = KeyColumn(width=2)
+        for key in [b'aa', b'bb', b'cc']:
+            column.append(key)
+
+        taken = column.take([2, 0])
+
+        self.assertEqual(b'ccaa', bytes(taken.data))
+        self.assertEqual(1, taken.find(b'aa'))
+        self.assertIsNone(taken.find(b'bb'))
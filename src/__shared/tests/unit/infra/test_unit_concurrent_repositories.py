@@ -0,0 +1,226 @@
+from dataclasses import dataclass
+import random
+from threading import Barrier, Event, Lock, Thread
+from typing import Callable, List, Optional
+from unittest import TestCase
+
+from __shared.domain.entities import Entity
+from __shared.domain.exceptions import NotFoundException, VersionConflictException
+from __shared.domain.repositories import SearchParams
+from __shared.infra.cache import SearchCache
+from __shared.infra.concurrent_repositories import ReadWriteLock, \
+    ThreadSafeRepositoryAdapter, ThreadSafeSearchableRepositoryAdapter
+from __shared.infra.repositories import InMemoryRepository, InMemorySearchableRepository
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EntityStub(Entity):
+    name: str
+    price: int = 0
+
+
+class StubInMemoryRepository(InMemoryRepository[EntityStub]):
+    pass
+
+
+class StubInMemorySearchableRepository(InMemorySearchableRepository[EntityStub, str]):
+    def sortable_fields(self) -> List[str]:
+        return ['name', 'price']
+
+    def _text_search_fields(self) -> List[str]:
+        return ['name']
+
+    def _filter(self, data: List[EntityStub], filter_param: Optional[str]) -> List[EntityStub]:
+        if not filter_param:
+            return data
+        return [item for item in data if filter_param in item.name]
+
+
+def run_threads(count: int, target: Callable[[int], None]) -> List[BaseException]:
+    errors = []
+
+    def run(index: int) -> None:
+        try:
+            target(index)
+        except BaseException as error:  # pylint: disable=broad-except
+            errors.append(error)
+
+    threads = [Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    return errors
+
+
+class ReadWriteLockUnitTest(TestCase):
+    def test_readers_should_hold_the_lock_at_once(self):
+        lock = ReadWriteLock()
+        barrier = Barrier(3, timeout=5)
+
+        def read(_: int) -> None:
+            with lock.read():
+                barrier.wait()
+
+        self.assertListEqual([], run_threads(3, read))
+
+    def test_writers_should_exclude_readers_and_writers(self):
+        lock = ReadWriteLock()
+        active = {'readers': 0, 'writers': 0}
+        overlaps = []
+        counter_lock = Lock()
+
+        def enter(kind: str) -> None:
+            with counter_lock:
+                active[kind] += 1
+                if active['writers'] > 1 or (active['writers'] and active['readers']):
+                    overlaps.append(dict(active))
+
+        def leave(kind: str) -> None:
+            with counter_lock:
+                active[kind] -= 1
+
+        def run(index: int) -> None:
+            for _ in range(200):
+                if index % 2:
+                    with lock.write():
+                        enter('writers')
+                        leave('writers')
+                else:
+                    with lock.read():
+                        enter('readers')
+                        leave('readers')
+
+        self.assertListEqual([], run_threads(6, run))
+        self.assertListEqual([], overlaps)
+
+    def test_a_waiting_writer_should_hold_back_new_readers(self):
+        lock = ReadWriteLock()
+        events = []
+        writer_waiting = Event()
+
+        def write() -> None:
+            writer_waiting.set()
+            with lock.write():
+                events.append('write')
+
+        def read() -> None:
+            with lock.read():
+                events.append('read')
+
+        with lock.read():
+            writer = Thread(target=write)
+            writer.start()
+            writer_waiting.wait(timeout=5)
+            while not lock._waiting_writers:  # pylint: disable=protected-access
+                pass
+            reader = Thread(target=read)
+            reader.start()
+            reader.join(timeout=0.05)
+            self.assertListEqual([], events)
+
+        writer.join(timeout=5)
+        reader.join(timeout=5)
+        self.assertListEqual(['write', 'read'], events)
+
+
+class ThreadSafeRepositoryAdapterUnitTest(TestCase):
+    def test_should_delegate_to_the_repository(self):
+        adapter = ThreadSafeRepositoryAdapter(StubInMemoryRepository())
+        items = [EntityStub(name='a'), EntityStub(name='b'), EntityStub(name='c')]
+
+        adapter.insert(items[0])
+        adapter.insert_many(items[1:])
+        self.assertEqual(items[0], adapter.find_by_id(items[0].id))
+        self.assertListEqual(items, adapter.find_all())
+        self.assertListEqual(items[1:], adapter.find_by_ids([item.id for item in items[1:]]))
+        self.assertListEqual(items, list(adapter.iter_all()))
+
+        item_updated = EntityStub(unique_entity_id=items[0].unique_entity_id, name='d')
+        adapter.update(item_updated)
+        adapter.update_many([item_updated])
+        self.assertEqual(item_updated, adapter.find_by_id(items[0].id))
+
+        adapter.delete(items[0].id)
+        adapter.delete_many([items[1].id])
+        self.assertListEqual([items[2]], adapter.find_all())
+
+        with self.assertRaises(NotFoundException):
+            adapter.update(item_updated)
+
+    def test_search_and_iter_search(self):
+        repository = StubInMemorySearchableRepository()
+        items = [EntityStub(name=name) for name in ['test c', 'b', 'test a', 'test b']]
+        repository.insert_many(items)
+        adapter = ThreadSafeSearchableRepositoryAdapter(repository)
+        search_params = SearchParams(filter='test', order_by_field='name', items_per_page=2)
+
+        self.assertEqual(repository.search(search_params).to_dict(),
+                         adapter.search(search_params).to_dict())
+        self.assertListEqual(['name', 'price'], adapter.sortable_fields())
+        self.assertListEqual([items[2], items[3], items[0]],
+                             list(adapter.iter_search(search_params)))
+
+    def test_compare_and_set_updates_should_not_lose_writes(self):
+        adapter = ThreadSafeRepositoryAdapter(StubInMemoryRepository())
+        counter = EntityStub(name='counter')
+        adapter.insert(counter)
+
+        def increment(_: int) -> None:
+            for _ in range(50):
+                while True:
+                    stored = adapter.find_by_id(counter.id)
+                    try:
+                        adapter.update(EntityStub(unique_entity_id=counter.unique_entity_id,
+                                                  name=counter.name, price=stored.price + 1),
+                                       expected_version=stored.version)
+                        break
+                    except VersionConflictException:
+                        continue
+
+        self.assertListEqual([], run_threads(4, increment))
+        stored = adapter.find_by_id(counter.id)
+        self.assertEqual((200, 200), (stored.price, stored.version))
+
+    def test_should_stay_consistent_under_concurrent_reads_writes_and_searches(self):
+        repository = StubInMemorySearchableRepository(search_cache=SearchCache(max_size=16))
+        adapter = ThreadSafeSearchableRepositoryAdapter(repository)
+        items = [EntityStub(name=f'item {index}', price=index) for index in range(200)]
+        adapter.insert_many(items)
+        # every thread owns a slice of the items, so the expected end state is known
+        threads = 8
+        slice_size = len(items) // threads
+
+        def run(index: int) -> None:
+            randomizer = random.Random(index)
+            owned = items[index * slice_size:(index + 1) * slice_size]
+            for step in range(300):
+                item = randomizer.choice(owned)
+                action = randomizer.random()
+                if action < 0.3:
+                    adapter.update(EntityStub(unique_entity_id=item.unique_entity_id,
+                                              name=f'item {index} {step}', price=step))
+                elif action < 0.4:
+                    adapter.delete(item.id)
+                    adapter.insert(item)
+                elif action < 0.7:
+                    result = adapter.search(SearchParams(
+                        filter='item', order_by_field=randomizer.choice(['name', 'price']),
+                        order_by_direction=randomizer.choice(['asc', 'desc']),
+                        page=randomizer.randint(1, 5)))
+                    # other threads may be between the delete and the insert of an item
+                    assert len(items) - threads <= result.count <= len(items)
+                else:
+                    assert len(adapter.find_by_ids([entity.id for entity in owned])) == \
+                        slice_size
+
+            for entity in owned:
+                adapter.update(entity)
+
+        self.assertListEqual([], run_threads(threads, run))
+        self.assertCountEqual(items, adapter.find_all())
+        self.assertEqual([item.id for item in sorted(items, key=lambda item: str(item.price))],
+                         [item.id for item in adapter.iter_search(
+                             SearchParams(order_by_field='price', items_per_page=7))])
+        indexes = repository._sorted_indexes  # pylint: disable=protected-access
+        self.assertEqual(len(items), len(indexes.sequences))
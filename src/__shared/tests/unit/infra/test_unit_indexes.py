@@ -0,0 +1,215 @@
+from dataclasses import dataclass
+from typing import Optional
+from unittest import TestCase
+
+from __shared.domain.entities import Entity
+from __shared.infra.indexes import InvertedIndex, SortedIndex, SortedIndexes, \
+    match_tokens, tokenize
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EntityStub(Entity):
+    name: str
+    description: Optional[str] = None
+
+
+def name_key(entity: EntityStub) -> str:
+    return entity.name.lower()
+
+
+class SortedIndexUnitTest(TestCase):
+    index: SortedIndex
+    items: list
+
+    def setUp(self) -> None:
+        self.index = SortedIndex(name_key)
+        self.items = [EntityStub(name='b'), EntityStub(name='A'),
+                      EntityStub(name='b'), EntityStub(name='c'), EntityStub(name='B')]
+
+        for sequence, item in enumerate(self.items):
+            self.index.add(item.id, item, sequence)
+
+    def test_add_should_keep_entries_sorted(self):
+        expected = [self.items[1].id, self.items[0].id, self.items[2].id,
+                    self.items[4].id, self.items[3].id]
+
+        self.assertEqual(5, len(self.index))
+        self.assertListEqual(expected, self.index.slice(0, 5))
+
+    def test_slice(self):
+        self.assertListEqual([self.items[1].id, self.items[0].id],
+                             self.index.slice(0, 2))
+        self.assertListEqual([self.items[3].id], self.index.slice(4, 10))
+        self.assertListEqual([], self.index.slice(5, 10))
+
+    def test_reverse_slice_should_keep_ties_in_insertion_order(self):
+        expected = [self.items[3].id, self.items[0].id, self.items[2].id,
+                    self.items[4].id, self.items[1].id]
+
+        self.assertListEqual(expected, self.index.slice(0, 5, reverse=True))
+
+        for start in range(6):
+            for end in range(start, 7):
+                self.assertListEqual(expected[start:end],
+                                     self.index.slice(start, end, reverse=True),
+                                     f'slice({start}, {end}, reverse=True)')
+
+    def test_iter_ids_should_follow_writes_between_chunks(self):
+        for reverse in [False, True]:
+            index = SortedIndex(name_key)
+            items = [EntityStub(name=f'{value:02}') for value in range(10)]
+            for sequence, item in enumerate(items):
+                index.add(item.id, item, sequence)
+
+            ids = index.iter_ids(reverse=reverse, chunk_size=3)
+            consumed = [next(ids) for _ in range(3)]
+            for item in items[:5]:
+                if item.id in consumed:
+                    index.remove(item.id, items.index(item))
+            consumed.extend(ids)
+
+            expected = [item.id for item in items]
+            expected = expected[::-1] if reverse else expected
+            self.assertListEqual(expected, consumed, f'reverse={reverse}')
+
+    def test_remove_should_use_the_indexed_key(self):
+        item = self.items[0]
+        object.__setattr__(item, 'name', 'z')
+
+        self.index.remove(item.id, 0)
+        self.index.remove('unknown id', 10)
+
+        self.assertEqual(4, len(self.index))
+        self.assertNotIn(item.id, self.index.slice(0, 4))
+
+    def test_replace_many(self):
+        new_item = EntityStub(name='a')
+        object.__setattr__(self.items[3], 'name', '0')
+
+        self.index.replace_many({self.items[0].id, self.items[3].id},
+                                [(new_item.id, new_item, 5), (self.items[3].id, self.items[3], 3)])
+
+        expected = [self.items[3].id, self.items[1].id, new_item.id,
+                    self.items[2].id, self.items[4].id]
+        self.assertListEqual(expected, self.index.slice(0, 10))
+
+    def test_rebuild(self):
+        self.index.rebuild([(self.items[3].id, self.items[3], 0),
+                            (self.items[1].id, self.items[1], 1)])
+
+        self.assertListEqual([self.items[1].id, self.items[3].id],
+                             self.index.slice(0, 10))
+
+
+class SortedIndexesUnitTest(TestCase):
+    def test_build_and_apply(self):
+        first, second, third = EntityStub(name='b'), EntityStub(name='a'), EntityStub(name='c')
+        data = {first.id: first, second.id: second}
+        indexes = SortedIndexes({'name': name_key})
+
+        self.assertFalse(indexes.is_synced_with(data))
+
+        indexes.build(data)
+        self.assertTrue(indexes.is_synced_with(data))
+        self.assertListEqual([second.id, first.id], indexes.get('name').slice(0, 10))
+        self.assertIsNone(indexes.get('invalid'))
+
+        data[third.id] = third
+        indexes.apply([], [third])
+        self.assertListEqual([second.id, first.id, third.id],
+                             indexes.get('name').slice(0, 10))
+
+        data.pop(second.id)
+        indexes.apply([second], [])
+        self.assertTrue(indexes.is_synced_with(data))
+        self.assertListEqual([first.id, third.id], indexes.get('name').slice(0, 10))
+
+    def test_order(self):
+        items = [EntityStub(name='b'), EntityStub(name='a'), EntityStub(name='b')]
+        indexes = SortedIndexes({'name': name_key})
+        indexes.build({item.id: item for item in items})
+        entity_ids = {items[0].id, items[1].id, items[2].id}
+
+        self.assertListEqual([items[0].id, items[1].id, items[2].id],
+                             indexes.order(entity_ids))
+        self.assertListEqual([items[1].id, items[0].id, items[2].id],
+                             indexes.order(entity_ids, 'name'))
+        self.assertListEqual([items[0].id, items[2].id, items[1].id],
+                             indexes.order(entity_ids, 'name', reverse=True))
+
+
+class TokenizeUnitTest(TestCase):
+    def test_tokenize(self):
+        self.assertListEqual([], tokenize(None))
+        self.assertListEqual([], tokenize('  !! '))
+        self.assertListEqual(['ação', 'kids', 'show', '10'], tokenize('Ação KIDS-show, 10'))
+
+    def test_match_tokens(self):
+        tokens = tokenize('Ação KIDS-show')
+
+        self.assertTrue(match_tokens(['a'], tokens))
+        self.assertTrue(match_tokens(['kid', 'sh'], tokens))
+        self.assertFalse(match_tokens(['how'], tokens))
+        self.assertFalse(match_tokens(['kids', 'movie'], tokens))
+        self.assertFalse(match_tokens([], tokens))
+
+
+class InvertedIndexUnitTest(TestCase):
+    def test_search(self):
+        items = [EntityStub(name='Action', description='Explosions'),
+                 EntityStub(name='Ação', description=None),
+                 EntityStub(name='Kids show', description='Action for kids')]
+        index = InvertedIndex(['name', 'description'])
+        index.build({item.id: item for item in items})
+
+        self.assertSetEqual({items[0].id, items[2].id}, index.search('ACT'))
+        self.assertSetEqual({items[1].id}, index.search('aç'))
+        self.assertSetEqual({items[2].id}, index.search('action kid'))
+        self.assertSetEqual({items[0].id, items[1].id, items[2].id}, index.search('a'))
+        self.assertSetEqual(set(), index.search('movie'))
+        self.assertSetEqual(set(), index.search('!!'))
+
+    def test_should_keep_postings_updated(self):
+        item = EntityStub(name='Action')
+        data = {item.id: item}
+        index = InvertedIndex(['name', 'description'])
+        index.build(data)
+        self.assertTrue(index.is_synced_with(data))
+
+        updated_item = EntityStub(unique_entity_id=item.id, name='Drama')
+        data[item.id] = updated_item
+        index.apply([item], [updated_item])
+        self.assertSetEqual(set(), index.search('action'))
+        self.assertSetEqual({item.id}, index.search('dra'))
+        self.assertListEqual(['drama'], index.tokens)
+
+        data.pop(item.id)
+        index.apply([updated_item], [])
+        self.assertSetEqual(set(), index.search('dra'))
+        self.assertDictEqual({}, index.postings)
+        self.assertListEqual([], index.tokens)
+        self.assertTrue(index.is_synced_with(data))
+
+    def test_should_keep_postings_updated_on_bulk_apply(self):
+        items = [EntityStub(name=f'Action {index}') for index in range(40)]
+        data = {item.id: item for item in items}
+        index = InvertedIndex(['name', 'description'])
+        index.build(data)
+
+        updated_items = [EntityStub(unique_entity_id=item.unique_entity_id,
+                                    name=f'Drama {index}', description='kids')
+                         for index, item in enumerate(items[:30])]
+        new_items = [EntityStub(name=f'Comedy {index}') for index in range(30)]
+        data.update((item.id, item) for item in updated_items + new_items)
+        for item in items[30:35]:
+            data.pop(item.id)
+        index.apply(items[:35], updated_items + new_items)
+
+        expected = InvertedIndex(['name', 'description'])
+        expected.build(data)
+        self.assertTrue(index.is_synced_with(data))
+        self.assertDictEqual(expected.postings, index.postings)
+        self.assertDictEqual(expected.indexed_tokens, index.indexed_tokens)
+        self.assertListEqual(expected.tokens, index.tokens)
+        self.assertSetEqual({item.id for item in updated_items}, index.search('dra ki'))
+        self.assertSetEqual({item.id for item in items[35:]}, index.search('action'))
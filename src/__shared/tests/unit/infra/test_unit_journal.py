@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import os
+import tempfile
+import time
+from typing import Optional
+from unittest import TestCase
+from unittest.mock import patch
+
+from __shared.domain.entities import Entity
+from __shared.domain.exceptions import NotFoundException
+from __shared.infra.journal import EntityCodec, Journal
+from __shared.infra.repositories import InMemoryRepository
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EntityStub(Entity):
+    name: str
+    created_at: Optional[datetime] = None
+
+
+class StubInMemoryRepository(InMemoryRepository[EntityStub]):
+    pass
+
+
+class EntityCodecUnitTest(TestCase):
+    def test_should_encode_and_decode_entities(self):
+        codec = EntityCodec(EntityStub)
+        entity = EntityStub(name='Movie', created_at=datetime(2024, 1, 2, 3, tzinfo=timezone.utc))
+
+        entity._set('version', 2)  # pylint: disable=protected-access
+
+        line = codec.dumps(codec.encode(entity))
+
+        self.assertEqual(entity, codec.decode(codec.loads(line)))
+        self.assertEqual(2, codec.decode(codec.loads(line)).version)
+        self.assertEqual(EntityStub(unique_entity_id=entity.unique_entity_id, name='Movie'),
+                         codec.decode([entity.id, 'Movie', None]))
+        self.assertEqual(0, codec.decode([entity.id, 'Movie', None]).version)
+
+
+class JournalUnitTest(TestCase):
+    directory: str
+
+    def setUp(self) -> None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.directory = temporary_directory.name
+
+    def create_journal(self, **kwargs) -> Journal:
+        journal = Journal(self.directory, EntityCodec(EntityStub), **kwargs)
+        self.addCleanup(journal.close)
+        return journal
+
+    def log_files(self):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith('.log'))
+
+    def test_should_raise_an_error_for_an_unknown_mode(self):
+        with self.assertRaises(ValueError) as error:
+            self.create_journal(mode='never')
+
+        self.assertEqual('Unknown durability mode. data=[mode: `never`]',
+                         error.exception.args[0])
+
+    def test_should_recover_the_logged_writes_in_every_mode(self):
+        for mode in ['sync', 'group', 'async']:
+            with self.subTest(mode=mode):
+                self.setUp()
+                items = [EntityStub(name=f'Item {index}') for index in range(3)]
+                journal = self.create_journal(mode=mode)
+                self.assertDictEqual({}, journal.recover())
+
+                journal.append(items, [])
+                journal.append([EntityStub(unique_entity_id=items[0].unique_entity_id,
+                                           name='Updated')], [])
+                journal.append([], [items[1].id])
+                journal.close()
+
+                recovered = self.create_journal().recover()
+                self.assertListEqual([items[0].id, items[2].id], list(recovered))
+                self.assertEqual('Updated', recovered[items[0].id].name)
+
+    def test_group_mode_should_fsync_every_group(self):
+        journal = self.create_journal(mode='group', group_size=3, flush_interval=60.0,
+                                      clock=lambda: 0.0)
+        journal.recover()
+
+        journal.append([EntityStub(name='a')], [])
+        journal.append([EntityStub(name='b')], [])
+        self.assertEqual(2, journal._unsynced)  # pylint: disable=protected-access
+
+        journal.append([EntityStub(name='c')], [])
+        self.assertEqual(0, journal._unsynced)  # pylint: disable=protected-access
+
+    def test_group_mode_should_fsync_the_tail_of_a_burst_in_the_background(self):
+        journal = self.create_journal(mode='group', group_size=100, flush_interval=0.01)
+        journal.recover()
+
+        for name in ['a', 'b', 'c']:
+            journal.append([EntityStub(name=name)], [])
+        deadline = time.monotonic() + 5
+        while journal._unsynced and time.monotonic() < deadline:  # pylint: disable=protected-access
+            time.sleep(0.005)
+
+        self.assertEqual(0, journal._unsynced)  # pylint: disable=protected-access
+
+    def test_async_mode_should_write_in_the_background(self):
+        journal = self.create_journal(mode='async', flush_interval=0.01)
+        journal.recover()
+        item = EntityStub(name='a')
+
+        journal.append([item], [])
+        journal.flush()
+
+        self.assertIn(item.id, self.create_journal().recover())
+
+    def test_should_ignore_a_torn_write_and_append_to_a_new_log(self):
+        items = [EntityStub(name='a'), EntityStub(name='b')]
+        journal = self.create_journal()
+        journal.recover()
+        journal.append([items[0]], [])
+        journal.close()
+        with open(os.path.join(self.directory, self.log_files()[0]), 'a',
+                  encoding='utf-8') as log_file:
+            log_file.write('[[["torn')
+
+        journal = self.create_journal()
+        self.assertListEqual([items[0].id], list(journal.recover()))
+        journal.append([items[1]], [])
+        journal.close()
+
+        self.assertEqual(2, len(self.log_files()))
+        self.assertListEqual([item.id for item in items], list(self.create_journal().recover()))
+
+    def test_snapshot_should_replace_the_logs_it_covers(self):
+        items = [EntityStub(name=f'Item {index}') for index in range(3)]
+        journal = self.create_journal()
+        journal.recover()
+        journal.append(items[:2], [])
+        self.assertEqual(1, journal.records)
+
+        journal.snapshot(items[:2])
+        self.assertEqual(0, journal.records)
+        self.assertListEqual([], self.log_files())
+
+        journal.append([items[2]], [items[0].id])
+        journal.close()
+
+        journal = self.create_journal()
+        self.assertListEqual([items[1].id, items[2].id], list(journal.recover()))
+        self.assertEqual(1, journal.records)
+
+
+class InMemoryRepositoryJournalUnitTest(TestCase):
+    directory: str
+
+    def setUp(self) -> None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.directory = temporary_directory.name
+
+    def create_repository(self, **kwargs) -> StubInMemoryRepository:
+        repository = StubInMemoryRepository(
+            journal=Journal(self.directory, EntityCodec(EntityStub), **kwargs))
+        self.addCleanup(repository.close)
+        return repository
+
+    def test_should_recover_the_data_after_a_restart(self):
+        items = [EntityStub(name=f'Item {index}') for index in range(4)]
+        repository = self.create_repository()
+        repository.insert(items[0])
+        repository.insert_many(items[1:])
+        updated = EntityStub(unique_entity_id=items[1].unique_entity_id, name='Updated')
+        repository.update(updated)
+        repository.update_many([items[2]])
+        repository.delete(items[0].id)
+        repository.delete_many([items[3].id])
+        repository.close()
+
+        self.assertListEqual([updated, items[2]], self.create_repository().find_all())
+
+    def test_should_not_log_writes_that_fail(self):
+        repository = self.create_repository()
+        with self.assertRaises(NotFoundException):
+            repository.delete('unknown id')
+        repository.close()
+
+        self.assertEqual(0, repository.journal.records)
+        self.assertListEqual([], self.create_repository().find_all())
+
+    def test_should_keep_the_version_of_a_write_that_was_not_logged(self):
+        items = [EntityStub(name='a'), EntityStub(name='b')]
+        repository = self.create_repository()
+        repository.insert_many(items)
+
+        with patch.object(Journal, 'append', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                repository.update(items[0], expected_version=0)
+            with self.assertRaises(OSError):
+                repository.update_many(items)
+
+        self.assertListEqual([0, 0], [item.version for item in items])
+        self.assertListEqual([0, 0], [item.version for item in repository.find_all()])
+        repository.update(items[0], expected_version=items[0].version)
+        repository.update_many(items)
+        self.assertListEqual([2, 1], [item.version for item in items])
+        self.assertListEqual(items, repository.find_all())
+
+    def test_should_take_a_snapshot_every_few_writes(self):
+        items = [EntityStub(name=f'Item {index}') for index in range(5)]
+        repository = self.create_repository(snapshot_every=2)
+        for item in items:
+            repository.insert(item)
+        repository.close()
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'snapshot.jsonl')))
+        self.assertEqual(1, repository.journal.records)
+        self.assertListEqual(items, self.create_repository().find_all())
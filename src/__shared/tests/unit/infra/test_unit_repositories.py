@@ -1,11 +1,16 @@
 from dataclasses import dataclass
 from typing import List, Optional
-from unittest import TestCase
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
 
 from __shared.domain.entities import Entity
-from __shared.domain.exceptions import NotFoundException
-from __shared.domain.repositories import SearchParams, SearchResult
-from __shared.infra.repositories import InMemoryRepository, InMemorySearchableRepository
+from __shared.domain.exceptions import InvalidSearchCursorException, NotFoundException
+from __shared.domain.repositories import SearchCursor, SearchParams, SearchResult
+from __shared.infra.cache import SearchCache, SearchCacheStats
+from __shared.infra.repositories import InMemoryRepository, InMemorySearchableRepository, \
+    decode_cursor, position_after_cursor, raise_if_any_not_found
+from __shared.infra.vectorized import VectorizedSearchEngine, \
+    is_vectorized_search_available
 
 
 @dataclass(slots=True, frozen=True, kw_only=True)
@@ -51,6 +56,12 @@ class InMemoryRepositoryUnitTest(TestCase):
         message_expected = f'Entity not found. data=[id: `{self.item.id}`]'
         self.assertEqual(message_expected, error.exception.args[0])
 
+    def test_iter_all_should_stream_all_items(self):
+        self.assertListEqual([], list(self.repo.iter_all()))
+
+        self.repo.insert(self.item)
+        self.assertListEqual([self.item], list(self.repo.iter_all()))
+
     def test_find_all_should_return_all_items(self):
         items = self.repo.find_all()
         self.assertEqual([], items)
@@ -91,6 +102,70 @@ class InMemoryRepositoryUnitTest(TestCase):
         message_expected = f'Entity not found. data=[id: `{self.item.id}`]'
         self.assertEqual(message_expected, error.exception.args[0])
 
+    def test_insert_many_should_insert_items(self):
+        new_item = EntityStub(name='new', age=30, sortable_int=1)
+        self.repo.insert(self.item)
+
+        self.repo.insert_many([self.item, new_item, new_item])
+
+        self.assertDictEqual({self.item.id: self.item, new_item.id: new_item}, self.repo.data)
+
+    def test_find_by_ids_should_return_items_in_the_given_order(self):
+        new_item = EntityStub(name='new', age=30, sortable_int=1)
+        self.repo.insert_many([self.item, new_item])
+
+        self.assertListEqual([new_item, self.item],
+                             self.repo.find_by_ids([new_item.id, self.item.unique_entity_id]))
+
+    def test_find_by_ids_should_raise_an_exception_when_any_item_does_not_exist(self):
+        new_item = EntityStub(name='new', age=30, sortable_int=1)
+        self.repo.insert(self.item)
+
+        with self.assertRaises(NotFoundException) as error:
+            self.repo.find_by_ids([self.item.id, new_item.id, new_item.id])
+
+        message_expected = f'Entities not found. data=[ids: `{new_item.id}`]'
+        self.assertEqual(message_expected, error.exception.args[0])
+
+    def test_update_many_should_update_items(self):
+        new_item = EntityStub(name='new', age=30, sortable_int=1)
+        self.repo.insert_many([self.item, new_item])
+        items_updated = [EntityStub(unique_entity_id=self.item.id, name='a', age=1, sortable_int=1),
+                         EntityStub(unique_entity_id=new_item.id, name='b', age=2, sortable_int=2)]
+
+        self.repo.update_many(items_updated)
+
+        self.assertListEqual(items_updated, self.repo.find_all())
+
+    def test_update_many_should_not_write_anything_when_any_item_does_not_exist(self):
+        new_item = EntityStub(name='new', age=30, sortable_int=1)
+        self.repo.insert(self.item)
+        item_updated = EntityStub(unique_entity_id=self.item.id, name='a', age=1, sortable_int=1)
+
+        with self.assertRaises(NotFoundException) as error:
+            self.repo.update_many([item_updated, new_item])
+
+        message_expected = f'Entities not found. data=[ids: `{new_item.id}`]'
+        self.assertEqual(message_expected, error.exception.args[0])
+        self.assertDictEqual({self.item.id: self.item}, self.repo.data)
+
+    def test_delete_many_should_delete_items(self):
+        new_item = EntityStub(name='new', age=30, sortable_int=1)
+        self.repo.insert_many([self.item, new_item])
+
+        self.repo.delete_many([self.item.id, new_item.unique_entity_id, self.item.id])
+
+        self.assertDictEqual({}, self.repo.data)
+
+    def test_delete_many_should_not_delete_anything_when_any_item_does_not_exist(self):
+        new_item = EntityStub(name='new', age=30, sortable_int=1)
+        self.repo.insert(self.item)
+
+        with self.assertRaises(NotFoundException):
+            self.repo.delete_many([self.item.id, new_item.id])
+
+        self.assertDictEqual({self.item.id: self.item}, self.repo.data)
+
 
 class InMemorySearchableRepositoryStub(InMemorySearchableRepository[EntityStub, str]):
     def sortable_fields(self) -> List[str]:
@@ -317,3 +392,261 @@ class InMemorySearchableRepositoryUnitTest(TestCase):
                                                      order_by_field='name'))
 
         self.assertEqual(expected, result)
+
+    def test_search_should_pick_top_k_for_early_pages_and_a_full_sort_otherwise(self):
+        data = [EntityStub(name=f'Test {index % 7}', age=1, sortable_int=index % 5)
+                for index in range(100)]
+        self.repository.data = data
+        ordered = sorted(data, key=lambda item: item.sortable_int, reverse=True)
+
+        result = self.repository.search(SearchParams(items_per_page=5, order_by_field='sortable_int',
+                                                     order_by_direction='desc'))
+        self.assertEqual('top_k', self.repository.last_search_strategy)
+        self.assertListEqual(ordered[:5], result.data)
+
+        result = self.repository.search(SearchParams(page=3, items_per_page=5,
+                                                     order_by_field='sortable_int',
+                                                     order_by_direction='desc'))
+        self.assertEqual('full_sort', self.repository.last_search_strategy)
+        self.assertListEqual(ordered[10:15], result.data)
+
+        self.repository.search(SearchParams(items_per_page=5))
+        self.assertEqual('unordered', self.repository.last_search_strategy)
+
+        self.repository.data = {item.id: item for item in data}
+        self.repository.search(SearchParams(items_per_page=5, order_by_field='sortable_int'))
+        self.assertEqual('index', self.repository.last_search_strategy)
+
+
+class InMemorySearchableRepositoryIndexesUnitTest(TestCase):
+    repository: InMemorySearchableRepositoryStub
+
+    def setUp(self) -> None:
+        self.repository = InMemorySearchableRepositoryStub()
+
+    def assert_search_matches_full_sort(self, search_params: SearchParams):
+        # pylint: disable=protected-access
+        data = list(self.repository.data.values())
+        filtered = self.repository._filter(data, search_params.filter)
+        ordered = self.repository._order_by(filtered,
+                                            search_params.order_by_field,
+                                            search_params.order_by_direction)
+        expected = SearchResult(count=len(filtered),
+                                items_per_page=search_params.items_per_page,
+                                current_page=search_params.page,
+                                data=self.repository._paginate(ordered,
+                                                               search_params.page,
+                                                               search_params.items_per_page))
+
+        result = self.repository.search(search_params)
+        self.assertEqual(expected.to_dict() | {'next_cursor': None},
+                         result.to_dict() | {'next_cursor': None}, search_params)
+        self.assertEqual(expected.last_page > search_params.page,
+                         result.next_cursor is not None, search_params)
+
+        start = (search_params.page - 1) * search_params.items_per_page
+        self.assertListEqual(ordered[start:], list(self.repository.iter_search(search_params)),
+                             search_params)
+
+    def assert_all_searches_match_full_sort(self):
+        for order_by_field in [None, 'name', 'sortable_int']:
+            for order_by_direction in ['asc', 'desc']:
+                for filter_param in [None, 'test']:
+                    for page in [1, 2, 3]:
+                        self.assert_search_matches_full_sort(
+                            SearchParams(page=page,
+                                         items_per_page=2,
+                                         order_by_field=order_by_field,
+                                         order_by_direction=order_by_direction,
+                                         filter=filter_param))
+
+    def test_search_should_use_indexes_maintained_on_write(self):
+        items = [EntityStub(name='Test 3', age=1, sortable_int=2),
+                 EntityStub(name='TeSt 1', age=1, sortable_int=1),
+                 EntityStub(name='C', age=1, sortable_int=2),
+                 EntityStub(name='test 2', age=1, sortable_int=1),
+                 EntityStub(name='E', age=1, sortable_int=2)]
+        for item in items:
+            self.repository.insert(item)
+
+        self.assert_all_searches_match_full_sort()
+
+        self.repository.insert(EntityStub(name='A', age=1, sortable_int=3))
+        self.assert_all_searches_match_full_sort()
+
+        items[2]._set('name', 'test 0')  # pylint: disable=protected-access
+        self.repository.update(items[2])
+        self.assert_all_searches_match_full_sort()
+
+        self.repository.delete(items[0].id)
+        self.repository.delete(items[3].id)
+        self.assert_all_searches_match_full_sort()
+
+    def test_search_should_use_indexes_maintained_on_bulk_write(self):
+        items = [EntityStub(name=f'Test {index % 7}', age=1, sortable_int=index % 3)
+                 for index in range(100)]
+        self.repository.insert(EntityStub(name='A', age=1, sortable_int=3))
+        self.repository.search(SearchParams(order_by_field='name'))
+
+        self.repository.insert_many(items)
+        self.assert_all_searches_match_full_sort()
+
+        for item in items[:80]:
+            item._set('name', f'test {item.sortable_int}')  # pylint: disable=protected-access
+        self.repository.update_many(items[:80])
+        self.assert_all_searches_match_full_sort()
+
+        self.repository.delete_many([item.id for item in items[10:90]])
+        self.assert_all_searches_match_full_sort()
+
+    def test_search_should_rebuild_indexes_when_data_is_replaced(self):
+        self.repository.insert(EntityStub(name='b', age=1, sortable_int=1))
+        self.repository.search(SearchParams(order_by_field='name'))
+
+        item = EntityStub(name='a', age=1, sortable_int=1)
+        self.repository.data = {item.id: item}
+
+        result = self.repository.search(SearchParams(order_by_field='name'))
+        self.assertListEqual([item], result.data)
+        self.assertEqual(1, result.count)
+
+    def test_iter_search_should_resume_from_a_cursor_and_skip_deleted_items(self):
+        items = [EntityStub(name=f'Test {index % 3}', age=1, sortable_int=index)
+                 for index in range(600)]
+        self.repository.insert_many(items)
+        search_params = SearchParams(items_per_page=5, order_by_field='name', filter='test')
+        expected = self.repository._order_by(items, 'name', 'asc')  # pylint: disable=protected-access
+
+        after = self.repository.search(search_params).next_cursor
+        self.assertListEqual(expected[5:], list(self.repository.iter_search(
+            SearchParams(items_per_page=5, order_by_field='name', filter='test', after=after))))
+
+        results = self.repository.iter_search(SearchParams(order_by_field='name'))
+        self.assertEqual(expected[0], next(results))
+        self.repository.delete(expected[1].id)
+        self.assertEqual(expected[2], next(results))
+
+
+class InMemorySearchableRepositoryCachedIndexesUnitTest(InMemorySearchableRepositoryIndexesUnitTest):
+    def setUp(self) -> None:
+        self.repository = InMemorySearchableRepositoryStub(search_cache=SearchCache())
+
+
+@skipUnless(is_vectorized_search_available(), 'NumPy is not installed')
+class InMemorySearchableRepositoryVectorizedIndexesUnitTest(
+        InMemorySearchableRepositoryIndexesUnitTest):
+    def setUp(self) -> None:
+        self.repository = InMemorySearchableRepositoryStub(vectorized=True)
+
+    def test_filtered_search_should_use_the_vectorized_engine_patched_on_write(self):
+        # pylint: disable=protected-access
+        search_params = SearchParams(order_by_field='name', filter='test')
+        item = EntityStub(name='test b', age=1, sortable_int=1)
+        self.repository.insert(item)
+        self.repository.search(search_params)
+        engine = self.repository._vectorized_engine
+        self.assertListEqual([item.id], engine.ids)
+
+        new_item = EntityStub(name='test a', age=1, sortable_int=1)
+        with patch.object(VectorizedSearchEngine, 'build', side_effect=AssertionError):
+            self.repository.insert(new_item)
+            self.assertIs(engine, self.repository._get_vectorized_engine())
+            self.assertListEqual([item.id, new_item.id], engine.ids)
+
+            result = self.repository.search(search_params)
+        self.assertListEqual([new_item, item], result.data)
+        self.assertEqual('vectorized', self.repository.last_search_strategy)
+
+
+class InMemorySearchableRepositoryCacheUnitTest(TestCase):
+    repository: InMemorySearchableRepositoryStub
+
+    def setUp(self) -> None:
+        self.repository = InMemorySearchableRepositoryStub(search_cache=SearchCache(max_size=2))
+        self.item = EntityStub(name='a', age=1, sortable_int=1)
+        self.repository.insert(self.item)
+
+    def test_should_reuse_results_for_the_same_search_params(self):
+        result = self.repository.search(SearchParams())
+
+        # a hit returns the cached page, with copies of its entities
+        self.assertEqual(result, self.repository.search(SearchParams(page='1', filter='')))
+        self.assertEqual('cache', self.repository.last_search_strategy)
+        self.assertEqual(result, self.repository.search(SearchParams(order_by_field='age')))
+        self.assertIsNot(result.data[0], self.repository.search(SearchParams()).data[0])
+        self.assertEqual(SearchCacheStats(hits=3, misses=1, evictions=0, expirations=0,
+                                          invalidations=0, size=1),
+                         self.repository.search_cache.stats())
+
+    def test_writes_should_invalidate_the_cache(self):
+        self.repository.search(SearchParams())
+        other = EntityStub(name='b', age=1, sortable_int=1)
+
+        self.repository.insert(other)
+        self.assertListEqual([self.item, other], self.repository.search(SearchParams()).data)
+
+        self.repository.delete(other.id)
+        self.assertListEqual([self.item], self.repository.search(SearchParams()).data)
+
+        self.repository.data = {other.id: other}
+        self.assertListEqual([other], self.repository.search(SearchParams()).data)
+
+        stats = self.repository.search_cache.stats()
+        self.assertEqual(0, stats.hits)
+        self.assertEqual(4, stats.misses)
+        self.assertEqual(3, stats.invalidations)
+
+    def test_should_evict_the_least_recently_used_result(self):
+        self.repository.search(SearchParams(page=1))
+        self.repository.search(SearchParams(page=2))
+        self.repository.search(SearchParams(page=1))
+        self.repository.search(SearchParams(page=3))
+
+        self.repository.search(SearchParams(page=1))
+        self.repository.search(SearchParams(page=2))
+
+        stats = self.repository.search_cache.stats()
+        self.assertEqual(2, stats.hits)
+        self.assertEqual(4, stats.misses)
+        self.assertEqual(2, stats.evictions)
+        self.assertEqual(2, stats.size)
+
+
+class RepositoryHelpersUnitTest(TestCase):
+    def test_raise_if_any_not_found_should_name_every_missing_id_once(self):
+        raise_if_any_not_found([])
+
+        with self.assertRaises(NotFoundException) as assert_error:
+            raise_if_any_not_found(['b', 'a', 'b'])
+        self.assertEqual('Entities not found. data=[ids: `b`, `a`]',
+                         assert_error.exception.args[0])
+
+    def test_decode_cursor(self):
+        after = SearchCursor('a', 1, 'name', 'asc', None).encode()
+
+        self.assertIsNone(decode_cursor(None, 'name', 'asc', None, str))
+        self.assertEqual(SearchCursor('a', 1, 'name', 'asc', None),
+                         decode_cursor(after, 'name', 'asc', None, str))
+        # an order without keys yet accepts any key
+        self.assertEqual(SearchCursor('a', 1, 'name', 'asc', None),
+                         decode_cursor(after, 'name', 'asc', None, None))
+        for params in [('name', 'desc', None, str), ('name', 'asc', 'a', str),
+                       ('name', 'asc', None, int)]:
+            with self.assertRaises(InvalidSearchCursorException, msg=params):
+                decode_cursor(after, *params)
+
+    def test_position_after_cursor(self):
+        entries = [('a', 0), ('b', 1), ('b', 3), ('c', 2)]
+        reversed_entries = [('c', 2), ('b', 1), ('b', 3), ('a', 0)]
+
+        for cursor, expected, reversed_expected in [
+                (SearchCursor('b', 1), 2, 2), (SearchCursor('b', 3), 3, 3),
+                (SearchCursor('b', 2), 2, 2), (SearchCursor('0', 9), 0, 4),
+                (SearchCursor('z', 0), 4, 0)]:
+            self.assertEqual(expected,
+                             position_after_cursor(entries, cursor, False, lambda entry: entry),
+                             cursor)
+            self.assertEqual(reversed_expected,
+                             position_after_cursor(reversed_entries, cursor, True,
+                                                   lambda entry: entry),
+                             cursor)
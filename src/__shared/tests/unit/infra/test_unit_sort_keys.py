@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from unittest import TestCase
+
+from __shared.domain.entities import Entity
+from __shared.infra.columns import DatetimeColumn
+from __shared.infra.sort_keys import casefold_text, datetime_sort_key, epoch_micros, \
+    text_sort_key
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EntityStub(Entity):
+    name: Optional[str]
+    created_at: datetime
+
+
+class SortKeysUnitTest(TestCase):
+    def test_casefold_text(self):
+        self.assertEqual('strasse', casefold_text('Straße'))
+        self.assertEqual('ação', casefold_text('AÇÃO'))
+        self.assertEqual('1', casefold_text(1))
+        self.assertEqual('', casefold_text(None))
+
+    def test_epoch_micros_should_order_instants(self):
+        self.assertEqual(0, epoch_micros(datetime(1970, 1, 1)))
+        self.assertEqual(-1, epoch_micros(datetime(1969, 12, 31, 23, 59, 59, 999999)))
+        self.assertEqual(epoch_micros(datetime(2024, 1, 1, 12)),
+                         epoch_micros(datetime(2024, 1, 1, 9,
+                                               tzinfo=timezone(timedelta(hours=-3)))))
+        self.assertLess(epoch_micros(datetime(2024, 1, 1, 10, tzinfo=timezone.utc)),
+                        epoch_micros(datetime(2024, 1, 1, 9,
+                                              tzinfo=timezone(timedelta(hours=-3)))))
+
+    def test_epoch_micros_should_match_the_datetime_column(self):
+        column = DatetimeColumn()
+        values = [datetime(2024, 5, 6, 7, 8, 9, 123456),
+                  datetime(2024, 5, 6, 7, tzinfo=timezone(timedelta(hours=2)))]
+        for value in values:
+            column.append(value)
+
+        self.assertListEqual([epoch_micros(value) for value in values], list(column.micros))
+
+    def test_field_sort_keys(self):
+        entity = EntityStub(name='Movie', created_at=datetime(1970, 1, 1, 0, 0, 1))
+
+        self.assertEqual('movie', text_sort_key('name')(entity))
+        self.assertEqual(1_000_000, datetime_sort_key('created_at')(entity))
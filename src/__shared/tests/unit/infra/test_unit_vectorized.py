@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict
+from unittest import TestCase, skipUnless
+from unittest.mock import patch
+
+from __shared.domain.entities import Entity
+from __shared.infra.indexes import InvertedIndex, SortedIndexes
+from __shared.infra.sort_keys import text_sort_key
+from __shared.infra.vectorized import VectorizedSearchEngine, is_vectorized_search_available
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class EntityStub(Entity):
+    name: str
+    age: int
+    is_active: bool = True
+
+
+@skipUnless(is_vectorized_search_available(), 'NumPy is not installed')
+class VectorizedSearchEngineUnitTest(TestCase):
+    data: Dict[str, EntityStub]
+    indexes: SortedIndexes
+    text_index: InvertedIndex
+    engine: VectorizedSearchEngine
+
+    def setUp(self) -> None:
+        items = [EntityStub(name='b', age=30), EntityStub(name='A', age=10, is_active=False),
+                 EntityStub(name='b', age=20), EntityStub(name='c', age=10)]
+        self.data = {item.id: item for item in items}
+        self.indexes = SortedIndexes({'name': text_sort_key('name'), 'age': attrgetter('age')})
+        self.indexes.build(self.data)
+        self.text_index = InvertedIndex(['name'])
+        self.text_index.build(self.data)
+        self.engine = VectorizedSearchEngine(['name', 'age'],
+                                             {'is_active': attrgetter('is_active')})
+        self.engine.build(self.data, self.indexes)
+
+    def write(self, removed, added):
+        for item in removed:
+            self.data.pop(item.id)
+        for item in added:
+            self.data[item.id] = item
+        self.indexes.apply(removed, added)
+        self.text_index.apply(removed, added)
+        self.engine.apply(removed, added, self.indexes, self.text_index)
+
+    def assert_orders(self):
+        ids = list(self.data)
+        mask = self.engine.mask_of(ids)
+        for field_name in ['name', 'age', None]:
+            for reverse in [False, True]:
+                expected = self.indexes.order(ids, field_name, reverse)
+                self.assertEqual((len(ids), expected),
+                                 self.engine.select(field_name, reverse, mask, 0, len(ids)))
+                for start in range(len(ids)):
+                    self.assertListEqual(
+                        expected[start:start + 2],
+                        self.engine.select(field_name, reverse, mask, start, start + 2)[1],
+                        f'{field_name}, reverse={reverse}, start={start}')
+
+    def test_should_hold_int_keys_and_rank_the_others(self):
+        self.assertSetEqual({'name'}, self.engine.ranked)
+        self.assertListEqual([30, 10, 20, 10], self.engine.columns['age'][:4].tolist())
+        self.assertListEqual([1, 0, 1, 3], self.engine.columns['name'][:4].tolist())
+
+    def test_select_should_keep_ties_in_insertion_order(self):
+        ids = list(self.data)
+        mask = self.engine.mask_of(ids)
+
+        self.assertListEqual([ids[1], ids[0], ids[2], ids[3]],
+                             self.engine.select('name', False, mask, 0, 4)[1])
+        self.assertListEqual([ids[3], ids[0], ids[2], ids[1]],
+                             self.engine.select('name', True, mask, 0, 4)[1])
+        self.assertListEqual([ids[0], ids[2]], self.engine.select('name', True, mask, 1, 3)[1])
+        self.assertEqual((2, [ids[1], ids[3]]),
+                         self.engine.select('age', False, self.engine.mask_of(ids[1::2]), 0, 5))
+        self.assert_orders()
+
+    def test_writes_should_patch_the_columns_in_place(self):
+        items = list(self.data.values())
+        with patch.object(VectorizedSearchEngine, 'build', side_effect=AssertionError):
+            self.write([], [EntityStub(name='B', age=5), EntityStub(name='0', age=40)])
+            self.assert_orders()
+
+            updated = EntityStub(unique_entity_id=items[0].unique_entity_id, name='z', age=1,
+                                 is_active=False)
+            self.write([items[0]], [updated])
+            self.assert_orders()
+
+            self.write([items[2], items[3]], [])
+            self.assert_orders()
+
+            many = [EntityStub(name=f'{index % 5}', age=index % 7) for index in range(70)]
+            self.write([], many)
+            self.assert_orders()
+
+        self.assertTrue(self.engine.is_synced_with(self.data))
+        self.assertListEqual(sorted(item.id for item in self.data.values() if item.is_active),
+                             sorted(self.engine.ids[row]
+                                    for row in self.engine.mask('is_active').nonzero()[0]
+                                    if self.engine.alive[row]))
+
+    def test_filter_masks_should_be_kept_and_patched_on_write(self):
+        items = list(self.data.values())
+        mask = self.engine.filter_mask('b', self.text_index.search('b'))
+        self.assertListEqual([True, False, True, False], mask.tolist())
+
+        new_item = EntityStub(name='bb', age=1)
+        self.write([items[0]], [new_item])
+
+        mask = self.engine.filter_mask('b', ['ignored, the mask is kept'])
+        self.assertListEqual([False, False, True, False, True],
+                             (mask & self.engine.alive[:5]).tolist())
+
+    @patch('__shared.infra.vectorized.COMPACT_MIN_DEAD_ROWS', 1)
+    def test_should_compact_the_dead_rows(self):
+        items = list(self.data.values())
+        self.engine.filter_mask('b', self.text_index.search('b'))
+
+        self.write(items[:3], [])
+
+        self.assertEqual(1, self.engine.size)
+        self.assertListEqual([items[3].id], self.engine.ids)
+        self.assertListEqual([False], self.engine.filter_masks['b'][1].tolist())
+        self.assert_orders()
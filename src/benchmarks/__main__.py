@@ -0,0 +1,6 @@
+import sys
+
+from benchmarks.hot_paths import main
+
+
+sys.exit(main())
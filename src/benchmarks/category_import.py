@@ -0,0 +1,63 @@
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+from category.application.imports import ImportCategoriesInput, ImportCategoriesUseCase
+from category.infra.repositories import CategoryInMemoryRepository
+
+
+WORDS = ['movie', 'series', 'kids', 'documentary', 'drama', 'action']
+
+
+def write_csv(path: str, size: int) -> None:
+    # text cells, like a real export, so every row goes through DRF
+    with open(path, 'w', encoding='utf-8', newline='') as import_file:
+        writer = csv.writer(import_file)
+        writer.writerow(['name', 'description', 'is_active', 'created_at'])
+        for index in range(size):
+            writer.writerow([f'{WORDS[index % len(WORDS)]} category {index}',
+                             f'description {index}',
+                             'true' if index % 3 else 'false',
+                             f'2024-01-{index % 28 + 1:02d}T10:00:00'])
+
+
+def measure(path: str, size: int, max_workers: int, chunk_size: int) -> Dict[str, float]:
+    use_case = ImportCategoriesUseCase(CategoryInMemoryRepository(), chunk_size=chunk_size,
+                                       max_workers=max_workers)
+    started_at = time.perf_counter()
+    output = use_case.execute(ImportCategoriesInput(path))
+    seconds = time.perf_counter() - started_at
+    assert output.imported == size and not output.errors
+
+    return {'seconds': seconds, 'rows_per_second': size / seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Measure how the category import scales with the worker processes.')
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'categories.csv')
+        write_csv(path, args.size)
+        results: Dict[str, Dict[str, float]] = {}
+        baseline: List[float] = []
+        for max_workers in args.workers:
+            result = measure(path, args.size, max_workers, args.chunk_size)
+            baseline = baseline or [result['rows_per_second']]
+            result['speedup'] = result['rows_per_second'] / baseline[0]
+            results[f'workers_{max_workers}'] = result
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator
+
+from category.domain.entities import Category
+from category.domain.repositories import CategoryRepositoryInterface
+from category.infra.repositories import CategoryColumnarInMemoryRepository, \
+    CategoryInMemoryRepository, CategorySnapshotRepository
+from category.infra.snapshots import write_snapshot
+
+
+WORDS = ['movie', 'series', 'kids', 'documentary', 'drama', 'action']
+CHUNK_SIZE = 10_000
+# the searches that build the orders a serving repository keeps: one per sort
+# field, plus the insertion order
+STEADY_STATE_SEARCHES = [
+    CategoryRepositoryInterface.SearchParams(order_by_field='name'),
+    CategoryRepositoryInterface.SearchParams(order_by_field='created_at'),
+    CategoryRepositoryInterface.SearchParams(),
+]
+
+
+def iter_categories(size: int) -> Iterator[Category]:
+    for index in range(size):
+        yield Category(name=f'{WORDS[index % len(WORDS)]} category {index}',
+                       description=f'description {index}')
+
+
+def measure_searched(repository: CategoryRepositoryInterface, size: int) -> Dict[str, float]:
+    # memory once the searches built their orders, measured while tracemalloc still
+    # runs, so it includes what was kept from the inserts
+    for search_params in STEADY_STATE_SEARCHES:
+        repository.search(search_params)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    return {'searched_bytes': current, 'searched_bytes_per_category': current / size}
+
+
+def measure(create_repository: Callable[[], CategoryRepositoryInterface],
+            size: int) -> Dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    repository = create_repository()
+    categories = iter_categories(size)
+    # the categories are created in chunks, so only what the repository keeps is measured
+    while chunk := [category for _, category in zip(range(CHUNK_SIZE), categories)]:
+        repository.insert_many(chunk)
+    del chunk
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    searched = measure_searched(repository, size)
+    tracemalloc.stop()
+
+    return {'bytes': current, 'bytes_per_category': current / size, **searched}
+
+
+def measure_snapshot(size: int) -> Dict[str, float]:
+    # the mapped file is in the page cache, shared by every process that opens it,
+    # so the heap only keeps the header fields
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'categories.snapshot')
+        write_snapshot(path, iter_categories(size))
+        gc.collect()
+        tracemalloc.start()
+        started_at = time.perf_counter()
+        repository = CategorySnapshotRepository(path)
+        open_seconds = time.perf_counter() - started_at
+        current, _ = tracemalloc.get_traced_memory()
+        searched = measure_searched(repository, size)
+        tracemalloc.stop()
+        repository.close()
+
+        return {'bytes': current, 'bytes_per_category': current / size, **searched,
+                'file_bytes': os.path.getsize(path), 'open_seconds': open_seconds}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Compare the memory used by the dict, columnar and snapshot Category '
+                    'stores.')
+    parser.add_argument('--size', type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = {'dict': measure(CategoryInMemoryRepository, args.size),
+               'columnar': measure(CategoryColumnarInMemoryRepository, args.size),
+               'snapshot': measure_snapshot(args.size)}
+    results['ratio'] = results['dict']['bytes'] / results['columnar']['bytes']
+    # the ratio a long running repository keeps, with its orders built
+    results['searched_ratio'] = \
+        results['dict']['searched_bytes'] / results['columnar']['searched_bytes']
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
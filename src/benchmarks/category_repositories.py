@@ -0,0 +1,73 @@
+import argparse
+import time
+from typing import Callable, Dict, List
+
+from category.domain.entities import Category
+from category.domain.repositories import CategoryRepositoryInterface
+from category.infra.repositories import CategoryInMemoryRepository, CategorySqliteRepository
+
+
+SEARCHES = {
+    'page_1': {},
+    'page_1_order_by_name': {'order_by_field': 'name'},
+    'deep_page_order_by_created_at_desc': {'order_by_field': 'created_at',
+                                           'order_by_direction': 'desc',
+                                           'page': 500},
+    'filter_order_by_name': {'filter': 'cat', 'order_by_field': 'name'},
+}
+
+
+def timeit(function: Callable[[], None], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(repository: CategoryRepositoryInterface,
+        categories: List[Category],
+        repeat: int) -> Dict[str, float]:
+    results = {}
+
+    start = time.perf_counter()
+    for category in categories:
+        repository.insert(category)
+    results['insert'] = (time.perf_counter() - start) / len(categories)
+
+    results['find_by_id'] = timeit(
+        lambda: repository.find_by_id(categories[len(categories) // 2].id), repeat)
+
+    for name, params in SEARCHES.items():
+        search_params = CategoryRepositoryInterface.SearchParams(**params)
+        repository.search(search_params)
+        results[f'search_{name}'] = timeit(lambda: repository.search(search_params), repeat)
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Compare CategoryInMemoryRepository and CategorySqliteRepository.')
+    parser.add_argument('--size', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--database', default=':memory:')
+    args = parser.parse_args()
+
+    words = ['movie', 'series', 'kids', 'documentary', 'drama', 'action']
+    categories = [Category(name=f'{words[index % len(words)]} category {index}',
+                           description=f'description {index}')
+                  for index in range(args.size)]
+
+    repositories = {'in_memory': CategoryInMemoryRepository(),
+                    'sqlite': CategorySqliteRepository(args.database)}
+    results = {name: run(repository, categories, args.repeat)
+               for name, repository in repositories.items()}
+
+    print(f'{"operation":<45}' + ''.join(f'{name:>15}' for name in results))
+    for operation in results['in_memory']:
+        print(f'{operation:<45}' +
+              ''.join(f'{result[operation] * 1e6:>13.1f}us' for result in results.values()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+import argparse
+from dataclasses import asdict, dataclass
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from __shared.domain.repositories import SearchParams
+from __shared.domain.value_objects import CompactUniqueEntityId, UniqueEntityId
+from __shared.infra.journal import DURABILITY_MODES, EntityCodec, Journal
+from __shared.infra.vectorized import is_vectorized_search_available
+from category.application.dto import CategoryOutputMapper
+from category.domain.entities import Category
+from category.domain.repositories import CategoryRepositoryInterface
+from category.domain.validators import CategoryValidator, CategoryValidatorFactory
+from category.infra.repositories import CategoryInMemoryRepository
+
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+WORDS = ['movie', 'series', 'kids', 'documentary', 'drama', 'action']
+SEARCHES = {
+    'page_1': {},
+    'page_1_order_by_name': {'order_by_field': 'name'},
+    'deep_page_order_by_created_at_desc': {'order_by_field': 'created_at',
+                                           'order_by_direction': 'desc',
+                                           'page': 50},
+    'filter_order_by_name': {'filter': 'kids', 'order_by_field': 'name'},
+    'filter_deep_page_order_by_name': {'filter': 'kids', 'order_by_field': 'name',
+                                       'page': 200},
+    # matches every category, so they are spread evenly over the name index
+    'filter_description_order_by_name': {'filter': 'description', 'order_by_field': 'name'},
+}
+
+Benchmark = Tuple[str, Callable[[], object]]
+# a benchmark and the strategy the repository picked for the search
+SearchBenchmark = Tuple[str, Callable[[], object], str]
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    name: str
+    seconds_per_call: float
+    calls: int
+    strategy: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+class UnboundCategoryValidator(CategoryValidator):
+    # a new serializer per validation, how the DRF validator worked before
+    reuse_serializer = False
+
+
+def domain_benchmarks() -> Iterator[Benchmark]:
+    category = Category(name='Movie', description='some description')
+    category_dict = category.to_dict()
+    compiled_validator = CategoryValidatorFactory.create()
+    drf_validator = CategoryValidatorFactory.create('drf')
+    unbound_drf_validator = UnboundCategoryValidator()
+    entity_id = str(UniqueEntityId())
+
+    yield 'category_create', lambda: Category(name='Movie', description='some description')
+    yield 'category_hydrate', lambda: Category.hydrate(entity_id, name='Movie',
+                                                        description='some description',
+                                                        created_at=category.created_at)
+    yield 'category_validate', category.validate
+    yield 'category_validator_compiled', lambda: compiled_validator.validate(category_dict)
+    yield 'category_validator_drf', lambda: drf_validator.validate(category_dict)
+    yield 'category_validator_drf_unbound', \
+        lambda: unbound_drf_validator.validate(category_dict)
+    yield 'unique_entity_id_generate', UniqueEntityId
+    yield 'unique_entity_id_parse', lambda: UniqueEntityId(entity_id)
+    yield 'compact_unique_entity_id_generate', CompactUniqueEntityId
+    yield 'compact_unique_entity_id_parse', lambda: CompactUniqueEntityId(entity_id)
+    # the str form is not kept, so every Entity.id read builds it again
+    yield 'compact_unique_entity_id_str', CompactUniqueEntityId(entity_id).__str__
+    yield 'entity_to_dict', category.to_dict
+
+    page = CategoryRepositoryInterface.SearchResult(count=1000, items_per_page=1000,
+                                                    current_page=1, data=create_categories(1000))
+    # how a page was mapped before `to_search_output`, item by item plus `to_dict`
+    yield 'category_page_output_per_item_1000', \
+        lambda: {**page.to_dict(),
+                 'data': [CategoryOutputMapper.to_output(item) for item in page.data]}
+    yield 'category_page_output_1000', lambda: CategoryOutputMapper.to_search_output(page)
+    yield 'category_page_output_rows_1000', \
+        lambda: CategoryOutputMapper.to_search_output(page, as_rows=True)
+    yield 'search_params_normalize', lambda: SearchParams(page='2',
+                                                          items_per_page='15',
+                                                          order_by_field='name',
+                                                          order_by_direction='DESC',
+                                                          filter='movie')
+
+
+def journal_benchmarks(directory: str) -> Iterator[Benchmark]:
+    repositories = []
+    try:
+        for mode in DURABILITY_MODES:
+            journal = Journal(os.path.join(directory, mode), EntityCodec(Category), mode=mode,
+                              snapshot_every=None)
+            repository = CategoryInMemoryRepository(journal=journal)
+            repositories.append(repository)
+            category = Category(name='Movie')
+            repository.insert(category)
+            yield f'category_update_journal_{mode}', \
+                lambda repository=repository, category=category: repository.update(category)
+    finally:
+        for repository in repositories:
+            repository.close()
+
+
+def create_categories(size: int) -> List[Category]:
+    return [Category(name=f'{WORDS[index % len(WORDS)]} category {index}',
+                     description=f'description {index}')
+            for index in range(size)]
+
+
+def search_engines() -> List[str]:
+    return ['indexed', 'vectorized'] if is_vectorized_search_available() else ['indexed']
+
+
+def search_benchmarks(size: int, engines: List[str]) -> Iterator[SearchBenchmark]:
+    categories = create_categories(size)
+    for engine in engines:
+        repository = CategoryInMemoryRepository(vectorized=engine == 'vectorized')
+        repository.insert_many(categories)
+        prefix = 'search' if engine == 'indexed' else f'search_{engine}'
+
+        for name, params in SEARCHES.items():
+            search_params = CategoryRepositoryInterface.SearchParams(**params)
+            # the first search builds the indexes, which is not what is measured
+            repository.search(search_params)
+            yield f'{prefix}_{name}_{size}', \
+                lambda repository=repository, search_params=search_params: \
+                repository.search(search_params), \
+                repository.last_search_strategy
+
+
+def measure(name: str, function: Callable[[], object], repeat: int,
+            strategy: Optional[str] = None) -> BenchmarkResult:
+    timer = timeit.Timer(function)
+    calls, _ = timer.autorange()
+    # the fastest run is the one least disturbed by the rest of the machine
+    best = min(timer.repeat(repeat=repeat, number=calls))
+    return BenchmarkResult(name=name, seconds_per_call=best / calls, calls=calls,
+                           strategy=strategy)
+
+
+def run(sizes: List[int], repeat: int,
+        selected: Optional[List[str]] = None) -> List[BenchmarkResult]:
+    def is_selected(name: str) -> bool:
+        return not selected or any(name.startswith(prefix) for prefix in selected)
+
+    def benchmarks() -> Iterator[SearchBenchmark]:
+        yield from ((name, function, None) for name, function in domain_benchmarks())
+        if any(is_selected(f'category_update_journal_{mode}') for mode in DURABILITY_MODES):
+            with tempfile.TemporaryDirectory() as directory:
+                yield from ((name, function, None)
+                            for name, function in journal_benchmarks(directory))
+        for size in sizes:
+            # filling the repository is the slow part, skip it when no search runs
+            engines = [engine for engine in search_engines()
+                       if any(is_selected(f'search_{engine}_{name}_{size}'.replace(
+                           'search_indexed', 'search')) for name in SEARCHES)]
+            if engines:
+                yield from search_benchmarks(size, engines)
+
+    return [measure(name, function, repeat, strategy)
+            for name, function, strategy in benchmarks() if is_selected(name)]
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict,
+            threshold: float) -> List[Regression]:
+    baseline_results = {result['name']: result['seconds_per_call']
+                        for result in baseline['results']}
+    return [Regression(result.name, baseline_results[result.name], result.seconds_per_call)
+            for result in results
+            if result.name in baseline_results and
+            result.seconds_per_call > baseline_results[result.name] * (1 + threshold)]
+
+
+def to_json(results: List[BenchmarkResult]) -> Dict:
+    return {'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': [asdict(result) for result in results]}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Benchmark the domain and repository hot paths.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='repository sizes for the search benchmarks')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', nargs='+', metavar='PREFIX',
+                        help='run only the benchmarks whose names start with a prefix')
+    parser.add_argument('--output', help='write the JSON results to a file instead of stdout')
+    parser.add_argument('--baseline', help='JSON results of a previous run to compare with')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='slowdown over the baseline reported as a regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.only)
+    output = json.dumps(to_json(results), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            output_file.write(output + '\n')
+    else:
+        print(output)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as baseline_file:
+        regressions = compare(results, json.load(baseline_file), args.threshold)
+
+    for regression in regressions:
+        print(f'{regression.name}: {regression.baseline * 1e6:.2f}us -> ' +
+              f'{regression.current * 1e6:.2f}us ({regression.ratio:.2f}x)', file=sys.stderr)
+
+    return 1 if regressions else 0
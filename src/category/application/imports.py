@@ -0,0 +1,145 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+import json
+import os
+from typing import Any, Deque, Iterator, List, Optional, Tuple
+
+from __shared.application.use_cases import UseCase
+from __shared.domain.validators import ErrorsField
+from __shared.domain.value_objects import UniqueEntityId
+from category.domain.entities import Category
+from category.domain.repositories import CategoryRepositoryInterface
+from category.domain.validators import CategoryValidatorFactory
+
+
+IMPORT_FORMATS = ['csv', 'jsonl']
+# (line, name, description, is_active, created_at), what a worker sends back for
+# a valid record instead of a pickled Category
+ImportRow = Tuple[int, str, Optional[str], bool, datetime]
+# a parsed CSV record or a raw JSON line, JSON is decoded by the workers
+ImportRecord = Tuple[int, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRowError:
+    line: int
+    errors: ErrorsField
+
+
+@dataclass(frozen=True, slots=True)
+class ImportCategoriesInput:
+    path: str
+    # taken from the file extension when not given
+    file_format: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ImportCategoriesOutput:
+    imported: int
+    errors: List[ImportRowError]
+
+
+def read_records(path: str, file_format: str) -> Iterator[ImportRecord]:
+    if file_format not in IMPORT_FORMATS:
+        raise ValueError(f'Unknown import format. data=[format: `{file_format}`]')
+
+    with open(path, encoding='utf-8', newline='') as import_file:
+        if file_format == 'csv':
+            reader = csv.DictReader(import_file)
+            for record in reader:
+                # empty and missing cells are left out, so optional columns take
+                # their defaults
+                yield reader.line_num, {column: value for column, value in record.items()
+                                        if value not in ('', None) and column is not None}
+            return
+
+        for line, text in enumerate(import_file, start=1):
+            if text.strip():
+                yield line, text
+
+
+def validate_records(records: List[ImportRecord]
+                     ) -> Tuple[List[ImportRow], List[Tuple[int, ErrorsField]]]:
+    # runs in the worker processes, so it only takes and returns plain values
+    lines = []
+    payloads = []
+    errors = []
+    for line, record in records:
+        if isinstance(record, str):
+            try:
+                record = json.loads(record)
+            except ValueError as error:
+                errors.append((line, {'non_field_errors': [f'Invalid JSON. {error}']}))
+                continue
+        lines.append(line)
+        payloads.append(record)
+
+    # the chunk is validated in one batch
+    validator = CategoryValidatorFactory.create()
+    validator.validate_many(payloads)
+    rows = []
+    for line, record_errors, data in zip(lines, validator.errors, validator.validated_data):
+        if record_errors:
+            errors.append((line, record_errors))
+            continue
+
+        rows.append((line,
+                     data['name'],
+                     data.get('description'),
+                     data.get('is_active', Category.get_default('is_active')),
+                     data.get('created_at') or datetime.now()))
+    # the JSON errors were found first
+    errors.sort(key=lambda error: error[0])
+    return rows, errors
+
+
+@dataclass(slots=True)
+class ImportCategoriesUseCase(UseCase[ImportCategoriesInput, ImportCategoriesOutput]):
+    # Streams a CSV or JSONL file in chunks to a process pool that validates them,
+    # so validation runs on every core, and inserts the valid rows of each chunk
+    # in one bulk insert, in file order. Invalid rows are reported, not imported.
+    repository: CategoryRepositoryInterface
+    chunk_size: int = 1000
+    # defaults to one process per core, owned by the use case
+    executor: Optional[Executor] = field(default=None, repr=False, compare=False)
+    max_workers: Optional[int] = None
+
+    def execute(self, input_params: ImportCategoriesInput) -> ImportCategoriesOutput:
+        file_format = input_params.file_format or \
+            os.path.splitext(input_params.path)[1].lstrip('.').lower()
+        records = read_records(input_params.path, file_format)
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.max_workers)
+        imported = 0
+        errors = []
+        try:
+            for rows, chunk_errors in self._validate_chunks(executor, records):
+                # the workers validated the rows, so they are not validated again
+                self.repository.insert_many([
+                    Category.hydrate(UniqueEntityId(), name=name, description=description,
+                                     is_active=is_active, created_at=created_at)
+                    for _, name, description, is_active, created_at in rows])
+                imported += len(rows)
+                errors.extend(ImportRowError(line, row_errors)
+                              for line, row_errors in chunk_errors)
+        finally:
+            if executor is not self.executor:
+                executor.shutdown(cancel_futures=True)
+
+        return ImportCategoriesOutput(imported=imported, errors=errors)
+
+    def _validate_chunks(self, executor: Executor, records: Iterator[ImportRecord]
+                         ) -> Iterator[Tuple[List[ImportRow], List[Tuple[int, ErrorsField]]]]:
+        # a couple of chunks per worker in flight keeps every worker busy without
+        # reading the whole file ahead
+        max_pending = 2 * (self.max_workers or os.cpu_count() or 1)
+        pending: Deque[Future] = deque()
+        while chunk := list(islice(records, self.chunk_size)):
+            pending.append(executor.submit(validate_records, chunk))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,9 +1,10 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from __shared.domain.entities import Entity
 from __shared.domain.exceptions import EntityValidationException
+from __shared.domain.validators import ErrorsField
 from category.domain.validators import CategoryValidatorFactory
 
 
@@ -35,3 +36,12 @@ class Category(Entity):
         is_valid = validator.validate(self.to_dict())
         if not is_valid:
             raise EntityValidationException(validator.errors)
+
+    @classmethod
+    def validate_many(cls, categories: List['Category']) -> List[Optional[ErrorsField]]:
+        # Validates categories built with `hydrate` in one pass, with one validator
+        # and at most one DRF serializer for the whole batch. The errors are in the
+        # order of `categories`, None for the valid ones.
+        validator = CategoryValidatorFactory.create()
+        validator.validate_many([category.to_dict() for category in categories])
+        return validator.errors
@@ -1,26 +1,79 @@
-from typing import Dict
-from rest_framework import serializers
-from __shared.domain.validators import DRFValidator
+from datetime import datetime
+from functools import cache
+from typing import Any, ClassVar, Dict, List, Optional, Type
+from __shared.domain.validators import CompiledValidator, DRFValidator, FieldRule, \
+    FieldValidatorInterface, bind_serializer, load_drf_serializers
 
 
-# pylint: disable=abstract-method
-class CategoryValidationRules(serializers.Serializer):
-    name = serializers.CharField(max_length=255)
-    description = serializers.CharField(
-        required=False, allow_null=True, allow_blank=True)
-    is_active = serializers.BooleanField(required=False)
-    created_at = serializers.DateTimeField(required=False)
+@cache
+def get_category_validation_rules() -> type:
+    serializers = load_drf_serializers()
+
+    # pylint: disable=abstract-method
+    class CategoryValidationRules(serializers.Serializer):
+        name = serializers.CharField(max_length=255)
+        description = serializers.CharField(
+            required=False, allow_null=True, allow_blank=True)
+        is_active = serializers.BooleanField(required=False)
+        created_at = serializers.DateTimeField(required=False)
+
+    return CategoryValidationRules
+
+
+def __getattr__(name: str) -> Any:
+    # `CategoryValidationRules` is a DRF serializer, so it is only created on first use
+    if name == 'CategoryValidationRules':
+        return get_category_validation_rules()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class CategoryValidator(DRFValidator):
+    # Every validation runs through one serializer bound to the rules once. False
+    # creates a serializer per validation, with its own copy of the fields.
+    reuse_serializer: ClassVar[bool] = True
+
     def validate(self, data: Dict) -> bool:
         validation_rules_data = data if data is not None else {}
-        validation_rules = CategoryValidationRules(data=validation_rules_data)
+        if self.reuse_serializer:
+            return self.validate_bound(bind_serializer(get_category_validation_rules()),
+                                       validation_rules_data)
+
+        validation_rules = get_category_validation_rules()(data=validation_rules_data)
 
         return super().validate(validation_rules)
 
+    def validate_many(self, data: List[Dict]) -> bool:
+        validation_rules = get_category_validation_rules()(
+            data=[item if item is not None else {} for item in data], many=True)
+
+        return super().validate_many(validation_rules)
+
+
+class CategoryCompiledValidator(CompiledValidator, CategoryValidator):
+    rules = {
+        'name': FieldRule(str, max_length=255),
+        'description': FieldRule(str, required=False, allow_null=True, allow_blank=True),
+        'is_active': FieldRule(bool, required=False),
+        'created_at': FieldRule(datetime, required=False),
+    }
+
 
 class CategoryValidatorFactory:
-    @staticmethod
-    def create():
-        return CategoryValidator()
+    backends: ClassVar[Dict[str, Type[FieldValidatorInterface]]] = {
+        'compiled': CategoryCompiledValidator,
+        'drf': CategoryValidator,
+    }
+    default_backend: ClassVar[str] = 'compiled'
+
+    @classmethod
+    def register(cls, name: str, validator_class: Type[FieldValidatorInterface]) -> None:
+        cls.backends[name] = validator_class
+
+    @classmethod
+    def create(cls, backend: Optional[str] = None) -> FieldValidatorInterface:
+        backend = backend or cls.default_backend
+        validator_class = cls.backends.get(backend)
+        if validator_class is None:
+            raise ValueError(f'Unknown validation backend. data=[backend: `{backend}`]')
+
+        return validator_class()
@@ -1,12 +1,745 @@
-from typing import List, Optional
-from __shared.infra.repositories import InMemorySearchableRepository
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import partial
+from operator import attrgetter, itemgetter
+import sqlite3
+from typing import Any, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple
+import uuid
+from __shared.domain.repositories import SearchCursor
+from __shared.domain.value_objects import UniqueEntityId
+from __shared.infra.columns import Bitmap, DatetimeColumn, KeyColumn, StringColumn
+from __shared.infra.indexes import BULK_UPDATE_THRESHOLD, SortKey, SortedIndex, match_tokens, \
+    tokenize
+from __shared.infra.repositories import InMemorySearchableRepository, decode_cursor, \
+    entity_not_found, position_after_cursor, raise_if_any_not_found
+from __shared.infra.sort_keys import casefold_text, datetime_sort_key, epoch_micros, \
+    text_sort_key
+from __shared.infra.sqlite import SqliteConnectionPool
 from category.domain.entities import Category
 from category.domain.repositories import CategoryRepositoryInterface
+from category.infra.snapshots import CategorySnapshot
+
+
+# the type of the sort keys the cursors hold: casefolded names, epoch micros
+# of created_at, and None for the insertion order
+CURSOR_KEY_TYPES = {None: type(None), 'name': str, 'created_at': int}
 
 
 class CategoryInMemoryRepository(CategoryRepositoryInterface, InMemorySearchableRepository):
     def sortable_fields(self) -> List[str]:
         return ['name', 'created_at']
 
+    def _sort_keys(self) -> Dict[str, SortKey]:
+        return {'name': text_sort_key('name'), 'created_at': datetime_sort_key('created_at')}
+
+    def _text_search_fields(self) -> List[str]:
+        return ['name', 'description']
+
+    def _vectorized_flags(self) -> Dict[str, Callable[[Category], bool]]:
+        return {'is_active': attrgetter('is_active')}
+
     def _filter(self, data: List[Category], filter_param: Optional[str]) -> List[Category]:
-        return super()._filter(data, filter_param)
+        if not filter_param:
+            return data
+
+        query_tokens = tokenize(filter_param)
+        return [item for item in data
+                if match_tokens(query_tokens,
+                                tokenize(item.name) + tokenize(item.description))]
+
+
+@dataclass(slots=True)
+class CategoryColumnarInMemoryRepository(CategoryRepositoryInterface):
+    # Struct-of-arrays store: one compact column per Category field instead of
+    # one object per category. Categories are only built for the rows a read
+    # returns. Rows are append only, deleted rows are skipped until the
+    # columns are compacted.
+    ids: KeyColumn = field(default_factory=KeyColumn, repr=False, compare=False)
+    sequences: array = field(default_factory=lambda: array('Q'), repr=False, compare=False)
+    names: StringColumn = field(default_factory=StringColumn, repr=False, compare=False)
+    descriptions: StringColumn = field(default_factory=StringColumn, repr=False, compare=False)
+    is_active: Bitmap = field(default_factory=Bitmap, repr=False, compare=False)
+    created_at: DatetimeColumn = field(default_factory=DatetimeColumn, repr=False,
+                                       compare=False)
+    versions: array = field(default_factory=lambda: array('Q'), repr=False, compare=False)
+    alive: Bitmap = field(default_factory=Bitmap, repr=False, compare=False)
+    next_sequence: int = field(default=0, repr=False, compare=False)
+    # alive rows by sort field, None for the insertion order
+    _orders: Dict[Optional[str], SortedIndex] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+
+    COMPACT_MIN_DEAD_ROWS: ClassVar[int] = 1024
+
+    def __len__(self) -> int:
+        return self.ids.size
+
+    def sortable_fields(self) -> List[str]:
+        return ['name', 'created_at']
+
+    def insert(self, entity: Category) -> None:
+        self.insert_many([entity])
+
+    def insert_many(self, entities: List[Category]) -> None:
+        removed_rows, added_rows = [], []
+        for entity in entities:
+            key = uuid.UUID(entity.id).bytes
+            row = self.ids.find(key)
+            if row is None:
+                added_rows.append(self._append(key, entity))
+            else:
+                self._write(row, entity)
+                removed_rows.append(row)
+                added_rows.append(row)
+        self._after_write(removed_rows, added_rows)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> Category:
+        row = self._find_row(entity_id)
+        if row is None:
+            raise entity_not_found(entity_id)
+        return self._to_entity(row)
+
+    def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[Category]:
+        return [self._to_entity(row) for row in self._find_rows(entity_ids)]
+
+    def find_all(self) -> List[Category]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Category]:
+        for row in self._get_order(None).iter_ids():
+            yield self._to_entity(row)
+
+    def update(self, entity: Category, expected_version: Optional[int] = None) -> None:
+        row = self._find_row(entity.id)
+        if row is None:
+            raise entity_not_found(entity.id)
+        self._raise_if_version_conflict(entity.id, expected_version, self.versions[row])
+        entity._set('version', self.versions[row] + 1)  # pylint: disable=protected-access
+        self._write(row, entity)
+        self._after_write([row], [row])
+
+    def update_many(self, entities: List[Category]) -> None:
+        rows = self._find_rows([entity.id for entity in entities])
+        for row, entity in zip(rows, entities):
+            entity._set('version', self.versions[row] + 1)  # pylint: disable=protected-access
+            self._write(row, entity)
+        self._after_write(rows, rows)
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        if self._find_row(entity_id) is None:
+            raise entity_not_found(entity_id)
+        self.delete_many([entity_id])
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        rows = set(self._find_rows(entity_ids))
+        for row in rows:
+            self.alive.set(row, False)
+            self.ids.remove(self.ids.get(row))
+        self._after_write(list(rows), [])
+
+    def search(self, search_params: CategoryRepositoryInterface.SearchParams
+               ) -> CategoryRepositoryInterface.SearchResult:
+        order_by_field = search_params.order_by_field \
+            if search_params.order_by_field in self.sortable_fields() else None
+        order_by_direction = search_params.order_by_direction if order_by_field else None
+        reverse = order_by_direction == 'desc'
+        cursor = decode_cursor(search_params.after, order_by_field, order_by_direction,
+                               search_params.filter, CURSOR_KEY_TYPES[order_by_field])
+
+        order = self._get_order(order_by_field)
+        per_page = search_params.items_per_page
+        start = (search_params.page - 1) * per_page
+        if search_params.filter is None:
+            count = len(order)
+            if cursor is not None:
+                start = order.position_after(cursor.key, cursor.sequence, reverse)
+            # one extra row tells whether there is a next page
+            rows = order.slice(start, start + per_page + 1, reverse)
+        else:
+            query_tokens = tokenize(search_params.filter)
+            entries = [entry for entry in order.entries
+                       if match_tokens(query_tokens,
+                                       tokenize(self.names.get(entry[2])) +
+                                       tokenize(self.descriptions.get(entry[2])))]
+            if reverse:
+                # stable, so ties keep insertion order in both directions
+                entries.sort(key=itemgetter(0), reverse=True)
+            count = len(entries)
+            if cursor is not None:
+                start = position_after_cursor(entries, cursor, reverse, itemgetter(0, 1))
+            rows = [entry[2] for entry in entries[start:start + per_page + 1]]
+
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = SearchCursor(order.indexed_keys[rows[-1]],
+                                       self.sequences[rows[-1]],
+                                       order_by_field,
+                                       order_by_direction,
+                                       search_params.filter).encode()
+
+        return self.SearchResult(
+            count=count if search_params.include_count else None,
+            items_per_page=per_page,
+            current_page=search_params.page,
+            data=[self._to_entity(row) for row in rows],
+            next_cursor=next_cursor)
+
+    def _append(self, key: bytes, entity: Category) -> int:
+        row = len(self.sequences)
+        self.ids.append(key)
+        self.sequences.append(self.next_sequence)
+        self.next_sequence += 1
+        self.names.append(entity.name)
+        self.descriptions.append(entity.description)
+        self.is_active.append(entity.is_active)
+        self.created_at.append(entity.created_at)
+        self.versions.append(entity.version)
+        self.alive.append(True)
+        return row
+
+    def _write(self, row: int, entity: Category) -> None:
+        self.names.set(row, entity.name)
+        self.descriptions.set(row, entity.description)
+        self.is_active.set(row, entity.is_active)
+        self.created_at.set(row, entity.created_at)
+        self.versions[row] = entity.version
+
+    def _after_write(self, removed_rows: List[int], added_rows: List[int]) -> None:
+        # Keeps the orders already built in step with the written rows instead of
+        # sorting every row again on the next search. A rewritten row is removed
+        # with the key it was indexed with and added back with its new one.
+        removed_rows = list(dict.fromkeys(removed_rows))
+        added_rows = list(dict.fromkeys(added_rows))
+        sequences = self.sequences
+        for order in self._orders.values():
+            if len(removed_rows) + len(added_rows) > BULK_UPDATE_THRESHOLD:
+                order.replace_many(set(removed_rows),
+                                   ((row, row, sequences[row]) for row in added_rows))
+                continue
+            for row in removed_rows:
+                order.remove(row, sequences[row])
+            for row in added_rows:
+                order.add(row, row, sequences[row])
+
+        dead_rows = len(self.sequences) - len(self)
+        garbage = self.names.garbage + self.descriptions.garbage
+        if dead_rows > max(self.COMPACT_MIN_DEAD_ROWS, len(self)) or \
+                garbage > max(self.COMPACT_MIN_DEAD_ROWS * 64,
+                              len(self.names.data) + len(self.descriptions.data) - garbage):
+            self._compact()
+
+    def _compact(self) -> None:
+        rows = self._get_order(None).slice(0, len(self))
+        self.ids = self.ids.take(rows)
+        self.sequences = array('Q', (self.sequences[row] for row in rows))
+        self.names = self.names.take(rows)
+        self.descriptions = self.descriptions.take(rows)
+        self.created_at = self.created_at.take(rows)
+        self.versions = array('Q', (self.versions[row] for row in rows))
+        is_active = [self.is_active.get(row) for row in rows]
+        self.is_active, self.alive = Bitmap(), Bitmap()
+        for value in is_active:
+            self.is_active.append(value)
+            self.alive.append(True)
+        # the rows were renumbered, the orders are built again when searched
+        self._orders.clear()
+
+    def _find_rows(self, entity_ids: List[str | UniqueEntityId]) -> List[int]:
+        rows = [self._find_row(entity_id) for entity_id in entity_ids]
+        raise_if_any_not_found(entity_id for entity_id, row in zip(entity_ids, rows)
+                               if row is None)
+        return rows
+
+    def _get_order(self, order_by_field: Optional[str]) -> SortedIndex:
+        # alive rows by (sort key, sequence), built on the first search by the field
+        # and then kept up to date by every write
+        order = self._orders.get(order_by_field)
+        if order is None:
+            alive, sequences = self.alive, self.sequences
+            order = self._orders[order_by_field] = SortedIndex(
+                partial(self._sort_value, order_by_field))
+            order.rebuild((row, row, sequences[row])
+                          for row in range(len(sequences)) if alive.get(row))
+        return order
+
+    def _sort_value(self, order_by_field: Optional[str], row: int) -> Any:
+        if order_by_field == 'name':
+            return casefold_text(self.names.get(row))
+        if order_by_field == 'created_at':
+            # the column already holds the epoch micros of the sort key
+            return self.created_at.micros[row]
+        return None
+
+    def _to_entity(self, row: int) -> Category:
+        entity_id = str(uuid.UUID(bytes=self.ids.get(row)))
+        return Category.hydrate(entity_id,
+                                version=self.versions[row],
+                                name=self.names.get(row),
+                                description=self.descriptions.get(row),
+                                is_active=self.is_active.get(row),
+                                created_at=self.created_at.get(row))
+
+    def _find_row(self, entity_id: str | UniqueEntityId) -> Optional[int]:
+        try:
+            key = uuid.UUID(str(entity_id)).bytes
+        except ValueError:
+            return None
+        return self.ids.find(key)
+
+
+class ReadOnlyRepositoryException(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class CategorySnapshotRepository(CategoryRepositoryInterface):
+    # Serves a catalog written by `write_snapshot` from a read only mmap. Opening
+    # it only reads the header, and every process mapping the same file shares
+    # one page cache copy. Categories are only built for the rows a read returns.
+    path: str
+    snapshot: CategorySnapshot = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.snapshot = CategorySnapshot(self.path)
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def sortable_fields(self) -> List[str]:
+        return ['name', 'created_at']
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> Category:
+        row = self._find_row(entity_id)
+        if row is None:
+            raise entity_not_found(entity_id)
+        return self.snapshot.category(row)
+
+    def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[Category]:
+        rows = [self._find_row(entity_id) for entity_id in entity_ids]
+        raise_if_any_not_found(entity_id for entity_id, row in zip(entity_ids, rows)
+                               if row is None)
+        return [self.snapshot.category(row) for row in rows]
+
+    def find_all(self) -> List[Category]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Category]:
+        for row in range(len(self.snapshot)):
+            yield self.snapshot.category(row)
+
+    def insert(self, entity: Category) -> None:
+        self._raise_read_only()
+
+    def insert_many(self, entities: List[Category]) -> None:
+        self._raise_read_only()
+
+    def update(self, entity: Category, expected_version: Optional[int] = None) -> None:
+        self._raise_read_only()
+
+    def update_many(self, entities: List[Category]) -> None:
+        self._raise_read_only()
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        self._raise_read_only()
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        self._raise_read_only()
+
+    def search(self, search_params: CategoryRepositoryInterface.SearchParams
+               ) -> CategoryRepositoryInterface.SearchResult:
+        order_by_field = search_params.order_by_field \
+            if search_params.order_by_field in self.sortable_fields() else None
+        order_by_direction = search_params.order_by_direction if order_by_field else None
+        reverse = order_by_direction == 'desc'
+        cursor = decode_cursor(search_params.after, order_by_field, order_by_direction,
+                               search_params.filter, CURSOR_KEY_TYPES[order_by_field])
+
+        ordered_rows = range(len(self.snapshot)) if order_by_field is None \
+            else self.snapshot.order(order_by_field, reverse)
+        if search_params.filter is not None:
+            query_tokens = tokenize(search_params.filter)
+            ordered_rows = [row for row in ordered_rows
+                            if match_tokens(query_tokens,
+                                            tokenize(self.snapshot.name(row)) +
+                                            tokenize(self.snapshot.description(row)))]
+
+        per_page = search_params.items_per_page
+        start = (search_params.page - 1) * per_page
+        if cursor is not None:
+            # rows are stored in insertion order, so a row is its own sequence
+            start = position_after_cursor(
+                ordered_rows, cursor, reverse,
+                lambda row: (self._sort_value(order_by_field, row), row))
+        # one extra row tells whether there is a next page
+        rows = list(ordered_rows[start:start + per_page + 1])
+
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = SearchCursor(self._sort_value(order_by_field, rows[-1]),
+                                       rows[-1],
+                                       order_by_field,
+                                       order_by_direction,
+                                       search_params.filter).encode()
+
+        return self.SearchResult(
+            count=len(ordered_rows) if search_params.include_count else None,
+            items_per_page=per_page,
+            current_page=search_params.page,
+            data=[self.snapshot.category(row) for row in rows],
+            next_cursor=next_cursor)
+
+    def close(self) -> None:
+        self.snapshot.close()
+
+    def _sort_value(self, order_by_field: Optional[str], row: int) -> Any:
+        if order_by_field == 'name':
+            return casefold_text(self.snapshot.name(row))
+        if order_by_field == 'created_at':
+            return self.snapshot.created_at_micros(row)
+        return None
+
+    def _find_row(self, entity_id: str | UniqueEntityId) -> Optional[int]:
+        try:
+            key = uuid.UUID(str(entity_id)).bytes
+        except ValueError:
+            return None
+        return self.snapshot.find(key)
+
+    def _raise_read_only(self) -> None:
+        raise ReadOnlyRepositoryException(
+            f'Repository is read only. data=[path: `{self.path}`]')
+
+
+@dataclass(slots=True)
+class CategorySqliteRepository(CategoryRepositoryInterface):
+    database: str = ':memory:'
+    pool_size: int = 5
+    pool: SqliteConnectionPool = field(init=False, repr=False, compare=False)
+    use_fts: bool = field(init=False, repr=False, compare=False)
+
+    SORT_COLUMNS: ClassVar[Dict[str, str]] = {'name': 'name_key',
+                                              'created_at': 'created_at_key'}
+    COLUMNS: ClassVar[str] = 'id, name, description, is_active, created_at, version'
+    INSERT_SQL: ClassVar[str] = \
+        'INSERT INTO categories (id, name, description, is_active, created_at, ' + \
+        'name_key, created_at_key, search_tokens, version) ' + \
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ' + \
+        'ON CONFLICT (id) DO UPDATE SET name = excluded.name, ' + \
+        'description = excluded.description, is_active = excluded.is_active, ' + \
+        'created_at = excluded.created_at, name_key = excluded.name_key, ' + \
+        'created_at_key = excluded.created_at_key, search_tokens = excluded.search_tokens, ' + \
+        'version = excluded.version'
+    # ?9 is the expected version, NULL updates whatever the stored version is
+    UPDATE_SQL: ClassVar[str] = \
+        'UPDATE categories SET name = ?2, description = ?3, is_active = ?4, ' + \
+        'created_at = ?5, name_key = ?6, created_at_key = ?7, search_tokens = ?8, ' + \
+        'version = version + 1 WHERE id = ?1 AND (?9 IS NULL OR version = ?9)'
+    # stays below SQLITE_MAX_VARIABLE_NUMBER on old SQLite builds
+    IN_CHUNK_SIZE: ClassVar[int] = 500
+    ITER_CHUNK_SIZE: ClassVar[int] = 500
+    # PRAGMA user_version, 1 since the sort keys are casefolded names and epoch micros,
+    # 2 since rows keep the entity version
+    SCHEMA_VERSION: ClassVar[int] = 2
+
+    def __post_init__(self):
+        self.pool = SqliteConnectionPool(self.database, self.pool_size)
+        with self.pool.connection() as connection, connection:
+            self._migrate(connection)
+            self.use_fts = self._create_schema(connection)
+
+    def sortable_fields(self) -> List[str]:
+        return ['name', 'created_at']
+
+    def insert(self, entity: Category) -> None:
+        with self.pool.connection() as connection, connection:
+            connection.execute(self.INSERT_SQL, (*self._to_row(entity), entity.version))
+
+    def insert_many(self, entities: List[Category]) -> None:
+        with self.pool.connection() as connection, connection:
+            connection.executemany(
+                self.INSERT_SQL,
+                [(*self._to_row(entity), entity.version) for entity in entities])
+
+    def find_by_ids(self, entity_ids: List[str | UniqueEntityId]) -> List[Category]:
+        entity_ids = [str(entity_id) for entity_id in entity_ids]
+        with self.pool.connection() as connection:
+            rows = self._find_rows(connection, entity_ids)
+
+        self._raise_if_any_not_found(entity_ids, rows)
+        return [self._to_entity(rows[entity_id]) for entity_id in entity_ids]
+
+    def update_many(self, entities: List[Category]) -> None:
+        with self.pool.connection() as connection, connection:
+            self._raise_if_any_not_found(
+                [entity.id for entity in entities],
+                self._find_rows(connection, [entity.id for entity in entities]))
+            connection.executemany(self.UPDATE_SQL,
+                                   [(*self._to_row(entity), None) for entity in entities])
+            rows = self._find_rows(connection, [entity.id for entity in entities])
+
+        for entity in entities:
+            entity._set('version', rows[entity.id][5])  # pylint: disable=protected-access
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> None:
+        entity_ids = [str(entity_id) for entity_id in entity_ids]
+        with self.pool.connection() as connection, connection:
+            self._raise_if_any_not_found(entity_ids, self._find_rows(connection, entity_ids))
+            connection.executemany('DELETE FROM categories WHERE id = ?',
+                                   [(entity_id,) for entity_id in entity_ids])
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> Category:
+        with self.pool.connection() as connection:
+            row = connection.execute(f'SELECT {self.COLUMNS} FROM categories WHERE id = ?',
+                                     (str(entity_id),)).fetchone()
+
+        if row is None:
+            raise entity_not_found(entity_id)
+
+        return self._to_entity(row)
+
+    def find_all(self) -> List[Category]:
+        with self.pool.connection() as connection:
+            rows = connection.execute(
+                f'SELECT {self.COLUMNS} FROM categories ORDER BY seq').fetchall()
+
+        return [self._to_entity(row) for row in rows]
+
+    def iter_all(self) -> Iterator[Category]:
+        # keyset chunks, so no connection is held while the caller consumes them
+        last_seq = 0
+        while True:
+            with self.pool.connection() as connection:
+                rows = connection.execute(
+                    f'SELECT {self.COLUMNS}, seq FROM categories WHERE seq > ? ' +
+                    'ORDER BY seq LIMIT ?', (last_seq, self.ITER_CHUNK_SIZE)).fetchall()
+
+            yield from (self._to_entity(row) for row in rows)
+            if len(rows) < self.ITER_CHUNK_SIZE:
+                return
+            last_seq = rows[-1][6]
+
+    def update(self, entity: Category, expected_version: Optional[int] = None) -> None:
+        with self.pool.connection() as connection, connection:
+            cursor = connection.execute(self.UPDATE_SQL,
+                                        (*self._to_row(entity), expected_version))
+            # read in the same transaction, so it is the version the update wrote
+            row = connection.execute('SELECT version FROM categories WHERE id = ?',
+                                     (entity.id,)).fetchone()
+
+        if row is None:
+            raise entity_not_found(entity.id)
+        if cursor.rowcount == 0:
+            self._raise_if_version_conflict(entity.id, expected_version, row[0])
+        entity._set('version', row[0])  # pylint: disable=protected-access
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        with self.pool.connection() as connection, connection:
+            cursor = connection.execute('DELETE FROM categories WHERE id = ?',
+                                        (str(entity_id),))
+
+        if cursor.rowcount == 0:
+            raise entity_not_found(entity_id)
+
+    def search(self, search_params: CategoryRepositoryInterface.SearchParams
+               ) -> CategoryRepositoryInterface.SearchResult:
+        page = search_params.page
+        per_page = search_params.items_per_page
+        column = self.SORT_COLUMNS.get(search_params.order_by_field)
+        order_by_field = search_params.order_by_field if column else None
+        order_by_direction = search_params.order_by_direction if column else None
+        filter_condition, filter_params = self._filter_condition(search_params.filter)
+        if filter_condition is None:
+            return self.SearchResult(count=0 if search_params.include_count else None,
+                                     items_per_page=per_page, current_page=page, data=[])
+
+        conditions = [filter_condition] if filter_condition else []
+        params = list(filter_params)
+        offset = (page - 1) * per_page
+        cursor = decode_cursor(search_params.after, order_by_field, order_by_direction,
+                               search_params.filter, CURSOR_KEY_TYPES[order_by_field])
+        if cursor is not None:
+            condition, cursor_params = self._cursor_condition(column, order_by_direction, cursor)
+            conditions.append(condition)
+            params.extend(cursor_params)
+            offset = 0
+
+        count_where = f'WHERE {filter_condition}' if filter_condition else ''
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+        count_sql, count_params = 'NULL', ()
+        if search_params.include_count:
+            # the uncorrelated count subquery runs once, in the same statement as the page
+            count_sql = f'(SELECT COUNT(*) FROM categories c {count_where})'
+            count_params = filter_params
+
+        key_sql = f'c.{column}' if column else 'NULL'
+        order_by = self._order_by(column, order_by_direction)
+        with self.pool.connection() as connection:
+            # one extra row tells whether there is a next page
+            rows = connection.execute(
+                f'SELECT {self.COLUMNS}, c.seq, {key_sql}, {count_sql} ' +
+                f'FROM categories c {where} ORDER BY {order_by} LIMIT ? OFFSET ?',
+                (*count_params, *params, per_page + 1, offset)).fetchall()
+
+            count = None
+            if rows:
+                count = rows[0][-1]
+            elif search_params.include_count:
+                count = connection.execute(f'SELECT COUNT(*) FROM categories c {count_where}',
+                                           filter_params).fetchone()[0]
+
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = SearchCursor(rows[-1][7], rows[-1][6], order_by_field,
+                                       order_by_direction, search_params.filter).encode()
+
+        return self.SearchResult(count=count,
+                                 items_per_page=per_page,
+                                 current_page=page,
+                                 data=[self._to_entity(row) for row in rows],
+                                 next_cursor=next_cursor)
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def _find_rows(self, connection: sqlite3.Connection,
+                   entity_ids: List[str]) -> Dict[str, Tuple]:
+        rows = {}
+        unique_ids = list(dict.fromkeys(entity_ids))
+        for start in range(0, len(unique_ids), self.IN_CHUNK_SIZE):
+            chunk = unique_ids[start:start + self.IN_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            for row in connection.execute(
+                    f'SELECT {self.COLUMNS} FROM categories WHERE id IN ({placeholders})', chunk):
+                rows[row[0]] = row
+        return rows
+
+    @staticmethod
+    def _raise_if_any_not_found(entity_ids: List[str], rows: Dict[str, Tuple]) -> None:
+        raise_if_any_not_found(entity_id for entity_id in entity_ids if entity_id not in rows)
+
+    def _filter_condition(self, filter_param: Optional[str]) -> Tuple[Optional[str], Tuple]:
+        if filter_param is None:
+            return '', ()
+
+        query_tokens = tokenize(filter_param)
+        if not query_tokens:
+            return None, ()
+
+        if self.use_fts:
+            match = ' AND '.join(f'"{token}"*' for token in query_tokens)
+            return 'c.seq IN (SELECT rowid FROM categories_fts ' + \
+                'WHERE categories_fts MATCH ?)', (match,)
+
+        conditions = ' AND '.join(["(' ' || c.search_tokens) LIKE ? ESCAPE '\\'"]
+                                  * len(query_tokens))
+        patterns = tuple('% ' + token.replace('\\', '\\\\').replace('%', '\\%')
+                         .replace('_', '\\_') + '%' for token in query_tokens)
+        return conditions, patterns
+
+    @staticmethod
+    def _cursor_condition(column: Optional[str],
+                          order_by_direction: Optional[str],
+                          cursor: SearchCursor) -> Tuple[str, Tuple]:
+        if column is None:
+            return 'c.seq > ?', (cursor.sequence,)
+
+        operator = '<' if order_by_direction == 'desc' else '>'
+        return f'(c.{column} {operator} ? OR (c.{column} = ? AND c.seq > ?))', \
+            (cursor.key, cursor.key, cursor.sequence)
+
+    @staticmethod
+    def _order_by(column: Optional[str], order_by_direction: Optional[str]) -> str:
+        if column is None:
+            return 'c.seq'
+
+        direction = 'DESC' if order_by_direction == 'desc' else 'ASC'
+        return f'c.{column} {direction}, c.seq'
+
+    @classmethod
+    def _migrate(cls, connection: sqlite3.Connection) -> None:
+        version = connection.execute('PRAGMA user_version').fetchone()[0]
+        exists = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' " +
+                                    "AND name = 'categories'").fetchone()
+        if exists and version < 1:
+            # the created_at key column held text, which INTEGER keys can not share
+            connection.execute('DROP INDEX IF EXISTS categories_created_at_key')
+            connection.execute('ALTER TABLE categories DROP COLUMN created_at_key')
+            connection.execute('ALTER TABLE categories ADD COLUMN ' +
+                               'created_at_key INTEGER NOT NULL DEFAULT 0')
+            rows = connection.execute('SELECT seq, name, created_at FROM categories').fetchall()
+            connection.executemany(
+                'UPDATE categories SET name_key = ?, created_at_key = ? WHERE seq = ?',
+                [(casefold_text(name), epoch_micros(datetime.fromisoformat(created_at)), seq)
+                 for seq, name, created_at in rows])
+        if exists and version < 2:
+            connection.execute('ALTER TABLE categories ADD COLUMN ' +
+                               'version INTEGER NOT NULL DEFAULT 0')
+        connection.execute(f'PRAGMA user_version = {cls.SCHEMA_VERSION}')
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> bool:
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS categories (' +
+            'seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, ' +
+            'name TEXT NOT NULL, description TEXT, is_active INTEGER NOT NULL, ' +
+            'created_at TEXT NOT NULL, name_key TEXT NOT NULL, ' +
+            'created_at_key INTEGER NOT NULL, search_tokens TEXT NOT NULL, ' +
+            'version INTEGER NOT NULL DEFAULT 0)')
+        connection.execute('CREATE INDEX IF NOT EXISTS categories_name_key ' +
+                           'ON categories (name_key, seq)')
+        connection.execute('CREATE INDEX IF NOT EXISTS categories_created_at_key ' +
+                           'ON categories (created_at_key, seq)')
+
+        fts_exists = connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' " +
+                                        "AND name = 'categories_fts'").fetchone()
+        try:
+            connection.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS categories_fts USING fts5(' +
+                "search_tokens, content='categories', content_rowid='seq', " +
+                "tokenize=\"unicode61 remove_diacritics 0 tokenchars '_'\")")
+        except sqlite3.OperationalError:
+            return False
+        if not fts_exists:
+            # rows written before the index existed, or without FTS5, are indexed once
+            connection.execute("INSERT INTO categories_fts (categories_fts) VALUES ('rebuild')")
+
+        connection.execute(
+            'CREATE TRIGGER IF NOT EXISTS categories_fts_insert AFTER INSERT ON categories ' +
+            'BEGIN INSERT INTO categories_fts (rowid, search_tokens) ' +
+            'VALUES (new.seq, new.search_tokens); END')
+        connection.execute(
+            'CREATE TRIGGER IF NOT EXISTS categories_fts_delete AFTER DELETE ON categories ' +
+            'BEGIN INSERT INTO categories_fts (categories_fts, rowid, search_tokens) ' +
+            "VALUES ('delete', old.seq, old.search_tokens); END")
+        connection.execute(
+            'CREATE TRIGGER IF NOT EXISTS categories_fts_update AFTER UPDATE ON categories ' +
+            'BEGIN INSERT INTO categories_fts (categories_fts, rowid, search_tokens) ' +
+            "VALUES ('delete', old.seq, old.search_tokens); " +
+            'INSERT INTO categories_fts (rowid, search_tokens) ' +
+            'VALUES (new.seq, new.search_tokens); END')
+        return True
+
+    @staticmethod
+    def _to_row(entity: Category) -> Tuple:
+        entity_id, name, description, is_active, created_at = entity.to_row()
+        # sort keys mirror the in-memory repository ordering
+        return (entity_id,
+                name,
+                description,
+                int(is_active),
+                created_at.isoformat(),
+                casefold_text(name),
+                epoch_micros(created_at),
+                ' '.join(tokenize(name) + tokenize(description)))
+
+    @staticmethod
+    def _to_entity(row: Tuple) -> Category:
+        return Category.hydrate(row[0],
+                                version=row[5],
+                                name=row[1],
+                                description=row[2],
+                                is_active=bool(row[3]),
+                                created_at=datetime.fromisoformat(row[4]))
@@ -0,0 +1,197 @@
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import mmap
+import os
+import struct
+import sys
+from typing import Iterable, List, Optional, Tuple
+import uuid
+
+from __shared.infra.sort_keys import casefold_text, epoch_micros
+from category.domain.entities import Category
+
+
+# Read only snapshot of a category catalog, laid out to be used in place from a
+# shared mmap:
+#   header  magic, version, count and the section offsets
+#   rows    one fixed size record per category, in insertion order
+#   ids     rows ordered by id bytes, to binary search
+#   orders  rows by name and by created_at, ascending then descending, ties in
+#           insertion order
+#   heap    names and descriptions, UTF-8
+# Integers are little-endian and the row arrays are read in place, so readers
+# need a little-endian host.
+MAGIC = b'CATSNAP\x00'
+# 2 since rows keep the entity version
+VERSION = 2
+HEADER = struct.Struct('<8sIIQQQQ')
+# id, name offset and length, description offset and length, created_at epoch
+# micros, entity version, utc offset seconds, 1 when created_at is aware, is_active
+ROW = struct.Struct('<16sIIIIqQiBB2x')
+NULL_LENGTH = 0xFFFFFFFF
+ORDERS = [('name', False), ('name', True), ('created_at', False), ('created_at', True)]
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class InvalidSnapshotException(Exception):
+    pass
+
+
+def _pack_text(heap: bytearray, value: Optional[str]) -> Tuple[int, int]:
+    if value is None:
+        return 0, NULL_LENGTH
+    encoded = value.encode()
+    offset = len(heap)
+    heap += encoded
+    return offset, len(encoded)
+
+
+def _to_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_snapshot(path: str, categories: Iterable[Category]) -> None:
+    categories = list(categories)
+    rows = bytearray()
+    heap = bytearray()
+    for category in categories:
+        name_offset, name_length = _pack_text(heap, category.name)
+        description_offset, description_length = _pack_text(heap, category.description)
+        created_at = category.created_at
+        utc_offset = created_at.utcoffset()
+        rows += ROW.pack(uuid.UUID(category.id).bytes,
+                         name_offset, name_length, description_offset, description_length,
+                         epoch_micros(created_at),
+                         category.version,
+                         0 if utc_offset is None else int(utc_offset.total_seconds()),
+                         utc_offset is not None,
+                         bool(category.is_active))
+
+    count = len(categories)
+    ids = array('I', sorted(range(count), key=lambda row: uuid.UUID(categories[row].id).bytes))
+    sort_keys = {'name': [casefold_text(category.name) for category in categories],
+                 'created_at': [epoch_micros(category.created_at) for category in categories]}
+    orders = b''.join(
+        # stable, so ties keep insertion order in both directions
+        _to_bytes(array('I', sorted(range(count), key=sort_keys[field_name].__getitem__,
+                                    reverse=reverse)))
+        for field_name, reverse in ORDERS)
+
+    rows_offset = HEADER.size
+    ids_offset = rows_offset + len(rows)
+    orders_offset = ids_offset + count * 4
+    heap_offset = orders_offset + len(orders)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as snapshot_file:
+        snapshot_file.write(HEADER.pack(MAGIC, VERSION, count, rows_offset, ids_offset,
+                                        orders_offset, heap_offset))
+        snapshot_file.write(rows)
+        snapshot_file.write(_to_bytes(ids))
+        snapshot_file.write(orders)
+        snapshot_file.write(heap)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    # readers that mapped the previous file keep it until they close it
+    os.replace(temporary_path, path)
+
+
+@dataclass(slots=True)
+class CategorySnapshot:
+    path: str
+    count: int = field(init=False)
+    _file: mmap.mmap = field(init=False, repr=False)
+    _rows_offset: int = field(init=False, repr=False)
+    _heap_offset: int = field(init=False, repr=False)
+    _ids: memoryview = field(init=False, repr=False)
+    _orders: List[memoryview] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if sys.byteorder != 'little':
+            raise InvalidSnapshotException(
+                f'Snapshots need a little-endian host. data=[path: `{self.path}`]')
+
+        with open(self.path, 'rb') as snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size < HEADER.size:
+                raise InvalidSnapshotException(
+                    f'Invalid category snapshot. data=[path: `{self.path}`]')
+            self._file = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self._rows_offset, ids_offset, orders_offset, \
+            self._heap_offset = HEADER.unpack_from(self._file)
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise InvalidSnapshotException(
+                f'Invalid category snapshot. data=[path: `{self.path}`]')
+
+        view = memoryview(self._file)
+        size = self.count * 4
+        self._ids = view[ids_offset:ids_offset + size].cast('I')
+        self._orders = [view[orders_offset + index * size:orders_offset + (index + 1) * size]
+                        .cast('I') for index in range(len(ORDERS))]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._ids.release()
+        for order in self._orders:
+            order.release()
+        self._file.close()
+
+    def order(self, field_name: str, reverse: bool) -> memoryview:
+        return self._orders[ORDERS.index((field_name, reverse))]
+
+    def find(self, key: bytes) -> Optional[int]:
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            row = self._ids[middle]
+            row_key = self.id_bytes(row)
+            if row_key == key:
+                return row
+            if row_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def id_bytes(self, row: int) -> bytes:
+        offset = self._rows_offset + row * ROW.size
+        return self._file[offset:offset + 16]
+
+    def name(self, row: int) -> str:
+        _, name_offset, name_length, *_ = ROW.unpack_from(
+            self._file, self._rows_offset + row * ROW.size)
+        return self._text(name_offset, name_length)
+
+    def description(self, row: int) -> Optional[str]:
+        _, _, _, description_offset, description_length, *_ = ROW.unpack_from(
+            self._file, self._rows_offset + row * ROW.size)
+        return self._text(description_offset, description_length)
+
+    def created_at_micros(self, row: int) -> int:
+        return ROW.unpack_from(self._file, self._rows_offset + row * ROW.size)[5]
+
+    def category(self, row: int) -> Category:
+        key, name_offset, name_length, description_offset, description_length, micros, \
+            version, utc_offset, is_aware, is_active = ROW.unpack_from(
+                self._file, self._rows_offset + row * ROW.size)
+        created_at = _EPOCH + timedelta(microseconds=micros)
+        if is_aware:
+            created_at = created_at.replace(tzinfo=timezone.utc) \
+                .astimezone(timezone(timedelta(seconds=utc_offset)))
+        return Category.hydrate(str(uuid.UUID(bytes=key)),
+                                version=version,
+                                name=self._text(name_offset, name_length),
+                                description=self._text(description_offset, description_length),
+                                is_active=bool(is_active),
+                                created_at=created_at)
+
+    def _text(self, offset: int, length: int) -> Optional[str]:
+        if length == NULL_LENGTH:
+            return None
+        start = self._heap_offset + offset
+        return self._file[start:start + length].decode()
@@ -0,0 +1,104 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import os
+import tempfile
+from unittest import TestCase
+
+from category.application.imports import ImportCategoriesInput, ImportCategoriesUseCase, \
+    ImportRowError, validate_records
+from category.infra.repositories import CategoryInMemoryRepository
+
+
+class ImportCategoriesUseCaseIntegrationTest(TestCase):
+    directory: str
+    repository: CategoryInMemoryRepository
+    use_case: ImportCategoriesUseCase
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.executor = ProcessPoolExecutor(max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.executor.shutdown()
+
+    def setUp(self) -> None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.directory = temporary_directory.name
+        self.repository = CategoryInMemoryRepository()
+        self.use_case = ImportCategoriesUseCase(self.repository, chunk_size=2,
+                                                executor=self.executor, max_workers=2)
+
+    def write_file(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as import_file:
+            import_file.write(content)
+        return path
+
+    def test_should_import_the_valid_rows_of_a_csv_file(self):
+        path = self.write_file('categories.csv', '\n'.join([
+            'name,description,is_active,created_at',
+            'Movie,some description,false,2024-01-02T03:04:05',
+            ',blank name,,',
+            ' Series ,,,',
+            'Documentary,,maybe,',
+            'Anime',
+        ]) + '\n')
+
+        output = self.use_case.execute(ImportCategoriesInput(path))
+
+        self.assertEqual(3, output.imported)
+        self.assertListEqual([
+            ImportRowError(3, {'name': ['This field is required.']}),
+            ImportRowError(5, {'is_active': ['Must be a valid boolean.']}),
+        ], output.errors)
+        categories = self.repository.find_all()
+        self.assertListEqual(['Movie', 'Series', 'Anime'],
+                             [category.name for category in categories])
+        self.assertEqual(('some description', False, datetime(2024, 1, 2, 3, 4, 5)),
+                         (categories[0].description, categories[0].is_active,
+                          categories[0].created_at))
+        self.assertEqual((None, True), (categories[1].description, categories[1].is_active))
+
+    def test_should_import_the_valid_rows_of_a_jsonl_file(self):
+        path = self.write_file('categories.jsonl', '\n'.join([
+            '{"name": "Movie", "description": null}',
+            '',
+            '{"name": "Series"',
+            '["Anime"]',
+            '{"name": "Anime", "is_active": false}',
+        ]) + '\n')
+
+        output = self.use_case.execute(ImportCategoriesInput(path))
+
+        self.assertEqual(2, output.imported)
+        self.assertListEqual([3, 4], [error.line for error in output.errors])
+        self.assertTrue(output.errors[0].errors['non_field_errors'][0].startswith('Invalid JSON.'))
+        self.assertDictEqual(
+            {'non_field_errors': ['Invalid data. Expected a dictionary, but got list.']},
+            output.errors[1].errors)
+        self.assertListEqual([('Movie', True), ('Anime', False)],
+                             [(category.name, category.is_active)
+                              for category in self.repository.find_all()])
+
+    def test_should_take_the_format_from_the_input(self):
+        path = self.write_file('categories.txt', '{"name": "Movie"}\n')
+
+        with self.assertRaises(ValueError) as error:
+            self.use_case.execute(ImportCategoriesInput(path))
+        self.assertEqual('Unknown import format. data=[format: `txt`]', error.exception.args[0])
+
+        output = self.use_case.execute(ImportCategoriesInput(path, file_format='jsonl'))
+        self.assertEqual(1, output.imported)
+
+    def test_validate_records_should_return_plain_tuples(self):
+        created_at = datetime(2024, 1, 2)
+        rows, errors = validate_records([
+            (1, {'name': 'Movie', 'created_at': created_at}),
+            (2, {'name': 'x' * 256}),
+        ])
+
+        self.assertListEqual([(1, 'Movie', None, True, created_at)], rows)
+        self.assertListEqual(
+            [(2, {'name': ['Ensure this field has no more than 255 characters.']})], errors)
@@ -1,5 +1,6 @@
 from unittest import TestCase
 from __shared.domain.exceptions import EntityValidationException
+from __shared.domain.value_objects import UniqueEntityId
 from category.domain.entities import Category
 
 
@@ -41,3 +42,17 @@ class CategoryIntegrationTest(TestCase):
             category.update(category_name, 'description')
         except EntityValidationException as exception:
             self.fail(exception.args[0])
+
+    def test_validate_many(self):
+        categories = [Category.hydrate(UniqueEntityId(), name='Movie'),
+                      Category.hydrate(UniqueEntityId(), name=''),
+                      Category.hydrate(UniqueEntityId(), name='Series', is_active='maybe'),
+                      Category.hydrate(UniqueEntityId(), name='x' * 256)]
+
+        self.assertListEqual([
+            None,
+            {'name': [self.error_messages['not_blank']]},
+            {'is_active': [self.error_messages['invalid_boolean']]},
+            {'name': [self.error_messages['max_length']]},
+        ], Category.validate_many(categories))
+        self.assertListEqual([], Category.validate_many([]))
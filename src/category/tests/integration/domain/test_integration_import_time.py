@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import category
+
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(category.__file__)))
+IMPORT_SCRIPT = '''
+import json
+import sys
+import time
+
+start = time.perf_counter()
+{preload}
+import category.domain.entities
+elapsed = time.perf_counter() - start
+
+category.domain.entities.Category(name='Movie')
+loaded = {{module: module in sys.modules for module in ['django', 'rest_framework']}}
+print(json.dumps({{'elapsed': elapsed, 'loaded': loaded}}))
+'''
+
+
+class CategoryImportTimeIntegrationTest(TestCase):
+    @staticmethod
+    def run_import(preload: str = '') -> dict:
+        # a fresh interpreter, so nothing was imported by other tests
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT.format(preload=preload)],
+                                cwd=SOURCE_DIR, check=True, capture_output=True, text=True,
+                                env=os.environ | {'PYTHONPATH': SOURCE_DIR}).stdout
+        return json.loads(output)
+
+    def test_import_should_not_load_drf(self):
+        result = self.run_import()
+
+        self.assertDictEqual({'django': False, 'rest_framework': False}, result['loaded'])
+
+    def test_import_with_drf(self):
+        without_drf = min(self.run_import()['elapsed'] for _ in range(3))
+        with_drf = self.run_import(
+            'from __shared.domain.validators import load_drf_serializers\n' +
+            'load_drf_serializers()')
+
+        self.assertDictEqual({'django': True, 'rest_framework': True}, with_drf['loaded'])
+        self.assertLess(without_drf, with_drf['elapsed'])
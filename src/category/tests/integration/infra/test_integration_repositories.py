@@ -0,0 +1,607 @@
+from datetime import datetime, timedelta, timezone
+import os
+import sqlite3
+import tempfile
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from __shared.domain.exceptions import InvalidSearchCursorException, NotFoundException, \
+    VersionConflictException
+from __shared.domain.repositories import SearchCursor
+from __shared.infra.journal import EntityCodec, Journal
+from category.domain.entities import Category
+from category.domain.repositories import CategoryRepositoryInterface
+from category.infra.repositories import CategoryColumnarInMemoryRepository, \
+    CategoryInMemoryRepository, CategorySnapshotRepository, CategorySqliteRepository, \
+    ReadOnlyRepositoryException
+from category.infra.snapshots import write_snapshot
+
+
+class CategoryRepositoryBehavior:
+    # pylint: disable=no-member
+    repository: CategoryRepositoryInterface
+
+    def create_repository(self) -> CategoryRepositoryInterface:
+        raise NotImplementedError()
+
+    def setUp(self) -> None:
+        self.repository = self.create_repository()
+
+    def search(self, **kwargs) -> dict:
+        return self.repository.search(
+            CategoryRepositoryInterface.SearchParams(**kwargs)).to_dict()
+
+    def test_insert_and_find_by_id(self):
+        category = Category(name='Movie', description='some description', is_active=False)
+        self.repository.insert(category)
+
+        self.assertEqual(category, self.repository.find_by_id(category.id))
+        self.assertEqual(category, self.repository.find_by_id(category.unique_entity_id))
+
+    def test_insert_should_not_duplicate_an_item(self):
+        category = Category(name='Movie')
+        self.repository.insert(category)
+        self.repository.insert(category)
+
+        self.assertListEqual([category], self.repository.find_all())
+
+    def test_find_by_id_should_raise_an_exception_when_the_item_does_not_exist(self):
+        category = Category(name='Movie')
+        with self.assertRaises(NotFoundException) as error:
+            self.repository.find_by_id(category.id)
+
+        self.assertEqual(f'Entity not found. data=[id: `{category.id}`]',
+                         error.exception.args[0])
+
+    def test_find_all_should_keep_insertion_order(self):
+        categories = [Category(name='b'), Category(name='a'), Category(name='c')]
+        for category in categories:
+            self.repository.insert(category)
+
+        self.assertListEqual(categories, self.repository.find_all())
+
+    def test_update(self):
+        category = Category(name='Movie')
+        self.repository.insert(category)
+
+        category.update('Documentary', 'new description')
+        category.deactivate()
+        self.repository.update(category)
+
+        self.assertEqual(category, self.repository.find_by_id(category.id))
+
+    def test_update_should_raise_an_exception_when_the_item_does_not_exist(self):
+        category = Category(name='Movie')
+        with self.assertRaises(NotFoundException) as error:
+            self.repository.update(category)
+
+        self.assertEqual(f'Entity not found. data=[id: `{category.id}`]',
+                         error.exception.args[0])
+
+    def test_update_should_bump_the_version(self):
+        category = Category(name='Movie')
+        self.repository.insert(category)
+        self.assertEqual(0, self.repository.find_by_id(category.id).version)
+
+        self.repository.update(category)
+        self.repository.update(category, expected_version=1)
+        self.assertEqual(2, category.version)
+        self.assertEqual(2, self.repository.find_by_id(category.id).version)
+
+        self.repository.update_many([category])
+        self.assertEqual(3, category.version)
+        self.assertEqual(3, self.repository.find_by_id(category.id).version)
+
+    def test_update_should_raise_an_exception_when_the_expected_version_is_stale(self):
+        category = Category(name='Movie')
+        self.repository.insert(category)
+        first_edit = Category(unique_entity_id=category.unique_entity_id, name='First')
+        second_edit = Category(unique_entity_id=category.unique_entity_id, name='Second')
+
+        self.repository.update(first_edit, expected_version=0)
+        with self.assertRaises(VersionConflictException) as error:
+            self.repository.update(second_edit, expected_version=0)
+
+        self.assertEqual('Entity version conflict. ' +
+                         f'data=[id: `{category.id}`, expected_version: `0`, version: `1`]',
+                         error.exception.args[0])
+        stored = self.repository.find_by_id(category.id)
+        self.assertEqual(('First', 1), (stored.name, stored.version))
+        with self.assertRaises(NotFoundException):
+            self.repository.update(Category(name='Movie'), expected_version=0)
+
+    def test_changes_to_a_read_category_should_only_be_stored_by_a_write(self):
+        category = Category(name='Movie')
+        self.repository.insert(category)
+        category.update('Changed', None)
+        self.assertEqual('Movie', self.repository.find_by_id(category.id).name)
+
+        first = self.repository.find_by_id(category.id)
+        second = self.repository.find_by_id(category.id)
+        first.update('First', None)
+        second.update('Second', None)
+        self.assertEqual('Movie', self.repository.find_all()[0].name)
+        self.assertEqual('Movie', self.search(filter='movie')['data'][0].name)
+
+        self.repository.update(first, expected_version=0)
+        with self.assertRaises(VersionConflictException):
+            self.repository.update(second, expected_version=0)
+
+        stored = self.repository.find_by_id(category.id)
+        self.assertEqual(('First', 1), (stored.name, stored.version))
+        self.assertEqual(0, self.search(filter='second')['count'])
+        self.assertListEqual([stored], self.search(filter='first')['data'])
+
+    def test_delete(self):
+        category = Category(name='Movie')
+        self.repository.insert(category)
+        self.repository.delete(category.id)
+
+        self.assertListEqual([], self.repository.find_all())
+        with self.assertRaises(NotFoundException):
+            self.repository.delete(category.id)
+
+    def test_bulk_operations(self):
+        categories = [Category(name=f'Category {index}') for index in range(5)]
+        self.repository.insert_many(categories)
+        self.assertListEqual(categories, self.repository.find_all())
+        self.assertListEqual([categories[3], categories[1]],
+                             self.repository.find_by_ids([categories[3].id, categories[1].id]))
+
+        for category in categories[:3]:
+            category.update(f'Updated {category.name}', None)
+        self.repository.update_many(categories[:3])
+        self.assertListEqual(categories, self.repository.find_all())
+
+        self.repository.delete_many([categories[0].id, categories[4].id])
+        self.assertListEqual(categories[1:4], self.repository.find_all())
+
+    def test_bulk_operations_should_be_all_or_nothing(self):
+        categories = [Category(name='a'), Category(name='b')]
+        missing_category = Category(name='c')
+        self.repository.insert_many(categories)
+
+        with self.assertRaises(NotFoundException) as error:
+            self.repository.find_by_ids([categories[0].id, missing_category.id])
+        self.assertEqual(f'Entities not found. data=[ids: `{missing_category.id}`]',
+                         error.exception.args[0])
+
+        with self.assertRaises(NotFoundException):
+            self.repository.update_many([Category(unique_entity_id=categories[0].id,
+                                                  name='updated'),
+                                         missing_category])
+        self.assertEqual('a', self.repository.find_by_id(categories[0].id).name)
+
+        with self.assertRaises(NotFoundException):
+            self.repository.delete_many([categories[1].id, missing_category.id])
+        self.assertEqual(2, len(self.repository.find_all()))
+
+    def test_filtered_search_should_follow_bulk_writes(self):
+        self.repository.insert(Category(name='Movie'))
+        self.assertEqual(1, self.search(filter='movie')['count'])
+
+        categories = [Category(name=f'Series {index}') for index in range(65)]
+        self.repository.insert_many(categories)
+        self.assertEqual(65, self.search(filter='series')['count'])
+
+        for category in categories[:33]:
+            category.update(f'Documentary {category.name}', None)
+        self.repository.update_many(categories[:33])
+        self.assertEqual(33, self.search(filter='documentary')['count'])
+        self.assertEqual(65, self.search(filter='series')['count'])
+
+        self.repository.delete_many([category.id for category in categories])
+        self.assertEqual(0, self.search(filter='series')['count'])
+        self.assertEqual(1, self.search(filter='movie')['count'])
+
+    def test_search_with_empty_search_params(self):
+        categories = [Category(name=f'Category {index}') for index in range(15)]
+        for category in categories:
+            self.repository.insert(category)
+
+        result = self.search()
+
+        self.assertEqual(15, result['count'])
+        self.assertEqual(2, result['last_page'])
+        self.assertListEqual(categories[:10], result['data'])
+
+    def test_search_with_filter_order_by_and_paginate(self):
+        categories = [Category(name='Test 3', description='some'),
+                      Category(name='TeSt 1'),
+                      Category(name='C', description='a test'),
+                      Category(name='test 2'),
+                      Category(name='E'),
+                      Category(name='Ação')]
+        for category in categories:
+            self.repository.insert(category)
+
+        result = self.search(filter='TES', order_by_field='name', items_per_page=2)
+        self.assertEqual(4, result['count'])
+        self.assertListEqual([categories[2], categories[1]], result['data'])
+
+        result = self.search(filter='tes', order_by_field='name', order_by_direction='desc',
+                             items_per_page=3, page=2)
+        self.assertEqual(4, result['count'])
+        self.assertListEqual([categories[2]], result['data'])
+
+        result = self.search(filter='aç')
+        self.assertListEqual([categories[5]], result['data'])
+
+        result = self.search(filter='test', page=5)
+        self.assertEqual(4, result['count'])
+        self.assertListEqual([], result['data'])
+
+        result = self.search(filter='!!')
+        self.assertEqual(0, result['count'])
+
+    def test_search_order_by_created_at(self):
+        categories = [Category(name='a'), Category(name='b'), Category(name='c')]
+        for category in reversed(categories):
+            self.repository.insert(category)
+
+        result = self.search(order_by_field='created_at')
+        self.assertListEqual(categories, result['data'])
+
+        result = self.search(order_by_field='created_at', order_by_direction='desc')
+        self.assertListEqual(list(reversed(categories)), result['data'])
+
+        result = self.search(order_by_field='description')
+        self.assertListEqual(list(reversed(categories)), result['data'])
+
+    def test_search_order_by_created_at_should_compare_instants(self):
+        # in text, 09:00-03:00 would come before 10:00+00:00
+        categories = [
+            Category(name='a', created_at=datetime(2024, 1, 1, 10, tzinfo=timezone.utc)),
+            Category(name='b', created_at=datetime(2024, 1, 1, 11)),
+            Category(name='c', created_at=datetime(2024, 1, 1, 9,
+                                                   tzinfo=timezone(timedelta(hours=-3))))]
+        self.repository.insert_many(list(reversed(categories)))
+
+        result = self.search(order_by_field='created_at')
+        self.assertListEqual(categories, result['data'])
+
+        result = self.search(order_by_field='created_at', order_by_direction='desc',
+                             items_per_page=2)
+        self.assertListEqual([categories[2], categories[1]], result['data'])
+        result = self.search(order_by_field='created_at', order_by_direction='desc',
+                             items_per_page=2, after=result['next_cursor'])
+        self.assertListEqual([categories[0]], result['data'])
+
+
+    def test_search_with_cursor(self):
+        categories = [Category(name=f'Category {index % 4}') for index in range(10)]
+        self.repository.insert_many(categories)
+        expected = sorted(categories, key=lambda category: category.name, reverse=True)
+
+        data = []
+        after = None
+        while True:
+            result = self.search(order_by_field='name', order_by_direction='desc',
+                                 items_per_page=3, after=after)
+            data.extend(result['data'])
+            after = result['next_cursor']
+            if after is None:
+                break
+
+        self.assertListEqual(expected, data)
+
+        first_page = self.search(items_per_page=4)
+        second_page = self.search(items_per_page=4, after=first_page['next_cursor'])
+        self.assertListEqual(categories[4:8], second_page['data'])
+        self.repository.delete(categories[4].id)
+        second_page = self.search(items_per_page=4, after=first_page['next_cursor'])
+        self.assertListEqual(categories[5:9], second_page['data'])
+
+        with self.assertRaises(InvalidSearchCursorException):
+            self.search(order_by_field='name', after=first_page['next_cursor'])
+
+    def test_search_should_reject_cursor_keys_of_another_type(self):
+        self.repository.insert_many([Category(name=f'Category {index}') for index in range(3)])
+
+        cases = [(None, 'name'), ('name', 5), ('name', [1]), ('name', {}), ('name', None),
+                 ('name', '\ud800'), ('created_at', 'name'), ('created_at', 1.5),
+                 ('created_at', True), ('created_at', 2 ** 70)]
+        for order_by_field, key in cases:
+            after = SearchCursor(key, 0, order_by_field,
+                                 'asc' if order_by_field else None).encode()
+            params = CategoryRepositoryInterface.SearchParams(order_by_field=order_by_field,
+                                                              after=after)
+            with self.assertRaises(InvalidSearchCursorException, msg=(order_by_field, key)):
+                self.repository.search(params)
+            with self.assertRaises(InvalidSearchCursorException, msg=(order_by_field, key)):
+                list(self.repository.iter_search(params))
+
+    def test_iter_all_and_iter_search(self):
+        categories = [Category(name=f'Category {index % 3}') for index in range(12)]
+        self.repository.insert_many(categories)
+
+        self.assertListEqual(categories, list(self.repository.iter_all()))
+
+        result = self.repository.iter_search(CategoryRepositoryInterface.SearchParams(
+            filter='category', order_by_field='name', items_per_page=5, page=2))
+        expected = sorted(categories, key=lambda category: category.name)[5:]
+        self.assertListEqual(expected, list(result))
+
+    def test_iter_all_and_iter_search_should_follow_writes_while_consumed(self):
+        categories = [Category(name=f'Category {index % 7}') for index in range(600)]
+        self.repository.insert_many(categories)
+
+        for params in [{}, {'order_by_field': 'name'},
+                       {'order_by_field': 'name', 'order_by_direction': 'desc'},
+                       {'order_by_field': 'created_at'}, {'filter': 'category'},
+                       {'filter': 'category', 'order_by_field': 'name'}]:
+            results = self.repository.iter_search(
+                CategoryRepositoryInterface.SearchParams(**params))
+            consumed = [next(results) for _ in range(300)]
+            self.repository.delete_many([category.id for category in consumed[:100]])
+            inserted = Category(name='Category 0 new')
+            self.repository.insert(inserted)
+            consumed.extend(results)
+
+            ids = [category.id for category in consumed]
+            self.assertEqual(len(ids), len(set(ids)), params)
+            self.assertSetEqual({category.id for category in categories},
+                                set(ids) - {inserted.id}, params)
+
+            self.repository.delete(inserted.id)
+            self.repository.insert_many(consumed[:100])
+
+        results = self.repository.iter_all()
+        consumed = [next(results) for _ in range(300)]
+        self.repository.delete_many([category.id for category in consumed[:100]])
+        self.repository.insert(Category(name='new'))
+        consumed.extend(results)
+        self.assertEqual(len(consumed), len({category.id for category in consumed}))
+        self.assertTrue({category.id for category in categories}
+                        .issubset({category.id for category in consumed}))
+
+    def test_search_without_count(self):
+        categories = [Category(name=f'Category {index}') for index in range(3)]
+        self.repository.insert_many(categories)
+
+        result = self.search(items_per_page=2, include_count=False)
+
+        self.assertIsNone(result['count'])
+        self.assertIsNone(result['last_page'])
+        self.assertListEqual(categories[:2], result['data'])
+        self.assertIsNotNone(result['next_cursor'])
+
+
+class CategoryInMemoryRepositoryIntegrationTest(CategoryRepositoryBehavior, TestCase):
+    def create_repository(self) -> CategoryRepositoryInterface:
+        return CategoryInMemoryRepository()
+
+
+class CategoryJournaledInMemoryRepositoryIntegrationTest(CategoryRepositoryBehavior, TestCase):
+    directory: str
+
+    def create_repository(self) -> CategoryRepositoryInterface:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.directory = temporary_directory.name
+        return self.open_repository()
+
+    def open_repository(self) -> CategoryInMemoryRepository:
+        repository = CategoryInMemoryRepository(
+            journal=Journal(self.directory, EntityCodec(Category), snapshot_every=5))
+        self.addCleanup(repository.close)
+        return repository
+
+    def test_should_recover_the_catalog_after_a_restart(self):
+        categories = [Category(name=f'Category {index}') for index in range(12)]
+        for category in categories:
+            self.repository.insert(category)
+        categories[3].update('Updated', None)
+        self.repository.update(categories[3])
+        self.repository.delete(categories[0].id)
+        self.repository.close()
+
+        repository = self.open_repository()
+        self.assertListEqual(categories[1:], repository.find_all())
+        self.assertEqual(1, repository.find_by_id(categories[3].id).version)
+        result = repository.search(
+            CategoryRepositoryInterface.SearchParams(filter='updated'))
+        self.assertListEqual([categories[3]], result.data)
+
+
+class CategoryColumnarInMemoryRepositoryIntegrationTest(CategoryRepositoryBehavior, TestCase):
+    repository: CategoryColumnarInMemoryRepository
+
+    def create_repository(self) -> CategoryRepositoryInterface:
+        return CategoryColumnarInMemoryRepository()
+
+    @patch.object(CategoryColumnarInMemoryRepository, 'COMPACT_MIN_DEAD_ROWS', 2)
+    def test_should_compact_deleted_and_updated_rows(self):
+        categories = [Category(name=f'Category {index}', is_active=index % 2 == 0)
+                      for index in range(10)]
+        self.repository.insert_many(categories)
+
+        for category in categories[:3]:
+            category.update(f'{category.name} updated', 'some description')
+        self.repository.update_many(categories[:3])
+        self.repository.delete_many([category.id for category in categories[3:9]])
+
+        self.assertEqual(4, len(self.repository.sequences))
+        self.assertListEqual([*categories[:3], categories[9]], self.repository.find_all())
+        result = self.repository.search(CategoryRepositoryInterface.SearchParams(
+            filter='updated', order_by_field='name', order_by_direction='desc'))
+        self.assertListEqual(list(reversed(categories[:3])), result.data)
+
+    def test_writes_should_keep_the_search_orders_up_to_date(self):
+        # pylint: disable=protected-access
+        categories = [Category(name=f'Category {index:03d}') for index in range(100)]
+        self.repository.insert_many(categories)
+        search_params = CategoryRepositoryInterface.SearchParams(
+            order_by_field='name', order_by_direction='desc', items_per_page=3)
+        self.repository.search(search_params)
+        order = self.repository._orders['name']
+
+        categories[10].update('Category 999', None)
+        self.repository.update(categories[10])
+        self.repository.delete(categories[99].id)
+        new_category = Category(name='Category 998')
+        self.repository.insert(new_category)
+        for category in categories[:70]:
+            category.update(category.name.upper(), None)
+        self.repository.update_many(categories[:70])
+
+        result = self.repository.search(search_params)
+        self.assertIs(order, self.repository._orders['name'])
+        self.assertListEqual([categories[10], new_category, categories[98]], result.data)
+        self.assertEqual(100, len(order))
+        result = self.repository.search(
+            CategoryRepositoryInterface.SearchParams(order_by_field='name', page=4,
+                                                     items_per_page=3))
+        self.assertListEqual(categories[9:10] + categories[11:13], result.data)
+
+
+class CategorySqliteRepositoryIntegrationTest(CategoryRepositoryBehavior, TestCase):
+    repository: CategorySqliteRepository
+
+    def create_repository(self) -> CategoryRepositoryInterface:
+        return CategorySqliteRepository()
+
+    def tearDown(self) -> None:
+        self.repository.close()
+
+    @patch.object(CategorySqliteRepository, 'ITER_CHUNK_SIZE', 2)
+    def test_iter_all_should_read_in_chunks(self):
+        categories = [Category(name=f'Category {index}') for index in range(5)]
+        self.repository.insert_many(categories)
+        self.repository.delete(categories[1].id)
+
+        self.assertListEqual([categories[0], *categories[2:]], list(self.repository.iter_all()))
+
+    def test_search_without_fts(self):
+        self.repository.use_fts = False
+        self.test_search_with_filter_order_by_and_paginate()
+
+    def test_should_persist_data_in_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, 'categories.sqlite3')
+            category = Category(name='Movie')
+
+            repository = CategorySqliteRepository(database)
+            repository.insert(category)
+            repository.close()
+
+            repository = CategorySqliteRepository(database)
+            self.assertEqual(category, repository.find_by_id(category.id))
+            repository.close()
+
+    def test_should_migrate_text_sort_keys(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = os.path.join(directory, 'categories.sqlite3')
+            categories = [
+                Category(name='B', created_at=datetime(2024, 1, 1, 10, tzinfo=timezone.utc)),
+                Category(name='a', created_at=datetime(2024, 1, 1, 9,
+                                                       tzinfo=timezone(timedelta(hours=-3))))]
+            connection = sqlite3.connect(database)
+            with connection:
+                connection.execute(
+                    'CREATE TABLE categories (' +
+                    'seq INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT NOT NULL UNIQUE, ' +
+                    'name TEXT NOT NULL, description TEXT, is_active INTEGER NOT NULL, ' +
+                    'created_at TEXT NOT NULL, name_key TEXT NOT NULL, ' +
+                    'created_at_key TEXT NOT NULL, search_tokens TEXT NOT NULL)')
+                connection.execute('CREATE INDEX categories_created_at_key ' +
+                                   'ON categories (created_at_key, seq)')
+                connection.executemany(
+                    'INSERT INTO categories (id, name, is_active, created_at, name_key, ' +
+                    'created_at_key, search_tokens) VALUES (?, ?, 1, ?, ?, ?, ?)',
+                    [(category.id, category.name, category.created_at.isoformat(),
+                      category.name.lower(), str(category.created_at), category.name.lower())
+                     for category in categories])
+            connection.close()
+
+            repository = CategorySqliteRepository(database)
+            result = repository.search(
+                CategoryRepositoryInterface.SearchParams(order_by_field='created_at'))
+            self.assertListEqual(categories, result.data)
+            result = repository.search(
+                CategoryRepositoryInterface.SearchParams(order_by_field='name'))
+            self.assertListEqual(list(reversed(categories)), result.data)
+            repository.close()
+
+            repository = CategorySqliteRepository(database)
+            self.assertEqual(2, len(repository.find_all()))
+            repository.update(categories[0], expected_version=0)
+            self.assertEqual(1, repository.find_by_id(categories[0].id).version)
+            repository.close()
+
+
+class CategorySnapshotRepositoryIntegrationTest(TestCase):
+    categories: List[Category]
+    expected: CategoryInMemoryRepository
+    repository: CategorySnapshotRepository
+
+    def setUp(self) -> None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        path = os.path.join(temporary_directory.name, 'categories.snapshot')
+        created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.categories = [
+            Category(name=name, description=description,
+                     created_at=created_at + timedelta(days=index % 3))
+            for index, (name, description) in enumerate([
+                ('Movie', 'some description'), ('documentary', None), ('movie', 'Séries'),
+                ('Anime', 'movie like'), ('Action movie', ''), ('Drama', 'very long drama')])]
+        write_snapshot(path, self.categories)
+
+        self.expected = CategoryInMemoryRepository()
+        self.expected.insert_many(self.categories)
+        self.repository = CategorySnapshotRepository(path)
+        self.addCleanup(self.repository.close)
+
+    def test_should_find_the_written_categories(self):
+        self.assertEqual(6, len(self.repository))
+        self.assertListEqual(self.categories, self.repository.find_all())
+        self.assertEqual(self.categories[2], self.repository.find_by_id(self.categories[2].id))
+        self.assertListEqual([self.categories[4], self.categories[1]],
+                             self.repository.find_by_ids([self.categories[4].unique_entity_id,
+                                                          self.categories[1].id]))
+
+        with self.assertRaises(NotFoundException) as error:
+            self.repository.find_by_ids([self.categories[0].id, 'fake id'])
+        self.assertEqual('Entities not found. data=[ids: `fake id`]', error.exception.args[0])
+
+    def test_search_should_match_the_in_memory_repository(self):
+        for order_by_field in [None, 'name', 'created_at']:
+            for order_by_direction in ['asc', 'desc']:
+                for search_filter in [None, 'movie', 'mov desc']:
+                    params = {'order_by_field': order_by_field,
+                              'order_by_direction': order_by_direction,
+                              'filter': search_filter, 'items_per_page': 2}
+                    with self.subTest(**params):
+                        expected = self.expected.search(
+                            CategoryRepositoryInterface.SearchParams(**params))
+                        result = self.repository.search(
+                            CategoryRepositoryInterface.SearchParams(**params))
+                        self.assertEqual(expected.to_dict(), result.to_dict())
+
+                        data = list(result.data)
+                        while result.next_cursor is not None:
+                            result = self.repository.search(
+                                CategoryRepositoryInterface.SearchParams(
+                                    **params, after=result.next_cursor))
+                            data.extend(result.data)
+                        self.assertListEqual(
+                            self.expected.search(CategoryRepositoryInterface.SearchParams(
+                                **{**params, 'items_per_page': 10})).data,
+                            data)
+
+    def test_writes_should_raise_an_exception(self):
+        category = Category(name='Movie')
+        for write, argument in [('insert', category), ('insert_many', [category]),
+                                ('update', self.categories[0]),
+                                ('update_many', [self.categories[0]]),
+                                ('delete', self.categories[0].id),
+                                ('delete_many', [self.categories[0].id])]:
+            with self.subTest(write=write):
+                with self.assertRaises(ReadOnlyRepositoryException) as error:
+                    getattr(self.repository, write)(argument)
+                self.assertEqual(
+                    f'Repository is read only. data=[path: `{self.repository.path}`]',
+                    error.exception.args[0])
+        self.assertListEqual(self.categories, self.repository.find_all())
@@ -1,7 +1,10 @@
+from dataclasses import asdict, fields
 from unittest import TestCase
 
-from category.application.dto import CategoryOutput, CategoryOutputMapper
+from __shared.application.dto import PaginationOutput
+from category.application.dto import CategoryOutput, CategoryOutputMapper, CategoryOutputRow
 from category.domain.entities import Category
+from category.domain.repositories import CategoryRepositoryInterface
 
 
 class CategoryOutputMapperUnitTest(TestCase):
@@ -16,3 +19,41 @@ class CategoryOutputMapperUnitTest(TestCase):
 
         output = CategoryOutputMapper.to_output(category)
         self.assertEqual(category_output_expected, output)
+
+    def test_to_output_many(self):
+        categories = [Category(name='name'),
+                      Category(name='other name', description='description', is_active=False)]
+
+        outputs = CategoryOutputMapper.to_output_many(categories)
+
+        self.assertListEqual([CategoryOutputMapper.to_output(category)
+                              for category in categories], outputs)
+        self.assertListEqual([], CategoryOutputMapper.to_output_many([]))
+
+    def test_to_output_rows(self):
+        categories = [Category(name='name'),
+                      Category(name='other name', description='description', is_active=False)]
+
+        rows = CategoryOutputMapper.to_output_rows(categories)
+
+        self.assertIsInstance(rows[0], CategoryOutputRow)
+        self.assertListEqual([asdict(output) for output in
+                              CategoryOutputMapper.to_output_many(categories)],
+                             [row._asdict() for row in rows])
+        self.assertTupleEqual(tuple(field.name for field in fields(CategoryOutput)),
+                              CategoryOutputRow._fields)
+
+    def test_to_search_output(self):
+        categories = [Category(name='name'), Category(name='other name')]
+        result = CategoryRepositoryInterface.SearchResult(count=3, items_per_page=2,
+                                                          current_page=1, data=categories)
+
+        output = CategoryOutputMapper.to_search_output(result)
+        self.assertEqual(PaginationOutput(items=CategoryOutputMapper.to_output_many(categories),
+                                          total=3, current_page=1, last_page=2, per_page=2),
+                         output)
+
+        output = CategoryOutputMapper.to_search_output(result, as_rows=True)
+        self.assertListEqual(CategoryOutputMapper.to_output_rows(categories), output.items)
+        self.assertEqual((3, 1, 2, 2), (output.total, output.current_page, output.last_page,
+                                        output.per_page))
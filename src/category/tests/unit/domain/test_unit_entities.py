@@ -75,3 +75,17 @@ class CategoryUnitTest(TestCase):
         category = Category(name='name', is_active=True)
         category.deactivate()
         self.assertFalse(category.is_active)
+
+    @patch.object(Category, 'validate', return_value=True)
+    def test_hydrate_should_not_validate(self, mock_validate):
+        created_at = datetime.now()
+        category = Category.hydrate('2d01459a-f739-48d0-a36b-e1cb2a8c72f0', version=3,
+                                    name='Movie', created_at=created_at)
+
+        mock_validate.assert_not_called()
+        self.assertEqual(('2d01459a-f739-48d0-a36b-e1cb2a8c72f0', 'Movie', None, True,
+                          created_at, 3),
+                         (category.id, category.name, category.description,
+                          category.is_active, category.created_at, category.version))
+        self.assertIsInstance(Category.hydrate(category.unique_entity_id,
+                                               name='Movie').created_at, datetime)
@@ -1,8 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest import TestCase
+from unittest.mock import patch
 from __shared.domain.validators import FieldValidatorInterface
 
-from category.domain.validators import CategoryValidator, CategoryValidatorFactory
+from category.domain.validators import CategoryCompiledValidator, CategoryValidator, \
+    CategoryValidatorFactory, get_category_validation_rules
 
 
 class CategoryValidatorFactoryUnitTest(TestCase):
@@ -15,6 +17,38 @@ class CategoryValidatorFactoryUnitTest(TestCase):
         self.assertTrue(issubclass(
             validator.__class__, FieldValidatorInterface))
 
+    def test_should_return_compiled_validator_by_default(self):
+        validator = CategoryValidatorFactory.create()
+        self.assertIsInstance(validator, CategoryCompiledValidator)
+
+    def test_should_return_drf_validator_for_the_drf_backend(self):
+        validator = CategoryValidatorFactory.create('drf')
+        self.assertIs(CategoryValidator, validator.__class__)
+
+
+    def test_should_create_a_registered_backend(self):
+        class ValidatorStub(CategoryValidator):
+            pass
+
+        CategoryValidatorFactory.register('stub', ValidatorStub)
+        self.addCleanup(CategoryValidatorFactory.backends.pop, 'stub')
+
+        self.assertIsInstance(CategoryValidatorFactory.create('stub'), ValidatorStub)
+
+    def test_should_raise_an_error_for_an_unknown_backend(self):
+        with self.assertRaises(ValueError) as error:
+            CategoryValidatorFactory.create('unknown')
+
+        self.assertEqual('Unknown validation backend. data=[backend: `unknown`]',
+                         error.exception.args[0])
+
+    def test_validation_rules_should_be_created_once(self):
+        # pylint: disable=import-outside-toplevel
+        from category.domain.validators import CategoryValidationRules
+
+        self.assertIs(get_category_validation_rules(), CategoryValidationRules)
+        self.assertIn('name', CategoryValidationRules().fields)
+
 
 class CategoryValidatorUnitTest(TestCase):
     error_messages = {
@@ -157,3 +191,81 @@ class CategoryValidatorUnitTest(TestCase):
         self.assertTrue(is_valid)
         self.assertDictEqual(data, self.validator.validated_data,
                              'created_at can be a datetime')
+
+
+class CategoryCompiledValidatorUnitTest(TestCase):
+    cases = [
+        None,
+        {},
+        {'name': None},
+        {'name': ''},
+        {'name': '   '},
+        {'name': ' name '},
+        {'name': 'x'*255},
+        {'name': 'x'*256},
+        {'name': 'x\x00'},
+        {'name': 10},
+        {'name': True},
+        {'name': 'name', 'description': None},
+        {'name': 'name', 'description': ''},
+        {'name': 'name', 'description': 'ação'},
+        {'name': 'name', 'is_active': None},
+        {'name': 'name', 'is_active': ''},
+        {'name': 'name', 'is_active': 'true'},
+        {'name': 'name', 'is_active': False},
+        {'name': 'name', 'created_at': None},
+        {'name': 'name', 'created_at': ''},
+        {'name': 'name', 'created_at': '2023-01-01T10:00:00'},
+        {'name': 'name', 'created_at': datetime.now()},
+        {'name': 'name', 'created_at': datetime.now(timezone.utc)},
+        {'name': None, 'is_active': None, 'created_at': None},
+    ]
+
+    def test_should_have_the_same_output_as_the_drf_validator(self):
+        for case in self.cases:
+            compiled_validator = CategoryCompiledValidator()
+            drf_validator = CategoryValidator()
+
+            self.assertEqual(drf_validator.validate(case),
+                             compiled_validator.validate(case), f'data: {case}')
+            self.assertEqual(drf_validator.errors,
+                             compiled_validator.errors, f'data: {case}')
+            self.assertEqual(drf_validator.validated_data,
+                             compiled_validator.validated_data, f'data: {case}')
+
+    def test_validate_many_should_have_the_same_output_as_validate(self):
+        for validator_class in [CategoryValidator, CategoryCompiledValidator]:
+            validator = validator_class()
+            self.assertFalse(validator.validate_many(self.cases))
+
+            for index, case in enumerate(self.cases):
+                case_validator = validator_class()
+                is_valid = case_validator.validate(case)
+                self.assertEqual(case_validator.errors if not is_valid else None,
+                                 validator.errors[index], f'data: {case}')
+                self.assertEqual(case_validator.validated_data if is_valid else None,
+                                 validator.validated_data[index], f'data: {case}')
+
+
+class CategoryValidatorReuseSerializerUnitTest(TestCase):
+    class UnboundCategoryValidator(CategoryValidator):
+        reuse_serializer = False
+
+    def test_should_have_the_same_output_as_a_serializer_per_validation(self):
+        for case in CategoryCompiledValidatorUnitTest.cases + [[], 'name', {'name': ['x']}]:
+            validator = CategoryValidator()
+            unbound_validator = self.UnboundCategoryValidator()
+
+            self.assertEqual(unbound_validator.validate(case),
+                             validator.validate(case), f'data: {case}')
+            self.assertEqual(unbound_validator.errors, validator.errors, f'data: {case}')
+            self.assertEqual(unbound_validator.validated_data,
+                             validator.validated_data, f'data: {case}')
+
+    def test_should_not_copy_the_fields_per_validation(self):
+        CategoryValidator().validate({'name': 'name'})
+
+        with patch.object(get_category_validation_rules(), 'get_fields') as mock_get_fields:
+            for data in [{'name': 'name'}, {'name': ''}, None]:
+                CategoryValidator().validate(data)
+            mock_get_fields.assert_not_called()
@@ -1,5 +1,7 @@
-from unittest import TestCase
+from unittest import TestCase, skipUnless
 from __shared.infra.repositories import InMemorySearchableRepository
+from __shared.infra.vectorized import is_vectorized_search_available
+from category.domain.entities import Category
 from category.domain.repositories import CategoryRepositoryInterface
 
 from category.infra.repositories import CategoryInMemoryRepository
@@ -22,3 +24,113 @@ class CategoryInMemoryRepositoryUnitTest(TestCase):
         result = self.repository.sortable_fields()
 
         self.assertListEqual(expected, result)
+
+    def test__filter(self):
+        # pylint: disable=protected-access
+        data = [Category(name='Action', description='Explosions'),
+                Category(name='Ação'),
+                Category(name='Kids show', description='Action for kids')]
+
+        self.assertListEqual(data, self.repository._filter(data, None))
+        self.assertListEqual([data[0], data[2]], self.repository._filter(data, 'ACT'))
+        self.assertListEqual([data[2]], self.repository._filter(data, 'action kid'))
+        self.assertListEqual([], self.repository._filter(data, 'movie'))
+
+    def test_search_should_filter_through_the_text_index(self):
+        items = [Category(name='Test 3', description='some'),
+                 Category(name='TeSt 1'),
+                 Category(name='C', description='a test'),
+                 Category(name='test 2'),
+                 Category(name='E')]
+        for item in items:
+            self.repository.insert(item)
+
+        result = self.repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='tes',
+                                                    order_by_field='name',
+                                                    items_per_page=2))
+        self.assertEqual(4, result.count)
+        self.assertListEqual([items[2], items[1]], result.data)
+
+        items[2].update('C', None)
+        self.repository.update(items[2])
+        self.repository.delete(items[1].id)
+
+        result = self.repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='TEST',
+                                                    order_by_field='name',
+                                                    order_by_direction='desc'))
+        self.assertEqual(2, result.count)
+        self.assertListEqual([items[0], items[3]], result.data)
+
+    def test_filtered_search_should_scan_the_index_for_early_pages_of_a_large_match(self):
+        items = [Category(name=f'Category {index:04d}',
+                          description='test' if index % 2 == 0 else 'other')
+                 for index in range(1000)]
+        self.repository.insert_many(items)
+        matched = items[::2]
+
+        result = self.repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='test',
+                                                    order_by_field='name',
+                                                    items_per_page=5))
+        self.assertEqual('index_scan', self.repository.last_search_strategy)
+        self.assertEqual(500, result.count)
+        self.assertListEqual(matched[:5], result.data)
+
+        result = self.repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='test',
+                                                    order_by_field='name',
+                                                    items_per_page=5,
+                                                    page=10))
+        self.assertEqual('full_sort', self.repository.last_search_strategy)
+        self.assertListEqual(matched[45:50], result.data)
+
+    def test_filtered_search_should_sort_when_the_matches_bunch_up_at_the_end_of_the_index(self):
+        items = [Category(name=f'Category {index:04d}',
+                          description='test' if index >= 500 else 'other')
+                 for index in range(1000)]
+        self.repository.insert_many(items)
+
+        result = self.repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='test',
+                                                    order_by_field='name',
+                                                    items_per_page=5))
+        self.assertEqual('full_sort', self.repository.last_search_strategy)
+        self.assertListEqual(items[500:505], result.data)
+
+        result = self.repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='test',
+                                                    order_by_field='name',
+                                                    order_by_direction='desc',
+                                                    items_per_page=5))
+        self.assertEqual('index_scan', self.repository.last_search_strategy)
+        self.assertListEqual(items[:-6:-1], result.data)
+
+    @skipUnless(is_vectorized_search_available(), 'NumPy is not installed')
+    def test_vectorized_search_should_only_replace_the_full_sort(self):
+        # pylint: disable=protected-access
+        repository = CategoryInMemoryRepository(vectorized=True)
+        items = [Category(name=f'Category {index:04d}',
+                          description='test' if index % 2 == 0 else 'other')
+                 for index in range(1000)]
+        repository.insert_many(items)
+        matched = items[::2]
+
+        result = repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='test',
+                                                    order_by_field='name',
+                                                    items_per_page=5))
+        self.assertEqual('index_scan', repository.last_search_strategy)
+        self.assertListEqual(matched[:5], result.data)
+        # built with the sorted indexes, so it is in sync before its first search
+        self.assertTrue(repository._vectorized_engine.is_synced_with(repository.data))
+
+        result = repository.search(
+            CategoryInMemoryRepository.SearchParams(filter='test',
+                                                    order_by_field='name',
+                                                    items_per_page=5,
+                                                    page=10))
+        self.assertEqual('vectorized', repository.last_search_strategy)
+        self.assertEqual(500, result.count)
+        self.assertListEqual(matched[45:50], result.data)
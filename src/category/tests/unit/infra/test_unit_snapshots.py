@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+import os
+import tempfile
+from unittest import TestCase
+import uuid
+
+from category.domain.entities import Category
+from category.infra.snapshots import CategorySnapshot, InvalidSnapshotException, \
+    write_snapshot
+
+
+class CategorySnapshotUnitTest(TestCase):
+    path: str
+
+    def setUp(self) -> None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.path = os.path.join(temporary_directory.name, 'categories.snapshot')
+
+    def open_snapshot(self) -> CategorySnapshot:
+        snapshot = CategorySnapshot(self.path)
+        self.addCleanup(snapshot.close)
+        return snapshot
+
+    def test_should_read_the_written_categories(self):
+        categories = [
+            Category(name='Série', description=None, is_active=False,
+                     created_at=datetime(2024, 1, 2, 3, 4, 5, 6)),
+            Category(name='Movie', description='', version=7,
+                     created_at=datetime(2024, 1, 2, 3, tzinfo=timezone(timedelta(hours=-3)))),
+        ]
+        write_snapshot(self.path, categories)
+
+        snapshot = self.open_snapshot()
+        self.assertEqual(2, len(snapshot))
+        self.assertListEqual(categories, [snapshot.category(row) for row in range(2)])
+        self.assertEqual(timedelta(hours=-3), snapshot.category(1).created_at.utcoffset())
+        self.assertIsNone(snapshot.category(0).created_at.tzinfo)
+        self.assertIsNone(snapshot.description(0))
+        self.assertListEqual([0, 7], [snapshot.category(row).version for row in range(2)])
+
+    def test_orders_should_keep_ties_in_insertion_order(self):
+        created_at = datetime(2024, 1, 1)
+        categories = [Category(name='b', created_at=created_at),
+                      Category(name='A', created_at=created_at + timedelta(days=1)),
+                      Category(name='B', created_at=created_at)]
+        write_snapshot(self.path, categories)
+
+        snapshot = self.open_snapshot()
+        self.assertListEqual([1, 0, 2], list(snapshot.order('name', False)))
+        self.assertListEqual([0, 2, 1], list(snapshot.order('name', True)))
+        self.assertListEqual([0, 2, 1], list(snapshot.order('created_at', False)))
+        self.assertListEqual([1, 0, 2], list(snapshot.order('created_at', True)))
+
+    def test_find_should_return_the_row_of_an_id(self):
+        categories = [Category(name=f'Category {index}') for index in range(20)]
+        write_snapshot(self.path, categories)
+
+        snapshot = self.open_snapshot()
+        for row, category in enumerate(categories):
+            self.assertEqual(row, snapshot.find(uuid.UUID(category.id).bytes))
+        self.assertIsNone(snapshot.find(uuid.uuid4().bytes))
+
+    def test_should_read_an_empty_snapshot(self):
+        write_snapshot(self.path, [])
+
+        snapshot = self.open_snapshot()
+        self.assertEqual(0, len(snapshot))
+        self.assertListEqual([], list(snapshot.order('name', False)))
+        self.assertIsNone(snapshot.find(uuid.uuid4().bytes))
+
+    def test_should_raise_an_error_for_an_invalid_file(self):
+        for content in [b'', b'not a snapshot' * 8]:
+            with self.subTest(content=content):
+                with open(self.path, 'wb') as snapshot_file:
+                    snapshot_file.write(content)
+
+                with self.assertRaises(InvalidSnapshotException) as error:
+                    CategorySnapshot(self.path)
+                self.assertEqual(f'Invalid category snapshot. data=[path: `{self.path}`]',
+                                 error.exception.args[0])